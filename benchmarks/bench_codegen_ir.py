@@ -0,0 +1,89 @@
+"""Micro-benchmark: rendering a 1,000-tool scaffold with and without the shared tool IR.
+
+Run from the repo root:
+
+    python benchmarks/bench_codegen_ir.py
+
+"per-renderer parse" rebuilds the tool's signature data inside every
+renderer call, which is what codegen did before ToolSpec existed.
+"shared IR" compiles each def once and hands the frozen spec to every
+renderer, which is what scaffold_server does now.
+"""
+
+from __future__ import annotations
+
+import time
+
+from mcp_creator.services import codegen, tool_spec
+
+TOOL_COUNT = 1000
+ROUNDS = 5
+PACKAGE = "bench-mcp"
+
+
+def _tool_defs(n: int) -> list[dict]:
+    return [
+        {
+            "name": f"tool_{i}",
+            "description": f"Tool number {i}",
+            "parameters": [
+                {"name": "query", "type": "string", "required": True},
+                {"name": "limit", "type": "integer", "required": False, "default": 10},
+                {"name": "cursor", "type": "string", "required": False},
+                {"name": "verbose", "type": "boolean", "required": False, "default": False},
+            ],
+            "returns": "Result JSON",
+        }
+        for i in range(n)
+    ]
+
+
+def _render_all(tools: list) -> None:
+    codegen.render_server(PACKAGE, tools)
+    codegen.render_test_server(PACKAGE, tools)
+    for tool in tools:
+        codegen.render_tool_module(PACKAGE, tool)
+        codegen.render_service_module(PACKAGE, tool)
+        codegen.render_test_tool(PACKAGE, tool)
+        codegen.render_add_tool_registration(tool)
+
+
+def per_renderer_parse(defs: list[dict]) -> None:
+    """Every renderer compiles the raw def again, uncached."""
+    original = codegen.compile_tool
+    codegen.compile_tool = lambda t: t if isinstance(t, tool_spec.ToolSpec) else tool_spec.build_tool_spec(t)
+    codegen.compile_tools = lambda ts: [codegen.compile_tool(t) for t in ts]
+    try:
+        _render_all(defs)
+    finally:
+        codegen.compile_tool = original
+        codegen.compile_tools = tool_spec.compile_tools
+
+
+def shared_ir(defs: list[dict]) -> None:
+    """Compile once, render from the frozen specs."""
+    tool_spec.clear_cache()
+    _render_all(tool_spec.compile_tools(defs))
+
+
+def _best(fn, defs: list[dict]) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(defs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    defs = _tool_defs(TOOL_COUNT)
+    baseline = _best(per_renderer_parse, defs)
+    compiled = _best(shared_ir, defs)
+    print(f"{TOOL_COUNT} tools, best of {ROUNDS}:")
+    print(f"  per-renderer parse: {baseline * 1000:8.1f} ms")
+    print(f"  shared IR:          {compiled * 1000:8.1f} ms")
+    print(f"  speedup:            {baseline / compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
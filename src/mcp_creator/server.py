@@ -7,7 +7,10 @@ from mcp_creator.tools.creator_profile import update_creator_profile as _update_
 from mcp_creator.tools.check_setup import check_setup as _check_setup
 from mcp_creator.tools.check_pypi_name import check_pypi_name as _check_pypi_name
 from mcp_creator.tools.scaffold_server import scaffold_server as _scaffold_server
+from mcp_creator.tools.scaffold_many import scaffold_many as _scaffold_many
+from mcp_creator.tools.scaffold_from_openapi import scaffold_from_openapi as _scaffold_from_openapi
 from mcp_creator.tools.add_tool import add_tool as _add_tool
+from mcp_creator.tools.sync_project import sync_project as _sync_project
 from mcp_creator.tools.build_package import build_package as _build_package
 from mcp_creator.tools.publish_package import publish_package as _publish_package
 from mcp_creator.tools.setup_github import setup_github as _setup_github
@@ -80,7 +83,28 @@ def check_pypi_name(package_name: str) -> str:
         "The generated server runs immediately with stub implementations. "
         "Set paid=true to add license key gating via the MCP Marketplace SDK. "
         "Set paid_tools to a JSON array of tool names to gate (omit to gate all). "
-        'Set hosting="remote" for an SSE/HTTP server with Dockerfile (default: "local" for stdio).'
+        'Set hosting="remote" for a stateless streamable HTTP server that runs several uvicorn '
+        'workers, with a Dockerfile (default: "local" for stdio). '
+        "Set dry_run=true to preview the generated files as a diff without writing anything. "
+        'Set output_format="zip" or "tar.gz" to pack the project into one archive in output_dir, '
+        "and archive_inline=true to get it back base64-encoded instead. "
+        "Set lazy_imports=true for large servers: tools are registered without importing their "
+        "modules, and each one is imported on its first call, so the server starts faster. "
+        "Set precomputed_schemas=true to register tools against JSON schemas generated at scaffold "
+        "time instead of having FastMCP introspect every function at startup; the project gets a "
+        "startup benchmark in benchmarks/. "
+        "Set async_tools=true to generate async def tools and services (or set \"async\": true "
+        "on individual tool defs) so I/O-bound services don't block the event loop. "
+        "Set api to a JSON object describing the upstream API ({base_url, auth_env, auth_header, "
+        "auth_prefix, timeout, connect_timeout, pool_size}; only base_url is required) to have every "
+        "service call it through one shared, pooled HTTP client; a tool def's own api block may set "
+        "a per-request timeout. "
+        "Set structured_output=true to have tools return JSON objects as MCP structured content "
+        "(with a compact JSON text fallback) instead of pretty-printed JSON strings; the project "
+        "gets an output benchmark in benchmarks/. "
+        "Set metrics=true to count and time every tool call (calls, errors and a latency histogram "
+        "per tool): remote servers serve them at /metrics in the Prometheus text format, stdio "
+        "servers write them to a JSON file periodically; the project gets an overhead benchmark."
     )
 )
 def scaffold_server(
@@ -92,6 +116,15 @@ def scaffold_server(
     paid: bool = False,
     paid_tools: str | None = None,
     hosting: str = "local",
+    dry_run: bool = False,
+    output_format: str = "directory",
+    archive_inline: bool = False,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: str | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
 ) -> str:
     """Scaffold a complete MCP server project."""
     return _scaffold_server(
@@ -103,6 +136,82 @@ def scaffold_server(
         paid=paid,
         paid_tools=paid_tools,
         hosting=hosting,
+        dry_run=dry_run,
+        output_format=output_format,
+        archive_inline=archive_inline,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools,
+        api=api,
+        structured_output=structured_output,
+        metrics=metrics,
+    )
+
+
+@mcp.tool(
+    description=(
+        "Scaffold many MCP server projects at once from a JSONL manifest file. "
+        "Each line is a JSON object of scaffold_server arguments (tools, env_vars and paid_tools "
+        "may be plain JSON instead of JSON strings). Projects are generated in parallel worker "
+        "processes; returns each project's result in completion order plus a throughput summary "
+        "(projects per second). Set max_workers=1 to run in-process."
+    )
+)
+def scaffold_many(manifest_path: str, output_dir: str = ".", max_workers: int = 0) -> str:
+    """Scaffold projects from a JSONL manifest."""
+    return _scaffold_many(manifest_path=manifest_path, output_dir=output_dir, max_workers=max_workers)
+
+
+@mcp.tool(
+    description=(
+        "Scaffold a complete MCP server from an OpenAPI 3 spec (JSON) — one tool per operation. "
+        "Parameters, request bodies, the base URL and auth scheme are taken from the spec, and each "
+        "service calls the API over HTTP, so the generated server works without hand-written stubs. "
+        "Large specs are read one path at a time and tools are rendered in parallel worker processes "
+        "(max_workers=0 = one per CPU, 1 = in-process). Deprecated and non-JSON operations are skipped "
+        "and listed. dry_run, output_format, archive_inline, lazy_imports, precomputed_schemas, "
+        "async_tools, api, structured_output and metrics work as for scaffold_server; api settings "
+        "override the spec's base URL."
+    )
+)
+def scaffold_from_openapi(
+    spec_path: str,
+    package_name: str,
+    output_dir: str = ".",
+    description: str = "",
+    paid: bool = False,
+    hosting: str = "local",
+    include_deprecated: bool = False,
+    dry_run: bool = False,
+    output_format: str = "directory",
+    archive_inline: bool = False,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: str | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
+    max_workers: int = 0,
+) -> str:
+    """Scaffold a server from an OpenAPI spec."""
+    return _scaffold_from_openapi(
+        spec_path=spec_path,
+        package_name=package_name,
+        output_dir=output_dir,
+        description=description,
+        paid=paid,
+        hosting=hosting,
+        include_deprecated=include_deprecated,
+        dry_run=dry_run,
+        output_format=output_format,
+        archive_inline=archive_inline,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools,
+        api=api,
+        structured_output=structured_output,
+        metrics=metrics,
+        max_workers=max_workers,
     )
 
 
@@ -110,12 +219,27 @@ def scaffold_server(
     description=(
         "Add a new tool to an existing scaffolded MCP server. "
         "Pass the project directory and a JSON tool definition. "
-        "Creates the tool module, service stub, test, and updates server.py."
+        "Creates the tool module, service stub, test, and updates server.py. "
+        "Set dry_run=true to preview the changes as a diff without writing anything."
     )
 )
-def add_tool(project_dir: str, tool: str) -> str:
+def add_tool(project_dir: str, tool: str, dry_run: bool = False) -> str:
     """Add a tool to an existing project."""
-    return _add_tool(project_dir=project_dir, tool=tool)
+    return _add_tool(project_dir=project_dir, tool=tool, dry_run=dry_run)
+
+
+@mcp.tool(
+    description=(
+        "Sync an existing scaffolded MCP server to the full desired list of tools. "
+        "Pass the project directory and a JSON array of tool definitions (same format as scaffold_server). "
+        "Only tools that were added, changed, or removed are regenerated; "
+        "service stubs the user has edited are never overwritten. "
+        "Set dry_run=true to preview the changes as a diff without writing anything."
+    )
+)
+def sync_project(project_dir: str, tools: str, dry_run: bool = False) -> str:
+    """Sync a project to a tool manifest."""
+    return _sync_project(project_dir=project_dir, tools=tools, dry_run=dry_run)
 
 
 @mcp.tool(
@@ -163,7 +287,8 @@ def setup_github(
     description=(
         "Generate a LAUNCHGUIDE.md for MCP Marketplace submission. "
         "Creates a formatted file ready to submit at mcp-marketplace.io. "
-        "Limits: tagline max 100 chars, features max 30 items, tags max 30."
+        "Limits: tagline max 100 chars, features max 30 items, tags max 30. "
+        "Set dry_run=true to preview the file as a diff without writing it."
     )
 )
 def generate_launchguide(
@@ -177,6 +302,7 @@ def generate_launchguide(
     tags: str,
     setup_requirements: str = "No environment variables required.",
     docs_url: str = "",
+    dry_run: bool = False,
 ) -> str:
     """Generate LAUNCHGUIDE.md."""
     return _generate_launchguide(
@@ -190,6 +316,7 @@ def generate_launchguide(
         tags=tags,
         setup_requirements=setup_requirements,
         docs_url=docs_url,
+        dry_run=dry_run,
     )
 
 
@@ -0,0 +1,130 @@
+"""Pack generated project files into a zip or tar.gz archive without touching disk.
+
+Archives are reproducible: entries are written in a fixed order (sorted
+paths for a dict, arrival order for a stream) with fixed timestamps, owners,
+and permissions, so the same files always produce the same bytes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Mapping
+
+from mcp_creator.services.file_writer import Content
+
+ARCHIVE_FORMATS = ("zip", "tar.gz")
+
+FILE_MODE = 0o644
+DIR_MODE = 0o755
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def archive_suffix(fmt: str) -> str:
+    """Return the file extension for an archive format."""
+    return ".zip" if fmt == "zip" else ".tar.gz"
+
+
+def _entries(
+    files: Mapping[str, Content] | Iterable[tuple[str, Content]],
+    root: str,
+) -> Iterator[tuple[str, Content | None]]:
+    """Yield (archive_path, content) pairs; content is None for directories.
+
+    Each directory is yielded just before the first file inside it. A dict
+    is walked in sorted path order; any other iterable in arrival order.
+    """
+    items = sorted(files.items()) if isinstance(files, Mapping) else files
+    seen = {root}
+    yield root, None
+    for rel_path, content in items:
+        missing = []
+        parent = Path(rel_path).parent
+        while parent != Path(".") and f"{root}/{parent.as_posix()}" not in seen:
+            missing.append(f"{root}/{parent.as_posix()}")
+            parent = parent.parent
+        for d in reversed(missing):
+            seen.add(d)
+            yield d, None
+        yield f"{root}/{rel_path}", content
+
+
+def _pieces(content: Content) -> Iterable[str]:
+    return (content,) if isinstance(content, str) else content
+
+
+def _write_zip(out: BinaryIO, entries: Iterable[tuple[str, Content | None]]) -> None:
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in entries:
+            if content is None:
+                info = zipfile.ZipInfo(name + "/", date_time=ZIP_EPOCH)
+                info.external_attr = ((0o040000 | DIR_MODE) << 16) | 0x10
+                info.create_system = 3
+                zf.writestr(info, b"")
+            else:
+                info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+                info.external_attr = (0o100000 | FILE_MODE) << 16
+                info.create_system = 3
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with zf.open(info, "w") as member:
+                    for piece in _pieces(content):
+                        member.write(piece.encode("utf-8"))
+
+
+def _write_tar_gz(out: BinaryIO, entries: Iterable[tuple[str, Content | None]]) -> None:
+    with gzip.GzipFile(filename="", mode="wb", fileobj=out, mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tf:
+            for name, content in entries:
+                info = tarfile.TarInfo(name)
+                info.mtime = 0
+                info.uid = info.gid = 0
+                info.uname = info.gname = ""
+                if content is None:
+                    info.type = tarfile.DIRTYPE
+                    info.mode = DIR_MODE
+                    tf.addfile(info)
+                else:
+                    # tar headers carry the size up front, so each file is joined.
+                    data = "".join(_pieces(content)).encode("utf-8")
+                    info.mode = FILE_MODE
+                    info.size = len(data)
+                    tf.addfile(info, io.BytesIO(data))
+
+
+def write_archive(
+    files: Mapping[str, Content] | Iterable[tuple[str, Content]],
+    fmt: str,
+    *,
+    root: str,
+    dest: str | Path | None = None,
+) -> bytes | None:
+    """Pack {relative_path: content} into an archive under a top-level root folder.
+
+    Args:
+        files: Generated project files, as a {relative_path: content} dict or
+               a stream of (relative_path, content) pairs. Content may be a
+               string or an iterable of string pieces.
+        fmt: "zip" or "tar.gz".
+        root: Top-level directory name inside the archive (the package name).
+        dest: If given, stream the archive to this file and return None.
+              Otherwise build it in memory and return the bytes.
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format {fmt!r}; expected one of {ARCHIVE_FORMATS}.")
+
+    entries = _entries(files, root)
+    writer = _write_zip if fmt == "zip" else _write_tar_gz
+
+    if dest is not None:
+        path = Path(dest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as out:
+            writer(out, entries)
+        return None
+
+    buffer = io.BytesIO()
+    writer(buffer, entries)
+    return buffer.getvalue()
@@ -1,125 +1,186 @@
 """Code generation for scaffolded MCP server projects.
 
-All functions are pure — they return strings, no I/O.
+All functions are pure — they return strings, no I/O. The text itself lives
+in the templates under mcp_creator/templates, each compiled once per process
+by services.template_engine.
 """
 
 from __future__ import annotations
 
-PYPROJECT_TEMPLATE = """\
-[project]
-name = "{package_name}"
-version = "0.1.0"
-description = "{description}"
-readme = "README.md"
-requires-python = ">=3.11"
-license = {{ text = "MIT" }}
-dependencies = [
-    "mcp[cli]>=1.0.0",
-]
-
-[project.scripts]
-{package_name} = "{module_name}.server:main"
-
-[build-system]
-requires = ["hatchling"]
-build-backend = "hatchling.build"
-
-[tool.hatch.build.targets.wheel]
-packages = ["src/{module_name}"]
-
-[project.optional-dependencies]
-dev = [
-    "pytest>=8.0.0",
-    "pytest-asyncio>=0.23.0",
-]
-"""
-
-GITIGNORE_TEMPLATE = """\
-__pycache__/
-*.py[cod]
-*$py.class
-*.egg-info/
-dist/
-build/
-.eggs/
-*.egg
-.venv/
-venv/
-.env
-*.so
-.pytest_cache/
-.mypy_cache/
-.ruff_cache/
-"""
+import json
+import re
+from typing import Iterable, Iterator
+
+from mcp_creator.services.template_engine import iter_template, render_template
+from mcp_creator.services.tool_spec import (
+    PAGE_PARAMS,
+    ApiSpec,
+    LazySpecs,
+    ToolSpec,
+    compile_tool,
+    compile_tools,
+    input_schema,
+    python_type,
+    uses_batch,
+    uses_limits,
+)
+
+
+# The mcp release generated projects require: the oldest one, unless a
+# feature needs FastMCP APIs that arrived later.
+MCP_MIN_VERSION = "1.0.0"
+MCP_STREAMABLE_HTTP_VERSION = "1.8.0"  # stateless_http, json_response, streamable_http_app()
+MCP_STRUCTURED_OUTPUT_VERSION = "1.10.0"  # structuredContent, output schemas, convert_result
+_MCP_REQUIREMENT_RE = re.compile(r'"mcp\[cli\]>=([0-9.]+)"')
 
-INIT_TEMPLATE = '""""{package_name} MCP server."""\n'
 
-TRANSPORT_TEMPLATE = """\
-\"\"\"Transport helpers for {package_name}.\"\"\"
-
-import sys
+def _to_module_name(package_name: str) -> str:
+    """Convert a PyPI package name to a Python module name."""
+    return package_name.replace("-", "_")
 
 
-def run_stdio(mcp_app):
-    \"\"\"Run the MCP server over stdio (default for Claude Code / Cursor).\"\"\"
-    mcp_app.run(transport="stdio")
+def _py_str(value: str) -> str:
+    """Render a string as a double-quoted Python string literal."""
+    return json.dumps(value, ensure_ascii=False)
 
 
-def run_http(mcp_app, host: str = "0.0.0.0", port: int = 8000):
-    \"\"\"Run the MCP server over HTTP (for remote hosting).\"\"\"
-    mcp_app.run(transport="sse", host=host, port=port)
-"""
+def _py_literal(value: object) -> str:
+    """Render JSON-like data as a Python literal, with double-quoted strings."""
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_py_str(k)}: {_py_literal(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_py_literal(v) for v in value) + "]"
+    if isinstance(value, str):
+        return _py_str(value)
+    return repr(value)
 
 
-def _to_module_name(package_name: str) -> str:
-    """Convert a PyPI package name to a Python module name."""
-    return package_name.replace("-", "_")
+def _returns(structured: bool) -> str:
+    """Return annotation of generated tool functions."""
+    return "dict[str, Any]" if structured else "str"
 
 
 def _python_type(type_str: str) -> str:
     """Map a simple type string to a Python type annotation."""
-    mapping = {
-        "string": "str",
-        "str": "str",
-        "integer": "int",
-        "int": "int",
-        "number": "float",
-        "float": "float",
-        "boolean": "bool",
-        "bool": "bool",
-        "list": "list",
-        "array": "list",
-        "dict": "dict",
-        "object": "dict",
-    }
-    return mapping.get(type_str.lower(), "str")
-
-
-def render_pyproject(package_name: str, description: str, *, paid: bool = False) -> str:
-    module_name = _to_module_name(package_name)
-    base = PYPROJECT_TEMPLATE.format(
+    return python_type(type_str)
+
+
+def mcp_version(
+    *,
+    hosting: str = "local",
+    limits: bool = False,
+    metrics: bool = False,
+    precomputed_schemas: bool = False,
+    structured_output: bool = False,
+) -> str:
+    """The oldest mcp release with every FastMCP API the project's features use.
+
+    Limits and metrics wrap call_tool(convert_result=...), precomputed
+    schemas declare output schemas, and structured output returns
+    structuredContent; a remote server also serves stateless streamable HTTP.
+    """
+    if limits or metrics or precomputed_schemas or structured_output:
+        return MCP_STRUCTURED_OUTPUT_VERSION
+    if hosting == "remote":
+        return MCP_STREAMABLE_HTTP_VERSION
+    return MCP_MIN_VERSION
+
+
+def raise_mcp_requirement(pyproject: str, version: str) -> str:
+    """Raise pyproject.toml's mcp requirement to at least version; anything else is kept as is."""
+    def _raised(match: re.Match) -> str:
+        current = tuple(int(part) for part in match.group(1).split(".") if part)
+        wanted = tuple(int(part) for part in version.split("."))
+        return f'"mcp[cli]>={version}"' if current < wanted else match.group(0)
+
+    return _MCP_REQUIREMENT_RE.sub(_raised, pyproject, count=1)
+
+
+def render_pyproject(
+    package_name: str,
+    description: str,
+    *,
+    paid: bool = False,
+    http: bool = False,
+    mcp_version: str = MCP_MIN_VERSION,
+) -> str:
+    return render_template(
+        "pyproject.toml.tmpl",
         package_name=package_name,
         description=description,
-        module_name=module_name,
+        module_name=_to_module_name(package_name),
+        paid=paid,
+        http=http,
+        mcp_version=mcp_version,
     )
-    if paid:
-        base = base.replace(
-            '    "mcp[cli]>=1.0.0",\n]',
-            '    "mcp[cli]>=1.0.0",\n    "mcp-marketplace-license>=1.1.0",\n]',
-        )
-    return base
 
 
 def render_gitignore() -> str:
-    return GITIGNORE_TEMPLATE
+    return render_template("gitignore.tmpl")
 
 
 def render_init(package_name: str) -> str:
-    return INIT_TEMPLATE.format(package_name=package_name)
+    return render_template("init.py.tmpl", package_name=package_name)
+
+
+def render_lifecycle() -> str:
+    """Render lifecycle.py, which keeps one long-lived instance per service."""
+    return render_template("lifecycle.py.tmpl")
+
+
+def render_api_client(api: ApiSpec) -> str:
+    """Render services/api_client.py, the shared pooled HTTP client for the upstream API."""
+    return render_template("api_client.py.tmpl", api=api, q=_py_str)
+
+
+def render_cache(package_name: str) -> str:
+    """Render cache.py, the LRU + TTL result cache used by tools with a "cache" block."""
+    return render_template("cache.py.tmpl", package_name=package_name)
+
+
+def render_pagination() -> str:
+    """Render pagination.py, which serves paginated tools' results a page at a time."""
+    return render_template("pagination.py.tmpl")
+
+
+def render_batch() -> str:
+    """Render batch.py, which registers <tool>_batch companions for tools with "batch": true."""
+    return render_template("batch.py.tmpl")
+
+
+def render_limits() -> str:
+    """Render limits.py: concurrency limits, wait queues and timeouts for tool calls."""
+    return render_template("limits.py.tmpl")
+
+
+def render_test_limits(package_name: str, tools: list[dict | ToolSpec]) -> str:
+    """Render tests/test_limits.py, covering busy and timeout errors and each limited tool."""
+    return render_template(
+        "test_limits.py.tmpl",
+        module_name=_to_module_name(package_name),
+        limited=[spec for spec in compile_tools(tools) if spec.limits is not None],
+    )
+
+
+def render_profiling(package_name: str) -> str:
+    """Render profiling.py, which profiles the tool calls MCP_PROFILE names."""
+    return render_template("profiling.py.tmpl", module_name=_to_module_name(package_name))
+
+
+def render_metrics(package_name: str) -> str:
+    """Render metrics.py: per-tool call counts, error counts and latency histograms."""
+    return render_template("metrics.py.tmpl", module_name=_to_module_name(package_name))
+
+
+def render_test_metrics(package_name: str, *, hosting: str = "local") -> str:
+    """Render tests/test_metrics.py, covering the counters, their output and /metrics when remote."""
+    return render_template("test_metrics.py.tmpl", module_name=_to_module_name(package_name), hosting=hosting)
 
 
 def render_transport(package_name: str) -> str:
-    return TRANSPORT_TEMPLATE.format(package_name=package_name)
+    return render_template(
+        "transport.py.tmpl", package_name=package_name, module_name=_to_module_name(package_name),
+    )
 
 
 def render_env_example(
@@ -127,462 +188,424 @@ def render_env_example(
     *,
     paid: bool = False,
     hosting: str = "local",
+    api: ApiSpec | None = None,
+    metrics: bool = False,
 ) -> str | None:
-    """Render .env.example if env vars are declared or paid/remote. Returns None if nothing needed."""
-    has_vars = bool(env_vars) or paid or hosting == "remote"
+    """Render .env.example if env vars are declared or paid/remote/api/metrics. Returns None if nothing needed."""
+    has_vars = bool(env_vars) or paid or hosting == "remote" or api is not None or metrics
     if not has_vars:
         return None
-    lines = ["# Environment variables for this MCP server", ""]
+    declared = {var.get("name") for var in env_vars or [] if isinstance(var, dict)}
+    return render_template(
+        "env.example.tmpl",
+        env_vars=env_vars or [],
+        paid=paid,
+        hosting=hosting,
+        api=api,
+        metrics=metrics,
+        declared=declared,
+    )
+
+
+def _server_imports(
+    *, paid: bool, hosting: str, lazy_imports: bool, precomputed_schemas: bool, structured_output: bool,
+) -> list[str]:
+    """Standard-library modules server.py imports for the given options."""
+    modules = set()
     if paid:
-        lines.append("# License key for paid features (required)")
-        lines.append("# Get one at mcp-marketplace.io")
-        lines.append("MCP_LICENSE_KEY=")
-        lines.append("")
+        modules |= {"json", "os", "threading", "time"}
+    if structured_output:
+        modules |= {"json", "os"}
     if hosting == "remote":
-        lines.append("# Server port (optional, default 8000)")
-        lines.append("PORT=8000")
-        lines.append("")
-    if env_vars:
-        for var in env_vars:
-            name = var.get("name", "UNKNOWN")
-            desc = var.get("description", "")
-            required = var.get("required", True)
-            tag = "required" if required else "optional"
-            lines.append(f"# {desc} ({tag})")
-            lines.append(f"{name}=")
-            lines.append("")
-    return "\n".join(lines)
+        modules.add("os")
+    if lazy_imports:
+        modules |= {"functools", "importlib"}
+    if precomputed_schemas:
+        modules.add("inspect")
+    return sorted(modules)
 
 
 def render_server(
     package_name: str,
-    tools: list[dict],
+    tools: list[dict | ToolSpec],
     *,
     paid: bool = False,
     paid_tools: list[str] | None = None,
     hosting: str = "local",
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    structured_output: bool = False,
+    metrics: bool = False,
+    api: ApiSpec | None = None,
 ) -> str:
-    """Render the main server.py with FastMCP and tool registrations."""
-    module_name = _to_module_name(package_name)
-    gated = set(paid_tools or [])
+    """Render the main server.py with FastMCP and tool registrations.
+
+    With lazy_imports, tools are registered without importing their modules;
+    each one is imported on its first call. With precomputed_schemas, tools
+    are registered against JSON schemas worked out here rather than ones
+    FastMCP builds by introspection at startup. With structured_output,
+    tools return JSON objects sent as structured content. With metrics,
+    every tool call is counted and timed by metrics.py.
+    """
+    return render_template(
+        "server.py.tmpl",
+        package_name=package_name,
+        module_name=_to_module_name(package_name),
+        specs=compile_tools(tools),
+        paid=paid,
+        gated=set(paid_tools or []),
+        hosting=hosting,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output,
+        stdlib_imports=_server_imports(
+            paid=paid, hosting=hosting, lazy_imports=lazy_imports,
+            precomputed_schemas=precomputed_schemas, structured_output=structured_output,
+        ),
+        registration=render_tool_registration,
+        batch=uses_batch(tools),
+        limits=hosting == "remote" or uses_limits(tools),
+        metrics=metrics,
+        api=api,
+    )
 
-    lines = [
-        f'"""MCP server for {package_name}."""',
-        "",
-    ]
 
-    if paid:
-        lines.append("import json")
-        lines.append("")
+def iter_server(
+    package_name: str,
+    tools: Iterable[dict | ToolSpec],
+    *,
+    paid: bool = False,
+    paid_tools: list[str] | None = None,
+    hosting: str = "local",
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    structured_output: bool = False,
+    metrics: bool = False,
+    api: ApiSpec | None = None,
+) -> Iterator[str]:
+    """Render server.py piece by piece, compiling each tool only as it is reached.
+
+    Produces the same text as render_server without holding it, or the
+    compiled specs, in memory. tools must be re-iterable (e.g. a list).
+    """
+    return iter_template(
+        "server.py.tmpl",
+        package_name=package_name,
+        module_name=_to_module_name(package_name),
+        specs=LazySpecs(tools),
+        paid=paid,
+        gated=set(paid_tools or []),
+        hosting=hosting,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output,
+        stdlib_imports=_server_imports(
+            paid=paid, hosting=hosting, lazy_imports=lazy_imports,
+            precomputed_schemas=precomputed_schemas, structured_output=structured_output,
+        ),
+        registration=render_tool_registration,
+        batch=uses_batch(tools),
+        limits=hosting == "remote" or uses_limits(tools),
+        metrics=metrics,
+        api=api,
+    )
 
-    if hosting == "remote":
-        lines.append("import os")
-        lines.append("")
 
-    lines.append("from mcp.server.fastmcp import FastMCP")
+def render_tool_module(package_name: str, tool: dict | ToolSpec, *, structured: bool = False) -> str:
+    """Render a single tool module file (tools/<name>.py).
+
+    The tool returns its service's result as a JSON string, or as the dict
+    itself with structured.
+    """
+    spec = compile_tool(tool)
+    return render_template(
+        "tool.py.tmpl",
+        module_name=_to_module_name(package_name),
+        spec=spec,
+        structured=structured,
+        returns=_returns(structured),
+        description=spec.description or f"{spec.name} tool",
+    )
 
-    if paid:
-        lines.append("from mcp_marketplace_license import verify_license")
 
-    lines.append("")
-    lines.append("# --- IMPORTS ---")
+def render_service_module(
+    package_name: str, tool: dict | ToolSpec, *, api: ApiSpec | None = None,
+) -> str:
+    """Render a service module (services/<name>_service.py).
 
-    for tool in tools:
-        tool_name = tool["name"]
-        lines.append(
-            f"from {module_name}.tools.{tool_name} import {tool_name} as _{tool_name}_impl"
+    Tools with an "http" block get a service that calls the API; all others
+    get a TODO stub, which takes the shared API client when the project has
+    one.
+    """
+    spec = compile_tool(tool)
+    module_name = _to_module_name(package_name)
+    if spec.http is not None:
+        return render_template(
+            "http_service.py.tmpl",
+            module_name=module_name,
+            spec=spec,
+            q=_py_str,
+            http=spec.http,
+            description=spec.description or f"{spec.name} service",
         )
 
-    lines.append("# --- END IMPORTS ---")
-    lines.append("")
-    lines.append(f'mcp = FastMCP("{package_name}")')
+    # Build placeholder return dict
+    placeholder_fields = {}
+    for p in spec.service_params:
+        placeholder_fields[p.name] = p.name
+    placeholder_fields["status"] = '"ok"'
 
-    if paid:
-        lines.append("")
-        lines.append("")
-        lines.append("def _require_license(tool_name: str) -> str | None:")
-        lines.append('    """Return None if licensed, or a JSON error string."""')
-        lines.append(f'    result = verify_license(slug="{package_name}")')
-        lines.append('    if result.get("valid"):')
-        lines.append("        return None")
-        lines.append("    return json.dumps({")
-        lines.append('        "error": "premium_required",')
-        lines.append('        "reason": result.get("reason", "unknown"),')
-        lines.append("        \"message\": f\"The '{tool_name}' tool requires a license. \"")
-        lines.append(f'            "Set MCP_LICENSE_KEY to unlock it. "')
-        lines.append(f'            "Get your key at https://mcp-marketplace.io/server/{package_name}",')
-        lines.append("    })")
-
-    lines.append("")
-    lines.append("# --- TOOLS ---")
-
-    for tool in tools:
-        tool_name = tool["name"]
-        tool_desc = tool.get("description", f"{tool_name} tool")
-        params = tool.get("parameters", [])
-        is_gated = paid and (not gated or tool_name in gated)
-
-        # Build parameter list
-        param_parts = []
-        for p in params:
-            pname = p["name"]
-            ptype = _python_type(p.get("type", "string"))
-            if p.get("required", True):
-                param_parts.append(f"{pname}: {ptype}")
-            else:
-                default = p.get("default")
-                if default is None:
-                    default_str = "None"
-                    ptype = f"{ptype} | None"
-                elif isinstance(default, str):
-                    default_str = f'"{default}"'
-                else:
-                    default_str = str(default)
-                param_parts.append(f"{pname}: {ptype} = {default_str}")
-
-        param_str = ", ".join(param_parts)
-        call_args = ", ".join(p["name"] for p in params)
-
-        lines.append("")
-        lines.append(f'@mcp.tool(description="{tool_desc}")')
-        lines.append(f"def {tool_name}({param_str}) -> str:")
-        lines.append(f'    """Call the {tool_name} tool."""')
-        if is_gated:
-            lines.append(f'    err = _require_license("{tool_name}")')
-            lines.append("    if err:")
-            lines.append("        return err")
-        lines.append(f"    return _{tool_name}_impl({call_args})")
-
-    lines.append("# --- END TOOLS ---")
-    lines.append("")
-    lines.append("")
-    lines.append("def main():")
-    lines.append('    """Run the MCP server."""')
-    if hosting == "remote":
-        lines.append('    port = int(os.environ.get("PORT", "8000"))')
-        lines.append('    mcp.run(transport="sse", host="0.0.0.0", port=port)')
-    else:
-        lines.append("    mcp.run()")
-    lines.append("")
-    lines.append("")
-    lines.append('if __name__ == "__main__":')
-    lines.append("    main()")
-    lines.append("")
+    return render_template(
+        "service.py.tmpl",
+        module_name=module_name,
+        api=api,
+        spec=spec,
+        description=spec.description or f"{spec.name} service",
+        placeholder_fields=placeholder_fields,
+    )
 
-    return "\n".join(lines)
 
+def render_test_server(
+    package_name: str,
+    tools: list[dict | ToolSpec],
+    *,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    structured_output: bool = False,
+    paid: bool = False,
+) -> str:
+    """Render test_server.py that verifies tool registration.
+
+    With lazy_imports it also checks that importing server.py loads no tool
+    module and stays within an import-time budget; paid projects import it
+    with the license SDK stubbed out. With precomputed_schemas
+    it checks the schemas against what FastMCP's introspection produces.
+    With structured_output it checks the structured result and its text
+    fallback.
+    """
+    tool_names = [t.name if isinstance(t, ToolSpec) else t["name"] for t in tools]
+    expected_set = "{" + ", ".join(f'"{n}"' for n in tool_names) + "}"
+    return render_template(
+        "test_server.py.tmpl",
+        module_name=_to_module_name(package_name),
+        expected_set=expected_set,
+        paid=paid,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output,
+    )
 
-def render_tool_module(package_name: str, tool: dict) -> str:
-    """Render a single tool module file (tools/<name>.py)."""
-    module_name = _to_module_name(package_name)
-    tool_name = tool["name"]
-    tool_desc = tool.get("description", f"{tool_name} tool")
-    params = tool.get("parameters", [])
-    returns = tool.get("returns", "Result as JSON string")
-
-    # Build function signature
-    param_parts = []
-    for p in params:
-        pname = p["name"]
-        ptype = _python_type(p.get("type", "string"))
-        if p.get("required", True):
-            param_parts.append(f"{pname}: {ptype}")
-        else:
-            default = p.get("default")
-            if default is None:
-                default_str = "None"
-                ptype = f"{ptype} | None"
-            elif isinstance(default, str):
-                default_str = f'"{default}"'
-            else:
-                default_str = str(default)
-            param_parts.append(f"{pname}: {ptype} = {default_str}")
-
-    param_str = ", ".join(param_parts)
-
-    lines = [
-        f'"""{tool_desc}."""',
-        "",
-        "import json",
-        "",
-        f"from {module_name}.services.{tool_name}_service import {_to_class_name(tool_name)}",
-        "",
-        "",
-        f"def {tool_name}({param_str}) -> str:",
-        f'    """{tool_desc}',
-        "",
-        f"    Returns:",
-        f"        {returns}",
-        '    """',
-        f"    service = {_to_class_name(tool_name)}()",
-        f"    result = service.execute({', '.join(p['name'] + '=' + p['name'] for p in params)})",
-        "    return json.dumps(result, indent=2)",
-        "",
-    ]
-
-    return "\n".join(lines)
-
-
-def render_service_module(tool: dict) -> str:
-    """Render a service stub (services/<name>_service.py)."""
-    tool_name = tool["name"]
-    tool_desc = tool.get("description", f"{tool_name} service")
-    params = tool.get("parameters", [])
-    class_name = _to_class_name(tool_name)
-
-    param_parts = []
-    for p in params:
-        pname = p["name"]
-        ptype = _python_type(p.get("type", "string"))
-        if p.get("required", True):
-            param_parts.append(f"{pname}: {ptype}")
-        else:
-            default = p.get("default")
-            if default is None:
-                default_str = "None"
-                ptype = f"{ptype} | None"
-            elif isinstance(default, str):
-                default_str = f'"{default}"'
-            else:
-                default_str = str(default)
-            param_parts.append(f"{pname}: {ptype} = {default_str}")
-
-    param_str = ", ".join(param_parts)
 
-    # Build placeholder return dict
-    placeholder_fields = {}
-    for p in params:
-        placeholder_fields[p["name"]] = p["name"]
-    placeholder_fields["status"] = '"ok"'
+def render_conftest(
+    package_name: str, *, paid: bool = False, api: ApiSpec | None = None, cache: bool = False,
+) -> str:
+    """Render tests/conftest.py, which resets service instances between tests.
+
+    Paid projects also get a local stub of the license SDK, projects with
+    an upstream API a local stand-in HTTP server for it, and projects with
+    cached tools a throwaway directory for persisted caches.
+    """
+    return render_template(
+        "conftest.py.tmpl",
+        module_name=_to_module_name(package_name),
+        paid=paid,
+        api=api,
+        cache=cache,
+    )
 
-    result_lines = [f'            "{k}": {v},' for k, v in placeholder_fields.items()]
-    result_block = "\n".join(result_lines)
-
-    lines = [
-        f'"""{tool_desc} — service layer."""',
-        "",
-        "",
-        f"class {class_name}:",
-        f'    """{tool_desc}.',
-        "",
-        "    TODO: Replace the stub implementation with your real logic.",
-        '    """',
-        "",
-        f"    def execute(self, {param_str}) -> dict:",
-        f'        """Run {tool_name} and return results."""',
-        "        # TODO: Implement your logic here",
-        "        return {",
-        result_block,
-        "        }",
-        "",
-    ]
-
-    return "\n".join(lines)
-
-
-def render_test_server(package_name: str, tools: list[dict]) -> str:
-    """Render test_server.py that verifies tool registration."""
-    module_name = _to_module_name(package_name)
-    tool_names = [t["name"] for t in tools]
-    expected_set = "{" + ", ".join(f'"{n}"' for n in tool_names) + "}"
 
-    lines = [
-        f'"""Test that all tools are registered on the MCP server."""',
-        "",
-        f"from {module_name}.server import mcp",
-        "",
-        "",
-        "def test_tools_registered():",
-        f"    tool_names = set(mcp._tool_manager._tools.keys())",
-        f"    expected = {expected_set}",
-        "    assert expected.issubset(tool_names), f\"Missing tools: {expected - tool_names}\"",
-        "",
-    ]
+def render_test_api_client(package_name: str, api: ApiSpec) -> str:
+    """Render tests/test_api_client.py covering the shared pooled client."""
+    return render_template(
+        "test_api_client.py.tmpl", module_name=_to_module_name(package_name), api=api,
+    )
+
+
+def render_test_license(package_name: str) -> str:
+    """Render tests/test_license.py covering the cached license check (paid projects)."""
+    return render_template("test_license.py.tmpl", module_name=_to_module_name(package_name))
+
 
-    return "\n".join(lines)
+_SAMPLE_ARGS = {"int": "1", "float": "1.0", "bool": "True"}
 
 
-def render_test_tool(package_name: str, tool: dict) -> str:
+def render_test_tool(package_name: str, tool: dict | ToolSpec, *, structured: bool = False) -> str:
     """Render a basic test for a single tool."""
-    module_name = _to_module_name(package_name)
-    tool_name = tool["name"]
-    params = tool.get("parameters", [])
+    spec = compile_tool(tool)
 
     # Build test call args
-    test_args = []
-    for p in params:
-        ptype = p.get("type", "string").lower()
-        if ptype in ("string", "str"):
-            test_args.append(f'{p["name"]}="test"')
-        elif ptype in ("integer", "int"):
-            test_args.append(f'{p["name"]}=1')
-        elif ptype in ("number", "float"):
-            test_args.append(f'{p["name"]}=1.0')
-        elif ptype in ("boolean", "bool"):
-            test_args.append(f'{p["name"]}=True')
-        else:
-            test_args.append(f'{p["name"]}="test"')
-
-    args_str = ", ".join(test_args)
-
-    lines = [
-        f'"""Test {tool_name} tool."""',
-        "",
-        "import json",
-        "",
-        f"from {module_name}.tools.{tool_name} import {tool_name}",
-        "",
-        "",
-        f"def test_{tool_name}_returns_json():",
-        f"    result = {tool_name}({args_str})",
-        "    data = json.loads(result)",
-        "    assert isinstance(data, dict)",
-        "",
-    ]
-
-    return "\n".join(lines)
+    values = {p.name: _SAMPLE_ARGS.get(p.py_type, '"test"') for p in spec.service_params}
+    test_args = [f"{name}={value}" for name, value in values.items()]
+    batch_args = "{" + ", ".join(f"{_py_str(name)}: {value}" for name, value in values.items()) + "}"
+    # A paginated tool is called without cursor or page_size, so they keep their defaults
+    key_values = {**values, **{p.name: repr(p.default) for p in PAGE_PARAMS}}
+    cache_key_args = [f"{name}={key_values[name]}" for name in spec.cache.key] if spec.cache else []
+
+    return render_template(
+        "test_http_tool.py.tmpl" if spec.http is not None else "test_tool.py.tmpl",
+        module_name=_to_module_name(package_name),
+        spec=spec,
+        test_args=", ".join(test_args),
+        cache_key_args=", ".join(cache_key_args),
+        batch_args=batch_args,
+        structured=structured,
+        q=_py_str,
+    )
 
 
 def render_readme(
     package_name: str,
     description: str,
-    tools: list[dict],
+    tools: list[dict | ToolSpec],
     *,
     paid: bool = False,
     hosting: str = "local",
+    precomputed_schemas: bool = False,
+    structured_output: bool = False,
+    metrics: bool = False,
 ) -> str:
     """Render README.md for the generated project."""
+    return render_template(
+        "README.md.tmpl",
+        package_name=package_name,
+        description=description,
+        specs=compile_tools(tools),
+        paid=paid,
+        hosting=hosting,
+        precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output,
+        metrics=metrics,
+    )
+
+
+def iter_readme(
+    package_name: str,
+    description: str,
+    tools: Iterable[dict | ToolSpec],
+    *,
+    paid: bool = False,
+    hosting: str = "local",
+    precomputed_schemas: bool = False,
+    structured_output: bool = False,
+    metrics: bool = False,
+) -> Iterator[str]:
+    """Render README.md piece by piece; see iter_server."""
+    return iter_template(
+        "README.md.tmpl",
+        package_name=package_name,
+        description=description,
+        specs=LazySpecs(tools),
+        paid=paid,
+        hosting=hosting,
+        precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output,
+        metrics=metrics,
+    )
+
+
+def render_dockerfile(package_name: str) -> str:
+    """Render the multi-stage Dockerfile for remote hosting."""
+    return render_template("Dockerfile.tmpl", package_name=package_name)
+
+
+def render_dockerignore() -> str:
+    """Render the .dockerignore that keeps the build context to what the Dockerfile copies."""
+    return render_template("dockerignore.tmpl")
+
+
+def render_add_tool_import(package_name: str, tool_name: str) -> str:
+    """Render the import line for a new tool to inject into server.py."""
     module_name = _to_module_name(package_name)
+    return f"from {module_name}.tools.{tool_name} import {tool_name} as _{tool_name}_impl"
+
 
-    tool_list = "\n".join(
-        f"- **{t['name']}** — {t.get('description', t['name'])}" for t in tools
+def render_tool_registration(
+    tool: dict | ToolSpec,
+    *,
+    gated: bool = False,
+    lazy: bool = False,
+    schemas: bool = False,
+    structured: bool = False,
+) -> str:
+    """Render the @mcp.tool decorated function for one tool in server.py.
+
+    The block starts with a blank line and has no trailing newline, so it
+    can be appended to the TOOLS section of server.py as-is. With lazy, it
+    calls the tool through server.py's _load_tool shim instead of an import.
+    With schemas, it registers through server.py's _schema_tool decorator,
+    passing the tool's input schema as a literal. With structured, it
+    returns the tool's result through server.py's _structured_result.
+    """
+    spec = compile_tool(tool)
+    block = render_template(
+        "tool_registration.py.tmpl",
+        spec=spec,
+        gated=gated,
+        lazy=lazy,
+        structured=structured,
+        returns=_returns(structured),
+        schema=_py_literal(input_schema(spec)) if schemas else None,
     )
+    return block.removesuffix("\n")
 
-    sections = [f"# {package_name}", "", description, ""]
 
-    if hosting == "local":
-        sections += [
-            "## Install", "",
-            "```bash", f"pip install {package_name}", "```", "",
-        ]
-    else:
-        sections += [
-            "## Connect", "",
-            "This is a remote MCP server. Add to your Claude Code config:", "",
-            "```json", "{", f'  "mcpServers": {{', f'    "{package_name}": {{',
-            f'      "url": "https://your-server.com/mcp"',
-            "    }", "  }", "}", "```", "",
-        ]
+def render_batch_import(package_name: str) -> str:
+    """Render the server.py import of register_batch, for projects with batch tools."""
+    return f"from {_to_module_name(package_name)}.batch import register_batch"
 
-    sections += ["## Tools", "", tool_list, ""]
 
-    if paid:
-        sections += [
-            "## License Key", "",
-            f"This server requires a license key from [MCP Marketplace](https://mcp-marketplace.io/server/{package_name}).", "",
-            "Set the `MCP_LICENSE_KEY` environment variable:", "",
-            "```bash", "export MCP_LICENSE_KEY=mcp_live_your_key_here", "```", "",
-        ]
-
-    if hosting == "local":
-        sections += [
-            "## Usage with Claude Code", "",
-            "Add to your Claude Code MCP config (`~/.claude/settings.json`):", "",
-            "```json", "{{", '  "mcpServers": {{',
-            f'    "{package_name}": {{',
-            f'      "command": "{package_name}",',
-            '      "args": []',
-        ]
-        if paid:
-            sections[-1] = '      "args": [],'
-            sections += [
-                f'      "env": {{ "MCP_LICENSE_KEY": "mcp_live_your_key_here" }}',
-            ]
-        sections += ["    }}", "  }}", "}}", "```", ""]
-    elif hosting == "remote":
-        sections += [
-            "## Deployment", "",
-            "```bash", "docker build -t " + package_name + " .",
-            "docker run -p 8000:8000 " + package_name, "```", "",
-        ]
-
-    sections += [
-        "## Development", "",
-        "```bash",
-        f"git clone https://github.com/YOUR_USERNAME/{package_name}.git",
-        f"cd {package_name}",
-        "uv venv .venv && source .venv/bin/activate",
-        'uv pip install -e ".[dev]"',
-        "pytest -v",
-        "```",
-        "",
-    ]
-
-    return "\n".join(sections)
-
-
-def _to_class_name(snake_name: str) -> str:
-    """Convert snake_case to PascalCase."""
-    return "".join(word.capitalize() for word in snake_name.split("_"))
+def render_limits_import(package_name: str) -> str:
+    """Render the server.py import of limits.py, for remote projects and tools with limits."""
+    return f"from {_to_module_name(package_name)} import limits"
 
 
-def render_dockerfile(package_name: str) -> str:
-    """Render a Dockerfile for remote hosting."""
-    return f"""\
-FROM python:3.11-slim
+def render_add_tool_registration(
+    tool: dict | ToolSpec,
+    *,
+    gated: bool = False,
+    lazy: bool = False,
+    schemas: bool = False,
+    structured: bool = False,
+) -> str:
+    """Render the @mcp.tool decorated function for a new tool."""
+    return render_tool_registration(tool, gated=gated, lazy=lazy, schemas=schemas, structured=structured)
 
-WORKDIR /app
 
-COPY . .
+def render_bench_startup(package_name: str) -> str:
+    """Render benchmarks/bench_startup.py for projects with precomputed schemas."""
+    return render_template("bench_startup.py.tmpl", module_name=_to_module_name(package_name))
 
-RUN pip install --no-cache-dir .
 
-ENV PORT=8000
+def render_bench_output(package_name: str) -> str:
+    """Render benchmarks/bench_output.py for projects with structured output."""
+    return render_template("bench_output.py.tmpl", module_name=_to_module_name(package_name))
 
-EXPOSE ${{PORT}}
 
-CMD ["{package_name}"]
-"""
+def render_bench_tools(package_name: str) -> str:
+    """Render benchmarks/bench_tools.py, the per-tool latency benchmark with a regression baseline."""
+    return render_template("bench_tools.py.tmpl", module_name=_to_module_name(package_name))
 
 
-def render_add_tool_import(package_name: str, tool_name: str) -> str:
-    """Render the import line for a new tool to inject into server.py."""
-    module_name = _to_module_name(package_name)
-    return f"from {module_name}.tools.{tool_name} import {tool_name} as _{tool_name}_impl"
+def render_bench_metrics(package_name: str) -> str:
+    """Render benchmarks/bench_metrics.py, which measures the metrics wrapper's cost per call."""
+    return render_template("bench_metrics.py.tmpl", module_name=_to_module_name(package_name))
 
 
-def render_add_tool_registration(tool: dict) -> str:
-    """Render the @mcp.tool decorated function for a new tool."""
-    tool_name = tool["name"]
-    tool_desc = tool.get("description", f"{tool_name} tool")
-    params = tool.get("parameters", [])
-
-    param_parts = []
-    for p in params:
-        pname = p["name"]
-        ptype = _python_type(p.get("type", "string"))
-        if p.get("required", True):
-            param_parts.append(f"{pname}: {ptype}")
-        else:
-            default = p.get("default")
-            if default is None:
-                default_str = "None"
-                ptype = f"{ptype} | None"
-            elif isinstance(default, str):
-                default_str = f'"{default}"'
-            else:
-                default_str = str(default)
-            param_parts.append(f"{pname}: {ptype} = {default_str}")
-
-    param_str = ", ".join(param_parts)
-    call_args = ", ".join(p["name"] for p in params)
-
-    lines = [
-        "",
-        f'@mcp.tool(description="{tool_desc}")',
-        f"def {tool_name}({param_str}) -> str:",
-        f'    """Call the {tool_name} tool."""',
-        f"    return _{tool_name}_impl({call_args})",
-    ]
-
-    return "\n".join(lines)
+def render_bench_http(package_name: str, tools: list[dict | ToolSpec]) -> str:
+    """Render benchmarks/bench_http.py, the HTTP load test for remote projects."""
+    specs = compile_tools(tools)
+    return render_template(
+        "bench_http.py.tmpl",
+        module_name=_to_module_name(package_name),
+        tool_name=specs[0].name if specs else "TOOL",
+    )
+
+
+def render_test_http(package_name: str, tools: list[dict | ToolSpec]) -> str:
+    """Render tests/test_http.py, covering the streamable-HTTP app of remote projects."""
+    tool_names = [t.name if isinstance(t, ToolSpec) else t["name"] for t in tools]
+    return render_template(
+        "test_http.py.tmpl",
+        module_name=_to_module_name(package_name),
+        expected_set="{" + ", ".join(f'"{n}"' for n in tool_names) + "}" if tool_names else "set()",
+    )
@@ -1,14 +1,119 @@
-"""Write generated files to disk."""
+"""Write generated files to disk — or to an in-memory overlay for dry runs."""
 
 from __future__ import annotations
 
+import difflib
 from pathlib import Path
+from typing import Iterable
 
+# A file's content: a whole string, or an iterable of string pieces.
+Content = str | Iterable[str]
 
-def write_project_files(base_dir: str | Path, files: dict[str, str]) -> list[str]:
+
+class VirtualFS:
+    """In-memory overlay of a project directory.
+
+    Reads fall through to the real files under base_dir; writes and deletes
+    only touch the overlay. Nothing is ever written to disk, so a whole
+    codegen run can be previewed as a unified diff, or run end to end
+    against a directory that doesn't exist.
+    """
+
+    def __init__(self, base_dir: str | Path):
+        self.base = Path(base_dir).resolve()
+        self.files: dict[str, str] = {}
+        self.deleted: set[str] = set()
+
+    def _key(self, path: str | Path) -> str:
+        full = Path(path)
+        if not full.is_absolute():
+            full = self.base / full
+        try:
+            return full.resolve().relative_to(self.base).as_posix()
+        except ValueError:
+            return full.resolve().as_posix()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.base / key
+
+    def _read_disk(self, key: str) -> str | None:
+        path = self._disk_path(key)
+        if path.is_file():
+            return path.read_text(encoding="utf-8")
+        return None
+
+    def exists(self, path: str | Path) -> bool:
+        key = self._key(path)
+        if key in self.files:
+            return True
+        if key in self.deleted:
+            return False
+        return self._disk_path(key).is_file()
+
+    def read_text(self, path: str | Path) -> str:
+        key = self._key(path)
+        if key in self.files:
+            return self.files[key]
+        content = None if key in self.deleted else self._read_disk(key)
+        if content is None:
+            raise FileNotFoundError(str(self._disk_path(key)))
+        return content
+
+    def write_text(self, path: str | Path, content: str) -> None:
+        key = self._key(path)
+        self.deleted.discard(key)
+        self.files[key] = content
+
+    def unlink(self, path: str | Path) -> None:
+        key = self._key(path)
+        if not self.exists(key):
+            raise FileNotFoundError(str(self._disk_path(key)))
+        self.files.pop(key, None)
+        self.deleted.add(key)
+
+    def changes(self) -> dict[str, list[str]]:
+        """Summarize the overlay against disk as created/modified/deleted paths."""
+        created, modified = [], []
+        for key in sorted(self.files):
+            on_disk = self._read_disk(key)
+            if on_disk is None:
+                created.append(key)
+            elif on_disk != self.files[key]:
+                modified.append(key)
+        deleted = sorted(k for k in self.deleted if self._read_disk(k) is not None)
+        return {"created": created, "modified": modified, "deleted": deleted}
+
+    def diff(self) -> str:
+        """Return a git-style unified diff of the overlay against disk."""
+        chunks = []
+        for key in sorted(set(self.files) | self.deleted):
+            before = self._read_disk(key)
+            after = None if key in self.deleted else self.files[key]
+            if before == after:
+                continue
+            lines = difflib.unified_diff(
+                (before or "").splitlines(keepends=True),
+                (after or "").splitlines(keepends=True),
+                fromfile=f"a/{key}" if before is not None else "/dev/null",
+                tofile=f"b/{key}" if after is not None else "/dev/null",
+            )
+            for line in lines:
+                if not line.endswith("\n"):
+                    line += "\n\\ No newline at end of file\n"
+                chunks.append(line)
+        return "".join(chunks)
+
+
+def write_project_files(
+    base_dir: str | Path,
+    files: dict[str, str],
+    *,
+    fs: VirtualFS | None = None,
+) -> list[str]:
     """Write a dict of {relative_path: content} to base_dir.
 
-    Creates parent directories as needed.
+    Creates parent directories as needed. If fs is given, files are written
+    to that in-memory overlay instead of disk.
 
     Returns:
         List of absolute paths written.
@@ -17,23 +122,90 @@ def write_project_files(base_dir: str | Path, files: dict[str, str]) -> list[str
     written = []
     for rel_path, content in files.items():
         full_path = base / rel_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content, encoding="utf-8")
+        if fs is not None:
+            fs.write_text(full_path, content)
+        else:
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(content, encoding="utf-8")
         written.append(str(full_path))
     return written
 
 
+def write_file_stream(
+    base_dir: str | Path,
+    files: Iterable[tuple[str, Content]],
+    *,
+    fs: VirtualFS | None = None,
+) -> int:
+    """Write (relative_path, content) pairs under base_dir as they arrive.
+
+    Content may be a string or an iterable of string pieces, which is written
+    piece by piece, so neither the file set nor any one file has to be held
+    in memory. If fs is given, files are written to that overlay instead.
+
+    Returns:
+        Number of files written.
+    """
+    base = Path(base_dir)
+    count = 0
+    for rel_path, content in files:
+        full_path = base / rel_path
+        if fs is not None:
+            fs.write_text(full_path, content if isinstance(content, str) else "".join(content))
+        else:
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            with full_path.open("w", encoding="utf-8") as f:
+                if isinstance(content, str):
+                    f.write(content)
+                else:
+                    f.writelines(content)
+        count += 1
+    return count
+
+
 def inject_after_sentinel(
-    file_path: str | Path, sentinel: str, content: str
+    file_path: str | Path,
+    sentinel: str,
+    content: str,
+    *,
+    fs: VirtualFS | None = None,
 ) -> bool:
     """Insert content after a sentinel comment line in a file.
 
     Returns True if injection succeeded, False if sentinel not found.
     """
     path = Path(file_path)
-    text = path.read_text(encoding="utf-8")
+    text = fs.read_text(path) if fs is not None else path.read_text(encoding="utf-8")
     if sentinel not in text:
         return False
     text = text.replace(sentinel, sentinel + "\n" + content, 1)
-    path.write_text(text, encoding="utf-8")
+    if fs is not None:
+        fs.write_text(path, text)
+    else:
+        path.write_text(text, encoding="utf-8")
     return True
+
+
+def remove_project_files(
+    base_dir: str | Path,
+    rel_paths: list[str],
+    *,
+    fs: VirtualFS | None = None,
+) -> list[str]:
+    """Delete files under base_dir. Paths that don't exist are skipped.
+
+    Returns:
+        List of absolute paths removed.
+    """
+    base = Path(base_dir)
+    removed = []
+    for rel_path in rel_paths:
+        full_path = base / rel_path
+        if fs is not None:
+            if fs.exists(full_path):
+                fs.unlink(full_path)
+                removed.append(str(full_path))
+        elif full_path.is_file():
+            full_path.unlink()
+            removed.append(str(full_path))
+    return removed
@@ -0,0 +1,79 @@
+"""Project manifest — records what codegen produced for a scaffolded project.
+
+The manifest lives at the project root and lets later runs (add_tool,
+sync_project) know the current tool set without re-parsing generated code,
+and tell generated service stubs apart from ones the user has edited.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterator
+
+MANIFEST_FILE = ".mcp-creator.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(content: str) -> str:
+    """Return the hash recorded for a generated file's content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def build_manifest(
+    package_name: str,
+    tools: list[dict],
+    service_hashes: dict[str, str],
+    *,
+    paid: bool = False,
+    paid_tools: list[str] | None = None,
+    hosting: str = "local",
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: dict | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
+) -> dict:
+    """Build the manifest dict for a project."""
+    return {
+        "version": MANIFEST_VERSION,
+        "package_name": package_name,
+        "paid": paid,
+        "paid_tools": paid_tools,
+        "hosting": hosting,
+        "lazy_imports": lazy_imports,
+        "precomputed_schemas": precomputed_schemas,
+        "async_tools": async_tools,
+        "api": api,
+        "structured_output": structured_output,
+        "metrics": metrics,
+        "tools": tools,
+        "service_hashes": service_hashes,
+    }
+
+
+def render_manifest(manifest: dict) -> str:
+    """Serialize a manifest to the text written to disk."""
+    return json.dumps(manifest, indent=2) + "\n"
+
+
+def iter_manifest(manifest: dict) -> Iterator[str]:
+    """Serialize a manifest piece by piece; joins to exactly render_manifest's text."""
+    yield from json.JSONEncoder(indent=2).iterencode(manifest)
+    yield "\n"
+
+
+def load_manifest(project_dir: str | Path) -> dict | None:
+    """Load the manifest from a project root. Returns None if absent or unreadable."""
+    path = Path(project_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
@@ -0,0 +1,580 @@
+"""Turn an OpenAPI 3 document into scaffold_server tool definitions.
+
+Specs can run to tens of megabytes, so the document is never decoded whole.
+The JSON text is walked with a small scanner: parts that aren't needed are
+skipped without building objects, and each path item is decoded on its own
+and reduced to what tool generation needs before the next one is read.
+Components are only located up front; each is decoded and summarized the
+first time an operation refers to it, so unreferenced ones never are.
+
+Every operation becomes one tool. Path, query and header parameters and
+the fields of a JSON request body become tool parameters, and the tool
+def gets an "http" block (see tool_spec.HttpSpec) so codegen renders a
+service that calls the API.
+"""
+
+from __future__ import annotations
+
+import json
+import keyword
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+from mcp_creator.services.reserved_names import reserved_names
+
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+_SCALAR_RE = re.compile(r"[^,\]}\s]+")
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_IDENT_RE = re.compile(r"[^0-9a-zA-Z]+")
+_SPACE_RE = re.compile(r"\s+")
+_SERVER_VAR_RE = re.compile(r"\{([^{}]+)\}")
+
+_DECODER = json.JSONDecoder()
+
+HTTP_OPERATIONS = ("get", "put", "post", "delete", "options", "head", "patch")
+PARAM_LOCATIONS = ("path", "query", "header")
+
+# OpenAPI schema type -> scaffold tool parameter type.
+_TYPES = {
+    "string": "string",
+    "integer": "integer",
+    "number": "number",
+    "boolean": "boolean",
+    "array": "array",
+    "object": "object",
+}
+_DEFAULT_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+}
+_TEXT_LIMIT = 200
+_MAX_REF_DEPTH = 16
+
+
+class OpenAPIError(ValueError):
+    """Raised when a document can't be read as an OpenAPI 3 JSON spec."""
+
+
+@dataclass
+class OpenAPITools:
+    """Tool definitions extracted from an OpenAPI document."""
+
+    title: str
+    description: str
+    base_url: str
+    tools: list[dict] = field(default_factory=list)
+    env_vars: list[dict] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    operations: int = 0
+
+
+# --- Scanner ---
+
+
+def _ws(text: str, pos: int) -> int:
+    return _WS_RE.match(text, pos).end()
+
+
+def _skip_value(text: str, pos: int) -> int:
+    """Return the index just past the JSON value starting at pos, without decoding it."""
+    ch = text[pos:pos + 1]
+    if ch == '"':
+        match = _STRING_RE.match(text, pos)
+        if match is None:
+            raise OpenAPIError(f"Unterminated string at offset {pos}.")
+        return match.end()
+    if ch in ("{", "["):
+        depth = 0
+        for match in _TOKEN_RE.finditer(text, pos):
+            token = match.group()
+            if token[0] == '"':
+                continue
+            depth += 1 if token in "{[" else -1
+            if depth == 0:
+                return match.end()
+        raise OpenAPIError(f"Unterminated {ch} at offset {pos}.")
+    match = _SCALAR_RE.match(text, pos)
+    if match is None:
+        raise OpenAPIError(f"Expected a JSON value at offset {pos}.")
+    return match.end()
+
+
+def _iter_members(
+    text: str,
+    pos: int,
+    decode: Callable[[str], bool] = lambda key: True,
+) -> Iterator[tuple[str, object, int]]:
+    """Yield (key, value, value_start) for each member of the JSON object at pos.
+
+    Values whose key passes decode() are decoded; the rest are skipped and
+    yielded as None.
+    """
+    pos = _ws(text, pos)
+    if text[pos:pos + 1] != "{":
+        raise OpenAPIError(f"Expected a JSON object at offset {pos}.")
+    pos = _ws(text, pos + 1)
+    if text[pos:pos + 1] == "}":
+        return
+    while True:
+        match = _STRING_RE.match(text, pos)
+        if match is None:
+            raise OpenAPIError(f"Expected a member name at offset {pos}.")
+        key = json.loads(match.group())
+        pos = _ws(text, match.end())
+        if text[pos:pos + 1] != ":":
+            raise OpenAPIError(f"Expected ':' at offset {pos}.")
+        start = _ws(text, pos + 1)
+        if decode(key):
+            try:
+                value, end = _DECODER.raw_decode(text, start)
+            except json.JSONDecodeError as e:
+                raise OpenAPIError(f"Invalid JSON: {e}") from None
+        else:
+            value, end = None, _skip_value(text, start)
+        yield key, value, start
+        pos = _ws(text, end)
+        sep = text[pos:pos + 1]
+        if sep == ",":
+            pos = _ws(text, pos + 1)
+        elif sep == "}":
+            return
+        else:
+            raise OpenAPIError(f"Expected ',' or '}}' at offset {pos}.")
+
+
+# --- Names and text ---
+
+
+def _snake(text: str) -> str:
+    name = _NON_IDENT_RE.sub("_", _CAMEL_RE.sub("_", text)).strip("_").lower()
+    if not name:
+        return "op"
+    if name[0].isdigit():
+        name = f"n{name}"
+    if keyword.iskeyword(name):
+        name += "_"
+    return name
+
+
+def _unique(name: str, taken: set[str]) -> str:
+    candidate, n = name, 2
+    while candidate in taken:
+        candidate = f"{name}_{n}"
+        n += 1
+    taken.add(candidate)
+    return candidate
+
+
+def _clean_text(text: object) -> str:
+    """Collapse a spec description into one line that is safe to put in generated code."""
+    if not isinstance(text, str):
+        return ""
+    line = _SPACE_RE.sub(" ", text.replace('"', "'").replace("\\", "")).strip()
+    if len(line) > _TEXT_LIMIT:
+        line = line[:_TEXT_LIMIT - 3].rstrip() + "..."
+    return line
+
+
+# --- Schemas and refs ---
+
+
+def _ref_name(ref: object, section: str) -> str | None:
+    prefix = f"#/components/{section}/"
+    if isinstance(ref, str) and ref.startswith(prefix):
+        return ref[len(prefix):].replace("~1", "/").replace("~0", "~")
+    return None
+
+
+def _schema_type(schema: object) -> str | None:
+    if not isinstance(schema, dict):
+        return None
+    kind = schema.get("type")
+    if isinstance(kind, list):  # OpenAPI 3.1: ["string", "null"]
+        kind = next((k for k in kind if k != "null"), None)
+    if kind is None and "properties" in schema:
+        kind = "object"
+    return kind if kind in _TYPES else None
+
+
+def _summarize_schema(schema: object) -> dict:
+    """Reduce a schema to the little tool generation uses: type, default, top-level fields."""
+    if not isinstance(schema, dict):
+        return {}
+    ref = _ref_name(schema.get("$ref"), "schemas")
+    if ref is not None:
+        return {"ref": ref}
+    all_of = schema.get("allOf")
+    if isinstance(all_of, list):
+        return {"all_of": [_summarize_schema(s) for s in all_of]}
+    summary: dict = {"type": _schema_type(schema)}
+    if "default" in schema:
+        summary["default"] = schema["default"]
+    props = schema.get("properties")
+    if isinstance(props, dict):
+        summary["props"] = {
+            name: {"type": _schema_type(p), "ref": _ref_name(p.get("$ref"), "schemas")}
+            if isinstance(p, dict) else {"type": None}
+            for name, p in props.items()
+        }
+        required = schema.get("required")
+        summary["required"] = [r for r in required if isinstance(r, str)] if isinstance(required, list) else []
+    return summary
+
+
+class _LazySection:
+    """One components section, each entry decoded and summarized when first looked up.
+
+    The section is scanned once for where its entries start; an entry no
+    operation refers to is never decoded.
+    """
+
+    def __init__(self, text: str, summarize: Callable[[object], dict | None]) -> None:
+        self._text = text
+        self._summarize = summarize
+        self.offsets: dict[str, int] = {}
+        self._summaries: dict[str, dict | None] = {}
+
+    def get(self, name: str, default: dict | None = None) -> dict | None:
+        if name not in self._summaries:
+            start = self.offsets.get(name)
+            if start is None:
+                return default
+            try:
+                item, _ = _DECODER.raw_decode(self._text, start)
+            except json.JSONDecodeError as e:
+                raise OpenAPIError(f"Invalid JSON: {e}") from None
+            self._summaries[name] = self._summarize(item)
+        summary = self._summaries[name]
+        return default if summary is None else summary
+
+
+class _Components:
+    """Summarized components, resolved on demand."""
+
+    def __init__(self, text: str = "") -> None:
+        self.schemas = _LazySection(text, _summarize_schema)
+        self.parameters = _LazySection(text, _summarize_parameter)
+        self.request_bodies = _LazySection(text, _summarize_request_body)
+        self.security: dict[str, dict] = {}
+        self.sections = {
+            "schemas": self.schemas, "parameters": self.parameters, "requestBodies": self.request_bodies,
+        }
+
+    def schema(self, summary: dict, depth: int = 0) -> dict:
+        """Follow refs and merge allOf until a plain summary is left."""
+        if depth > _MAX_REF_DEPTH:
+            return {}
+        if "ref" in summary:
+            return self.schema(self.schemas.get(summary["ref"], {}), depth + 1)
+        if "all_of" in summary:
+            merged: dict = {"type": None, "props": {}, "required": []}
+            for part in summary["all_of"]:
+                resolved = self.schema(part, depth + 1)
+                merged["type"] = merged["type"] or resolved.get("type")
+                merged["props"].update(resolved.get("props", {}))
+                merged["required"] += resolved.get("required", [])
+            if merged["props"]:
+                merged["type"] = "object"
+            return merged
+        return summary
+
+    def prop_type(self, prop: dict) -> str:
+        if prop.get("ref"):
+            return self.schema({"ref": prop["ref"]}).get("type") or "object"
+        return prop.get("type") or "string"
+
+
+def _summarize_parameter(param: object) -> dict | None:
+    if not isinstance(param, dict):
+        return None
+    ref = _ref_name(param.get("$ref"), "parameters")
+    if ref is not None:
+        return {"ref": ref}
+    return {
+        "name": param.get("name"),
+        "in": param.get("in"),
+        "required": bool(param.get("required")) or param.get("in") == "path",
+        "description": _clean_text(param.get("description")),
+        "schema": _summarize_schema(param.get("schema")),
+    }
+
+
+def _summarize_request_body(body: object) -> dict | None:
+    if not isinstance(body, dict):
+        return None
+    ref = _ref_name(body.get("$ref"), "requestBodies")
+    if ref is not None:
+        return {"ref": ref}
+    content = body.get("content") or {}
+    media = next(
+        (m for m in content if m == "application/json" or m.endswith("+json")),
+        None,
+    )
+    return {
+        "required": bool(body.get("required")),
+        "json": media is not None,
+        "schema": _summarize_schema(content[media].get("schema")) if media else {},
+    }
+
+
+# --- Operations ---
+
+
+def _default_for(ptype: str, default: object) -> object:
+    accepted = _DEFAULT_TYPES.get(ptype)
+    if accepted is None or default is None:
+        return None
+    if isinstance(default, bool) and bool not in accepted:
+        return None
+    if not isinstance(default, accepted):
+        return None
+    if isinstance(default, str) and _clean_text(default) != default:
+        return None
+    return default
+
+
+def _param_def(name: str, ptype: str, required: bool, description: str, default: object) -> dict:
+    param = {"name": name, "type": ptype, "required": required}
+    if description:
+        param["description"] = description
+    if not required:
+        default = _default_for(ptype, default)
+        if default is not None:
+            param["default"] = default
+    return param
+
+
+def _operation_tool(
+    method: str,
+    path: str,
+    op: dict,
+    shared: list,
+    components: _Components,
+    *,
+    base_url: str,
+    auth: dict | None,
+    tool_names: set[str],
+) -> tuple[dict | None, str | None]:
+    """Build one tool def for an operation. Returns (tool, None) or (None, reason skipped)."""
+    label = f"{method.upper()} {path}"
+
+    # Operation-level parameters override path-level ones with the same name and location
+    merged: dict[tuple, dict] = {}
+    for raw in list(shared) + list(op.get("parameters") or []):
+        param = _summarize_parameter(raw)
+        for _ in range(_MAX_REF_DEPTH):
+            if param is None or "ref" not in param:
+                break
+            param = components.parameters.get(param["ref"])
+        if param is None or not isinstance(param.get("name"), str):
+            continue
+        merged[(param["name"], param["in"])] = param
+
+    params: list[dict] = []
+    bindings: dict[str, dict] = {}
+    # Never a name the generated tool or service module already binds
+    taken: set[str] = {*reserved_names().params, *reserved_names().http_params}
+    for (wire, location), param in merged.items():
+        if location not in PARAM_LOCATIONS:
+            continue
+        if location == "header" and auth and wire.lower() == auth["header"].lower():
+            continue
+        schema = components.schema(param["schema"])
+        ptype = _TYPES.get(schema.get("type") or "string", "string")
+        name = _unique(_snake(wire), taken)
+        params.append(_param_def(name, ptype, param["required"], param["description"], schema.get("default")))
+        bindings[name] = {"in": location, "name": wire}
+
+    body_mode = None
+    request_body = _summarize_request_body(op.get("requestBody"))
+    for _ in range(_MAX_REF_DEPTH):
+        if request_body is None or "ref" not in request_body:
+            break
+        request_body = components.request_bodies.get(request_body["ref"])
+    if request_body is not None:
+        if not request_body["json"]:
+            return None, f"{label}: only JSON request bodies are supported."
+        schema = components.schema(request_body["schema"])
+        props = schema.get("props")
+        if schema.get("type") == "object" and props:
+            body_mode = "fields"
+            required = set(schema.get("required", [])) if request_body["required"] else set()
+            for wire, prop in props.items():
+                name = _unique(_snake(wire), taken)
+                params.append(_param_def(name, _TYPES[components.prop_type(prop)], wire in required, "", None))
+                bindings[name] = {"in": "body", "name": wire}
+        else:
+            name = _unique("body", taken)
+            btype = "array" if schema.get("type") == "array" else "object"
+            params.append(_param_def(name, btype, request_body["required"], "Request body", None))
+            bindings[name] = {"in": "body", "name": name}
+            body_mode = name
+
+    # Python signatures need required parameters first
+    params.sort(key=lambda p: not p["required"])
+
+    op_id = op.get("operationId")
+    if isinstance(op_id, str) and op_id.strip():
+        base = _snake(op_id)
+    else:
+        segments = [
+            f"by_{s[1:-1]}" if s.startswith("{") and s.endswith("}") else s
+            for s in path.strip("/").split("/") if s
+        ]
+        base = _snake("_".join([method] + segments))
+    if base in reserved_names().tools:
+        base = f"{base}_op"
+    name = _unique(base, tool_names)
+
+    responses = op.get("responses") or {}
+    ok = next((responses[c] for c in ("200", "201", "202", "2XX", "default") if c in responses), {})
+
+    http: dict = {"method": method.upper(), "path": path, "base_url": base_url, "params": bindings}
+    if body_mode is not None:
+        http["body"] = body_mode
+    if auth is not None:
+        http["auth"] = auth
+
+    tool = {
+        "name": name,
+        "description": _clean_text(op.get("summary") or op.get("description")) or label,
+        "parameters": params,
+        "returns": _clean_text(ok.get("description") if isinstance(ok, dict) else None)
+        or "API response as JSON",
+        "http": http,
+    }
+    return tool, None
+
+
+# --- Document ---
+
+
+def _base_url(servers: object) -> str:
+    if not isinstance(servers, list) or not servers or not isinstance(servers[0], dict):
+        return "http://localhost"
+    server = servers[0]
+    url = server.get("url") or ""
+    variables = server.get("variables") or {}
+
+    def _var(match: re.Match) -> str:
+        var = variables.get(match.group(1))
+        return str(var.get("default", "")) if isinstance(var, dict) else ""
+
+    url = _SERVER_VAR_RE.sub(_var, url)
+    if not url.startswith(("http://", "https://")):
+        url = "http://localhost" + ("/" + url.lstrip("/") if url.strip("/") else "")
+    return url.rstrip("/")
+
+
+def _auth(schemes: dict[str, dict], security: object) -> tuple[dict | None, dict | None]:
+    """Pick the auth scheme to generate: (http auth block, env var def)."""
+    names = []
+    if isinstance(security, list):
+        names = [n for req in security if isinstance(req, dict) for n in req]
+    names += list(schemes)
+    for name in names:
+        scheme = schemes.get(name)
+        if not isinstance(scheme, dict):
+            continue
+        kind = scheme.get("type")
+        if kind == "apiKey" and scheme.get("in") == "header" and isinstance(scheme.get("name"), str):
+            return (
+                {"header": scheme["name"], "prefix": "", "env": "API_KEY"},
+                {"name": "API_KEY", "description": f"API key sent in the {scheme['name']} header", "required": True},
+            )
+        if (kind == "http" and str(scheme.get("scheme", "")).lower() == "bearer") or kind in ("oauth2", "openIdConnect"):
+            return (
+                {"header": "Authorization", "prefix": "Bearer ", "env": "API_TOKEN"},
+                {"name": "API_TOKEN", "description": "Bearer token for the API", "required": True},
+            )
+    return None, None
+
+
+def load_openapi_tools(spec_path: str | Path, *, include_deprecated: bool = False) -> OpenAPITools:
+    """Read an OpenAPI 3 JSON document and build one tool def per operation.
+
+    Raises:
+        OpenAPIError: if the file isn't an OpenAPI 3 JSON document.
+    """
+    text = Path(spec_path).read_text(encoding="utf-8-sig")
+    if not text.lstrip().startswith("{"):
+        raise OpenAPIError("Only JSON OpenAPI documents are supported; convert YAML specs to JSON first.")
+
+    # Pass 1: small top-level members, and where paths and components start
+    head: dict = {}
+    paths_at = components_at = None
+    small = {"openapi", "swagger", "info", "servers", "security"}
+    for key, value, start in _iter_members(text, 0, decode=small.__contains__):
+        if key in small:
+            head[key] = value
+        elif key == "paths":
+            paths_at = start
+        elif key == "components":
+            components_at = start
+
+    version = head.get("openapi")
+    if not isinstance(version, str) or not version.startswith("3."):
+        found = f"Swagger {head['swagger']}" if "swagger" in head else "no 'openapi' version"
+        raise OpenAPIError(f"Expected an OpenAPI 3 document, found {found}.")
+
+    # Components: security schemes are decoded now, for the auth block;
+    # everything else only when an operation refers to it
+    components = _Components(text)
+    if components_at is not None:
+        for section, _, start in _iter_members(text, components_at, decode=lambda key: False):
+            if section == "securitySchemes":
+                for name, item, _ in _iter_members(text, start):
+                    if isinstance(item, dict):
+                        components.security[name] = item
+            elif section in components.sections:
+                offsets = components.sections[section].offsets
+                for name, _, item_start in _iter_members(text, start, decode=lambda key: False):
+                    offsets[name] = item_start
+
+    info = head.get("info") if isinstance(head.get("info"), dict) else {}
+    base_url = _base_url(head.get("servers"))
+    auth, auth_env = _auth(components.security, head.get("security"))
+    result = OpenAPITools(
+        title=str(info.get("title") or "API"),
+        description=_clean_text(info.get("description") or info.get("title")),
+        base_url=base_url,
+    )
+    result.env_vars.append({
+        "name": "API_BASE_URL",
+        "description": f"Base URL of the API, defaults to {base_url}",
+        "required": False,
+    })
+    if auth_env is not None:
+        result.env_vars.append(auth_env)
+
+    # Pass 2: one path item at a time
+    if paths_at is None:
+        return result
+    tool_names: set[str] = set()
+    for path, item, _ in _iter_members(text, paths_at):
+        if not isinstance(item, dict):
+            continue
+        shared = item.get("parameters") or []
+        for method in HTTP_OPERATIONS:
+            op = item.get(method)
+            if not isinstance(op, dict):
+                continue
+            result.operations += 1
+            if op.get("deprecated") and not include_deprecated:
+                result.skipped.append(f"{method.upper()} {path}: deprecated.")
+                continue
+            tool, reason = _operation_tool(
+                method, path, op, shared, components,
+                base_url=base_url, auth=auth, tool_names=tool_names,
+            )
+            if tool is None:
+                result.skipped.append(reason)
+            else:
+                result.tools.append(tool)
+    return result
@@ -0,0 +1,166 @@
+"""Names generated code already uses, which tools and parameters can't take.
+
+They are read off the templates rather than listed by hand: a probe tool
+is rendered with every feature on, and the generated modules are parsed
+for the names they bind and read. A tool's name becomes a module-level
+name in server.py, its tool module and its test, so it must not be one
+those modules define or a builtin they call. A parameter becomes a local
+of the tool function in server.py and the tool module and of the
+service's execute(), so it must not be a name those functions bind or
+read, or one their modules define.
+
+Rendering and parsing takes a moment, so it happens once, on first use.
+"""
+
+from __future__ import annotations
+
+import ast
+import builtins
+from dataclasses import dataclass
+from functools import lru_cache
+
+from mcp_creator.services import codegen
+from mcp_creator.services.tool_spec import compile_api
+
+# Every name the probe itself puts in generated code contains this; no template name does.
+_PROBE = "zz"
+_PROBE_PACKAGE = "zz-mcp"
+_PROBE_API = {"base_url": "http://localhost", "auth_env": "ZZ_TOKEN"}
+_BUILTINS = frozenset(dir(builtins))
+
+
+@dataclass(frozen=True)
+class ReservedNames:
+    """Names no tool, or no parameter of a tool with a given feature, may take."""
+
+    tools: frozenset[str]
+    params: frozenset[str]
+    cached_params: frozenset[str]
+    paginated_params: frozenset[str]
+    http_params: frozenset[str]
+
+
+def _probe_tool(**extra) -> dict:
+    return {"name": _PROBE, "parameters": [{"name": f"{_PROBE}_arg", "type": "string"}], **extra}
+
+
+def _module_names(tree: ast.Module) -> set[str]:
+    """Names a module binds at module level."""
+    names: set[str] = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        else:
+            names.update(
+                n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)
+            )
+    return names
+
+
+def _function_names(fn: ast.FunctionDef | ast.AsyncFunctionDef) -> set[str]:
+    """Names a function binds or reads in its own scope, its arguments included."""
+    args = fn.args
+    names = {a.arg for a in (*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg) if a}
+    stack: list[ast.AST] = list(fn.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            stack.extend(node.decorator_list)
+            continue
+        if isinstance(node, ast.Lambda):
+            continue
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            # Only the first iterable is evaluated in the function's own scope
+            stack.append(node.generators[0].iter)
+            continue
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        stack.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def _tool_functions(tree: ast.Module) -> list[ast.FunctionDef | ast.AsyncFunctionDef]:
+    """The functions that take the probe's parameters."""
+    return [
+        node for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and any(_PROBE in a.arg for a in node.args.args)
+    ]
+
+
+def _tool_scope(tree: ast.Module) -> set[str]:
+    """Names a tool's name must avoid in one generated module."""
+    return _module_names(tree) | {
+        n.id for n in ast.walk(tree) if isinstance(n, ast.Name) and n.id in _BUILTINS
+    }
+
+
+def _param_scope(tree: ast.Module, *, module_level: bool = True) -> set[str]:
+    """Names a parameter must avoid in one generated module."""
+    names = _module_names(tree) if module_level else set()
+    for fn in _tool_functions(tree):
+        names |= _function_names(fn)
+    return names
+
+
+def _without_probe(names: set[str]) -> frozenset[str]:
+    return frozenset(name for name in names if _PROBE not in name.lower())
+
+
+@lru_cache(maxsize=None)
+def reserved_names() -> ReservedNames:
+    """Derive the reserved names from the templates; computed once per process."""
+    api = compile_api(_PROBE_API, [])
+    registered = _probe_tool(batch=True, limits={"concurrency": 2})
+    http = _probe_tool(
+        parameters=[{"name": f"{_PROBE}_{where}", "type": "string"} for where in ("path", "query", "head", "body")],
+        http={
+            "method": "POST", "path": f"/{{{_PROBE}_path}}", "body": "fields",
+            "params": {f"{_PROBE}_{where}": {"in": where} for where in ("path", "query")}
+            | {f"{_PROBE}_head": {"in": "header"}, f"{_PROBE}_body": {"in": "body"}},
+            "auth": {"header": "Authorization", "prefix": "Bearer ", "env": "ZZ_TOKEN"},
+        },
+    )
+    variants = {
+        "plain": _probe_tool(batch=True),
+        "cached": _probe_tool(cache={"ttl": 60, "persist": True}),
+        "paginated": _probe_tool(paginated=True),
+        "http": http,
+    }
+
+    tools: set[str] = set()
+    params: set[str] = set()
+    for hosting in ("local", "remote"):
+        for lazy_imports in (False, True):
+            server = ast.parse(codegen.render_server(
+                _PROBE_PACKAGE, [registered], paid=True, hosting=hosting, lazy_imports=lazy_imports,
+                precomputed_schemas=True, structured_output=True, metrics=True, api=api,
+            ))
+            tools |= _tool_scope(server)
+            params |= _param_scope(server, module_level=False)
+
+    feature_params: dict[str, set[str]] = {}
+    for feature, tool in variants.items():
+        names = feature_params[feature] = set()
+        for structured in (False, True):
+            module = ast.parse(codegen.render_tool_module(_PROBE_PACKAGE, tool, structured=structured))
+            test = ast.parse(codegen.render_test_tool(_PROBE_PACKAGE, tool, structured=structured))
+            tools |= _tool_scope(module) | _tool_scope(test)
+            names |= _param_scope(module)
+        for is_async in (False, True):
+            service = codegen.render_service_module(_PROBE_PACKAGE, {**tool, "async": is_async}, api=api)
+            names |= _param_scope(ast.parse(service))
+
+    params |= feature_params["plain"]
+    return ReservedNames(
+        tools=_without_probe(tools),
+        params=_without_probe(params),
+        cached_params=_without_probe(feature_params["cached"] - params),
+        paginated_params=_without_probe(feature_params["paginated"] - params),
+        http_params=_without_probe(feature_params["http"] - params),
+    )
@@ -0,0 +1,171 @@
+"""Fragment-level edits to a generated server.py.
+
+server.py keeps one import line per tool between the IMPORTS sentinels and
+one decorated block per tool (@mcp.tool, or @_schema_tool when schemas are
+precomputed) between the TOOLS sentinels. These helpers
+find, replace, and drop those per-tool fragments while leaving everything
+else in the file (including user edits) byte-for-byte untouched.
+
+All functions are pure — they take and return strings, no I/O.
+"""
+
+from __future__ import annotations
+
+import re
+
+IMPORTS_START = "# --- IMPORTS ---"
+IMPORTS_END = "# --- END IMPORTS ---"
+TOOLS_START = "# --- TOOLS ---"
+TOOLS_END = "# --- END TOOLS ---"
+
+_IMPORT_RE = re.compile(r"^from \S+\.tools\.(\w+) import \w+ as _\w+_impl\s*$")
+_DEF_RE = re.compile(r"^(?:async )?def (\w+)\(")
+_DECORATORS = ("@mcp.tool", "@_schema_tool")
+
+
+def _section(text: str, start: str, end: str) -> tuple[int, int] | None:
+    """Return (body_start, body_end) offsets of the lines between two sentinels."""
+    s = text.find(start + "\n")
+    if s == -1:
+        return None
+    body_start = s + len(start) + 1
+    e = text.find(end, body_start)
+    if e == -1:
+        return None
+    return body_start, e
+
+
+def _split_tool_blocks(body: str) -> tuple[list[str], list[tuple[str | None, list[str]]]]:
+    """Split the TOOLS section body into a preamble and per-tool blocks.
+
+    A block starts at an ``@mcp.tool`` (or ``@_schema_tool``) decorator, including the blank lines
+    right before it, and runs up to the next block. Blocks are keyed by the
+    first function they define.
+    """
+    lines = body.split("\n")
+    starts = []
+    for i, line in enumerate(lines):
+        if line.startswith(_DECORATORS):
+            j = i
+            while j > 0 and lines[j - 1] == "" and (not starts or j - 1 > starts[-1]):
+                j -= 1
+            starts.append(j)
+
+    if not starts:
+        return lines, []
+
+    preamble = lines[: starts[0]]
+    blocks = []
+    for n, start in enumerate(starts):
+        stop = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        block = lines[start:stop]
+        name = None
+        for line in block:
+            match = _DEF_RE.match(line)
+            if match:
+                name = match.group(1)
+                break
+        blocks.append((name, block))
+    return preamble, blocks
+
+
+def list_tools(server_text: str) -> list[str]:
+    """Return the tool names registered in server.py, in file order."""
+    span = _section(server_text, TOOLS_START, TOOLS_END)
+    if span is None:
+        return []
+    _, blocks = _split_tool_blocks(server_text[span[0]:span[1]])
+    return [name for name, _ in blocks if name]
+
+
+def gated_tools(server_text: str) -> set[str]:
+    """Return the names of tools whose registration calls _require_license."""
+    span = _section(server_text, TOOLS_START, TOOLS_END)
+    if span is None:
+        return set()
+    _, blocks = _split_tool_blocks(server_text[span[0]:span[1]])
+    return {
+        name
+        for name, block in blocks
+        if name and any("_require_license(" in line for line in block)
+    }
+
+
+def patch_server(
+    server_text: str,
+    *,
+    imports: dict[str, str] | None = None,
+    registrations: dict[str, str] | None = None,
+    removed: set[str] | frozenset[str] = frozenset(),
+    dropped_imports: set[str] | frozenset[str] = frozenset(),
+) -> str | None:
+    """Upsert and drop per-tool fragments in server.py.
+
+    Args:
+        server_text: Current server.py content.
+        imports: {tool_name: import_line} to add or replace.
+        registrations: {tool_name: registration_block} to add or replace.
+            Blocks are in the form returned by codegen.render_tool_registration.
+        removed: Tool names whose import line and registration are dropped.
+        dropped_imports: Whole import lines to drop from the IMPORTS section,
+            such as a support module's once no tool needs it.
+
+    Returns:
+        The patched text, or None if the sentinel comments are missing.
+    """
+    imports = imports or {}
+    registrations = registrations or {}
+
+    imp_span = _section(server_text, IMPORTS_START, IMPORTS_END)
+    tools_span = _section(server_text, TOOLS_START, TOOLS_END)
+    if imp_span is None or tools_span is None or imp_span[1] > tools_span[0]:
+        return None
+
+    # IMPORTS section: one line per tool
+    imp_lines = server_text[imp_span[0]:imp_span[1]].split("\n")
+    trailer = imp_lines.pop()  # text between the last newline and the sentinel
+    pending = dict(imports)
+    new_imp = []
+    for line in imp_lines:
+        match = _IMPORT_RE.match(line)
+        name = match.group(1) if match else None
+        if name in removed or line in dropped_imports:
+            continue
+        if name in pending:
+            new_imp.append(pending.pop(name))
+        else:
+            new_imp.append(line)
+    new_imp.extend(pending.values())
+    new_imp.append(trailer)
+
+    # TOOLS section: one decorated block per tool
+    preamble, blocks = _split_tool_blocks(server_text[tools_span[0]:tools_span[1]])
+    trailing = []
+    if blocks:
+        last_name, last_block = blocks[-1]
+        # Keep whatever follows the last block's body (normally "") in place.
+        trailing = [last_block.pop()]
+    else:
+        trailing = [preamble.pop()] if preamble else [""]
+
+    pending = dict(registrations)
+    new_blocks = []
+    for name, block in blocks:
+        if name in removed:
+            continue
+        if name in pending:
+            new_blocks.extend(pending.pop(name).split("\n"))
+        else:
+            new_blocks.extend(block)
+    for registration in pending.values():
+        new_blocks.extend(registration.split("\n"))
+
+    new_tools = preamble + new_blocks + trailing
+
+    return (
+        server_text[:imp_span[0]]
+        + "\n".join(new_imp)
+        + server_text[imp_span[1]:tools_span[0]]
+        + "\n".join(new_tools)
+        + server_text[tools_span[1]:]
+    )
@@ -0,0 +1,203 @@
+"""A small precompiled template engine for codegen.
+
+Templates are plain text with two kinds of markup:
+
+* ``{{ expr }}`` — any Python expression, inserted with ``str()``.
+* ``{% for x in xs %}`` / ``{% endfor %}``, ``{% if cond %}`` /
+  ``{% elif cond %}`` / ``{% else %}`` / ``{% endif %}`` — control tags.
+  A control tag must sit alone on its line; that whole line, newline
+  included, is dropped from the output.
+
+Everything else is copied verbatim, including whether the template ends
+with a newline, so output whitespace is exactly what the template shows.
+
+Each template is compiled once into a Python function that appends to a
+single output buffer; compiled functions are cached by template source.
+A template can also be compiled in streaming form, as a generator that
+yields the output piece by piece, for files too large to build in memory.
+"""
+
+from __future__ import annotations
+
+import ast
+import builtins
+import re
+from functools import lru_cache
+from importlib import resources
+from typing import Callable, Iterator
+
+_TAG_LINE_RE = re.compile(r"^[ \t]*\{%\s*(.*?)\s*%\}[ \t]*$")
+_EXPR_RE = re.compile(r"\{\{\s*(.*?)\s*\}\}")
+
+TEMPLATE_PACKAGE = "mcp_creator.templates"
+
+
+class TemplateSyntaxError(ValueError):
+    """Raised when a template cannot be compiled."""
+
+
+def _missing(name: str):
+    raise NameError(f"template variable {name!r} was not provided")
+
+
+def _free_names(expr: str, bound: set[str], lineno: int) -> set[str]:
+    """Return names an expression reads that are not loop variables or builtins."""
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise TemplateSyntaxError(f"line {lineno}: invalid expression {expr!r}: {e.msg}") from None
+    names = set()
+    local = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.comprehension):
+            for target in ast.walk(node.target):
+                if isinstance(target, ast.Name):
+                    local.add(target.id)
+        elif isinstance(node, ast.Lambda):
+            local.update(a.arg for a in node.args.args)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+    return {n for n in names - bound - local if not hasattr(builtins, n)}
+
+
+def _target_names(target: str, lineno: int) -> set[str]:
+    try:
+        tree = ast.parse(f"for {target} in ():\n pass")
+    except SyntaxError:
+        raise TemplateSyntaxError(f"line {lineno}: invalid loop target {target!r}") from None
+    return {n.id for n in ast.walk(tree.body[0].target) if isinstance(n, ast.Name)}
+
+
+def _translate(source: str, *, stream: bool = False) -> str:
+    """Translate template source into the Python source of a render function.
+
+    With stream=True the function is a generator yielding output pieces
+    instead of returning one string.
+    """
+    body: list[str] = []
+    stack: list[tuple[str, int]] = []
+    bound_stack: list[set[str]] = [set()]
+    free: set[str] = set()
+    pending: list[str] = []  # literal/expr parts not yet flushed into one write
+
+    def indent() -> str:
+        return "    " * (len(stack) + 1)
+
+    def flush() -> None:
+        if pending:
+            piece = " + ".join(pending)
+            body.append(f"{indent()}yield {piece}" if stream else f"{indent()}_w({piece})")
+            pending.clear()
+
+    def emit_text(text: str, lineno: int) -> None:
+        pos = 0
+        for match in _EXPR_RE.finditer(text):
+            if match.start() > pos:
+                pending.append(repr(text[pos:match.start()]))
+            expr = match.group(1)
+            free.update(_free_names(expr, bound_stack[-1], lineno))
+            pending.append(f"str({expr})")
+            pos = match.end()
+        if pos < len(text):
+            pending.append(repr(text[pos:]))
+
+    lines = source.splitlines(keepends=True)
+    for lineno, line in enumerate(lines, start=1):
+        tag = _TAG_LINE_RE.match(line.rstrip("\n"))
+        if tag is None:
+            emit_text(line, lineno)
+            continue
+
+        flush()
+        words = tag.group(1).split(None, 1)
+        keyword = words[0] if words else ""
+        arg = words[1] if len(words) > 1 else ""
+
+        if keyword == "for":
+            target, sep, iterable = arg.partition(" in ")
+            if not sep:
+                raise TemplateSyntaxError(f"line {lineno}: expected 'for x in xs', got {arg!r}")
+            free.update(_free_names(iterable, bound_stack[-1], lineno))
+            body.append(f"{indent()}for {target} in {iterable}:")
+            stack.append(("for", lineno))
+            bound_stack.append(bound_stack[-1] | _target_names(target, lineno))
+        elif keyword == "if":
+            free.update(_free_names(arg, bound_stack[-1], lineno))
+            body.append(f"{indent()}if {arg}:")
+            stack.append(("if", lineno))
+            bound_stack.append(bound_stack[-1])
+        elif keyword in ("elif", "else"):
+            if not stack or stack[-1][0] != "if":
+                raise TemplateSyntaxError(f"line {lineno}: '{keyword}' outside of an if block")
+            body.append(f"{indent()}pass")
+            stack.pop()
+            bound_stack.pop()
+            if keyword == "elif":
+                free.update(_free_names(arg, bound_stack[-1], lineno))
+                body.append(f"{indent()}elif {arg}:")
+                stack.append(("if", lineno))
+            else:
+                body.append(f"{indent()}else:")
+                stack.append(("else", lineno))
+            bound_stack.append(bound_stack[-1])
+        elif keyword in ("endfor", "endif"):
+            opener = keyword[3:]
+            if not stack or (stack[-1][0] != opener and not (opener == "if" and stack[-1][0] == "else")):
+                raise TemplateSyntaxError(f"line {lineno}: unexpected '{keyword}'")
+            body.append(f"{indent()}pass")
+            stack.pop()
+            bound_stack.pop()
+        else:
+            raise TemplateSyntaxError(f"line {lineno}: unknown tag {keyword!r}")
+
+    flush()
+    if stack:
+        kind, lineno = stack[-1]
+        raise TemplateSyntaxError(f"line {lineno}: '{kind}' block is never closed")
+
+    prologue = [
+        f"    {name} = _ctx[{name!r}] if {name!r} in _ctx else _missing({name!r})"
+        for name in sorted(free)
+    ]
+    if stream:
+        # The trailing bare yield keeps the function a generator even when
+        # the template produces no output at all.
+        return "\n".join(["def _render(_ctx):"] + prologue + body + ["    return", "    yield", ""])
+    return "\n".join(
+        ["def _render(_ctx):", "    _out = []", "    _w = _out.append"]
+        + prologue
+        + body
+        + ["    return ''.join(_out)", ""]
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str, *, stream: bool = False) -> Callable[[dict], str | Iterator[str]]:
+    """Compile template source into a render function taking a context dict.
+
+    Compiled functions are cached by source, so each template compiles once
+    per process. With stream=True the function returns an iterator of
+    output pieces instead of a string.
+    """
+    code = compile(_translate(source, stream=stream), "<template>", "exec")
+    namespace: dict = {"_missing": _missing}
+    exec(code, namespace)
+    return namespace["_render"]
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str, *, stream: bool = False) -> Callable[[dict], str | Iterator[str]]:
+    """Load a template shipped in mcp_creator/templates and compile it."""
+    source = resources.files(TEMPLATE_PACKAGE).joinpath(name).read_text(encoding="utf-8")
+    return compile_template(source, stream=stream)
+
+
+def render_template(name: str, **context) -> str:
+    """Render a shipped template by file name."""
+    return load_template(name)(context)
+
+
+def iter_template(name: str, **context) -> Iterator[str]:
+    """Render a shipped template by file name, yielding output as it is produced."""
+    return load_template(name, stream=True)(context)
@@ -0,0 +1,528 @@
+"""Compiled, immutable form of a tool definition shared by all codegen renderers.
+
+A tool def arrives as loose JSON. Every renderer needs the same derived
+pieces — Python annotations, defaults, the ``| None`` rule for optional
+params, the signature, the call arguments — so they are worked out once
+here and frozen into a ToolSpec. Specs are memoized by a content hash of
+the def, so rendering the same tool for server.py, its tool module, its
+service, and its test parses it once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+_TYPE_MAP = {
+    "string": "str",
+    "str": "str",
+    "integer": "int",
+    "int": "int",
+    "number": "float",
+    "float": "float",
+    "boolean": "bool",
+    "bool": "bool",
+    "list": "list",
+    "array": "list",
+    "dict": "dict",
+    "object": "dict",
+}
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+HTTP_LOCATIONS = ("path", "query", "header", "body")
+
+# Settings of the project "api" block that may be left out, with their defaults.
+API_DEFAULTS = {
+    "auth_header": "Authorization",
+    "auth_prefix": "Bearer ",
+    "timeout": 30.0,
+    "connect_timeout": 5.0,
+    "pool_size": 10,
+}
+
+# Settings of a tool's "cache" block that may be left out, with their defaults.
+CACHE_DEFAULTS = {"ttl": 300.0, "max_entries": 128, "persist": False}
+
+# Items per page when a paginated tool is called without a page_size.
+DEFAULT_PAGE_SIZE = 100
+
+_PATH_TEMPLATE_RE = re.compile(r"\{([^{}]+)\}")
+
+_JSON_TYPES = {"str": "string", "int": "integer", "float": "number", "bool": "boolean"}
+
+_CACHE_SIZE = 1024
+_cache: OrderedDict[str, ToolSpec] = OrderedDict()
+
+
+def python_type(type_str: str) -> str:
+    """Map a simple type string to a Python type annotation."""
+    return _TYPE_MAP.get(type_str.lower(), "str")
+
+
+def _json_type(py_type: str) -> dict:
+    """JSON schema for a parameter annotation, as pydantic would generate it."""
+    if py_type == "list":
+        return {"items": {}, "type": "array"}
+    if py_type == "dict":
+        return {"additionalProperties": True, "type": "object"}
+    return {"type": _JSON_TYPES[py_type]}
+
+
+@dataclass(frozen=True, slots=True)
+class ParamSpec:
+    """One tool parameter, with its rendered signature fragment."""
+
+    name: str
+    py_type: str
+    required: bool
+    default: object
+    annotation: str
+    signature: str
+
+
+@dataclass(frozen=True, slots=True)
+class HttpSpec:
+    """How a tool maps onto one HTTP operation (tool defs with an "http" block).
+
+    Pairs are (wire_name, param_name): the name the API uses, and the Python
+    parameter that carries it. url_expr is a Python expression building the
+    request path from the path parameters.
+    """
+
+    method: str
+    path: str
+    base_url: str
+    url_expr: str
+    query: tuple[tuple[str, str], ...]
+    headers: tuple[tuple[str, str], ...]
+    body_fields: tuple[tuple[str, str], ...]
+    body_param: str | None
+    auth_header: str | None
+    auth_prefix: str
+    auth_env: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class CacheSpec:
+    """How a tool's results are cached (tool defs with a "cache" block).
+
+    key names the params that make up the cache key; key_kwargs is the
+    rendered keyword-argument list passing them.
+    """
+
+    ttl: float
+    max_entries: int
+    key: tuple[str, ...]
+    key_kwargs: str
+    persist: bool
+
+
+@dataclass(frozen=True, slots=True)
+class LimitSpec:
+    """A tool's own concurrency limit, wait queue and timeout (tool defs with a "limits" block).
+
+    Unset settings fall back to the project-wide defaults in limits.py;
+    kwargs is the rendered keyword-argument list of the set ones. Batch
+    tools always have one, since their items go through the limits.
+    """
+
+    concurrency: int | None
+    queue: int | None
+    timeout: float | None
+    kwargs: str
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """One tool definition, with everything renderers derive from it."""
+
+    name: str
+    description: str | None
+    returns: str | None
+    class_name: str
+    params: tuple[ParamSpec, ...]
+    signature: str
+    call_args: str
+    call_kwargs: str
+    fingerprint: str
+    http: HttpSpec | None = None
+    is_async: bool = False
+    timeout: float | None = None
+    cache: CacheSpec | None = None
+    paginated: bool = False
+    service_signature: str = ""
+    batch: bool = False
+    limits: LimitSpec | None = None
+
+    @property
+    def service_params(self) -> tuple[ParamSpec, ...]:
+        """The params passed on to the service: all but a paginated tool's cursor and page_size."""
+        return self.params[:-len(PAGE_PARAMS)] if self.paginated else self.params
+
+
+@dataclass(frozen=True, slots=True)
+class ApiSpec:
+    """The upstream API every service in a project reaches through one pooled client."""
+
+    base_url: str
+    auth_env: str | None
+    auth_header: str
+    auth_prefix: str
+    timeout: float
+    connect_timeout: float
+    pool_size: int
+
+
+def input_schema(spec: ToolSpec) -> dict:
+    """Return the JSON input schema FastMCP would build for the tool's signature.
+
+    Matches what introspecting the generated function yields (property
+    titles, the anyOf-null form for optional params without a default, key
+    order), so a server can register tools without building pydantic models.
+    """
+    properties = {}
+    for p in spec.params:
+        prop = _json_type(p.py_type)
+        if not p.required:
+            if p.default is None:
+                prop = {"anyOf": [prop, {"type": "null"}], "default": None}
+            else:
+                prop = {**prop, "default": p.default}
+        prop["title"] = p.name.title().replace("_", " ").strip()
+        properties[p.name] = dict(sorted(prop.items()))
+
+    schema: dict = {"properties": properties}
+    required = [p.name for p in spec.params if p.required]
+    if required:
+        schema["required"] = required
+    schema["title"] = f"{spec.name}Arguments"
+    schema["type"] = "object"
+    return schema
+
+
+def fingerprint(tool: dict) -> str:
+    """Return the content hash of a tool def (key order does not matter)."""
+    canonical = json.dumps(tool, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _class_name(snake_name: str) -> str:
+    return "".join(word.capitalize() for word in snake_name.split("_"))
+
+
+def _compile_param(p: dict) -> ParamSpec:
+    if not isinstance(p, dict) or not isinstance(p.get("name"), str):
+        raise ValueError(f"Parameter definitions need a string 'name': {p!r}")
+    pname = p["name"]
+    ptype = python_type(p.get("type", "string"))
+    required = bool(p.get("required", True))
+    default = p.get("default")
+
+    if required:
+        annotation = ptype
+        signature = f"{pname}: {ptype}"
+    else:
+        if default is None:
+            default_str = "None"
+            annotation = f"{ptype} | None"
+        elif isinstance(default, str):
+            default_str = f'"{default}"'
+            annotation = ptype
+        else:
+            default_str = str(default)
+            annotation = ptype
+        signature = f"{pname}: {annotation} = {default_str}"
+
+    return ParamSpec(
+        name=pname,
+        py_type=ptype,
+        required=required,
+        default=default,
+        annotation=annotation,
+        signature=signature,
+    )
+
+
+# The params a paginated tool takes after its own.
+PAGE_PARAMS = (
+    _compile_param({"name": "cursor", "type": "string", "required": False}),
+    _compile_param({"name": "page_size", "type": "integer", "required": False, "default": DEFAULT_PAGE_SIZE}),
+)
+
+
+def _compile_http(http: dict, params: tuple[ParamSpec, ...]) -> HttpSpec:
+    """Compile a tool def's "http" block.
+
+    The block looks like::
+
+        {"method": "GET", "path": "/pets/{petId}", "base_url": "https://api.example.com",
+         "params": {"pet_id": {"in": "path", "name": "petId"}, "limit": {"in": "query"}},
+         "body": "fields",
+         "auth": {"header": "Authorization", "prefix": "Bearer ", "env": "API_TOKEN"}}
+
+    Params not listed under "params" are sent as query parameters under
+    their own name. "body" is "fields" (send body-located params as a JSON
+    object) or the name of a single param sent as the whole JSON body.
+    """
+    if not isinstance(http, dict):
+        raise ValueError("'http' must be an object.")
+    method = str(http.get("method", "GET")).upper()
+    path = http.get("path", "/")
+    bindings = http.get("params") or {}
+    if not isinstance(path, str) or not isinstance(bindings, dict):
+        raise ValueError("'http.path' must be a string and 'http.params' an object.")
+
+    body = http.get("body")
+    located: dict[str, list[tuple[str, str]]] = {loc: [] for loc in HTTP_LOCATIONS}
+    for p in params:
+        if p.name == body:
+            continue
+        binding = bindings.get(p.name) or {}
+        location = binding.get("in", "query")
+        if location not in located:
+            raise ValueError(f"'http.params.{p.name}.in' must be one of {', '.join(HTTP_LOCATIONS)}.")
+        located[location].append((binding.get("name", p.name), p.name))
+
+    path_params = dict(located["path"])
+    pieces = []
+    pos = 0
+    for match in _PATH_TEMPLATE_RE.finditer(path):
+        if match.start() > pos:
+            pieces.append(json.dumps(path[pos:match.start()], ensure_ascii=False))
+        wire = match.group(1)
+        if wire not in path_params:
+            raise ValueError(f"'http.path' placeholder {{{wire}}} has no matching path parameter.")
+        pieces.append(f'quote(str({path_params[wire]}), safe="")')
+        pos = match.end()
+    if pos < len(path) or not pieces:
+        pieces.append(json.dumps(path[pos:], ensure_ascii=False))
+
+    auth = http.get("auth") or {}
+    return HttpSpec(
+        method=method,
+        path=path,
+        base_url=str(http.get("base_url", "")),
+        url_expr=" + ".join(pieces),
+        query=tuple(located["query"]),
+        headers=tuple(located["header"]),
+        body_fields=tuple(located["body"]) if body == "fields" else (),
+        body_param=body if body not in (None, "fields") else None,
+        auth_header=auth.get("header"),
+        auth_prefix=auth.get("prefix", ""),
+        auth_env=auth.get("env"),
+    )
+
+
+def _compile_cache(cache: dict, params: tuple[ParamSpec, ...]) -> CacheSpec:
+    """Compile a tool def's "cache" block.
+
+    The block looks like::
+
+        {"ttl": 300, "max_entries": 128, "key": ["city"], "persist": false}
+
+    Every setting is optional; the key defaults to all parameters. A
+    paginated tool's cursor and page_size are always part of the key.
+    """
+    if not isinstance(cache, dict):
+        raise ValueError("'cache' must be an object.")
+    settings = {**CACHE_DEFAULTS, **cache}
+    key = tuple(settings.get("key", [p.name for p in params]))
+    names = {p.name for p in params}
+    key += tuple(p.name for p in PAGE_PARAMS if p.name in names and p.name not in key)
+    return CacheSpec(
+        ttl=float(settings["ttl"]),
+        max_entries=int(settings["max_entries"]),
+        key=key,
+        key_kwargs=", ".join(f"{name}={name}" for name in key),
+        persist=bool(settings["persist"]),
+    )
+
+
+def _compile_limits(limits: dict) -> LimitSpec:
+    """Compile a tool def's "limits" block.
+
+    The block looks like::
+
+        {"concurrency": 4, "queue": 16, "timeout": 30}
+
+    Every setting is optional.
+    """
+    if not isinstance(limits, dict):
+        raise ValueError("'limits' must be an object.")
+    concurrency = limits.get("concurrency")
+    queue = limits.get("queue")
+    timeout = limits.get("timeout")
+    settings = {
+        "concurrency": None if concurrency is None else int(concurrency),
+        "queue": None if queue is None else int(queue),
+        "timeout": None if timeout is None else float(timeout),
+    }
+    return LimitSpec(
+        **settings,
+        kwargs=", ".join(f"{key}={value!r}" for key, value in settings.items() if value is not None),
+    )
+
+
+def build_tool_spec(tool: dict, *, digest: str | None = None) -> ToolSpec:
+    """Compile a tool def into a ToolSpec without consulting the cache.
+
+    Raises:
+        ValueError: if the def has no string name, a malformed parameter list,
+            or a malformed "http", "cache" or "limits" block.
+    """
+    if not isinstance(tool, dict) or not isinstance(tool.get("name"), str):
+        raise ValueError(f"Tool definitions need a string 'name': {tool!r}")
+    params_raw = tool.get("parameters", [])
+    if not isinstance(params_raw, list):
+        raise ValueError(f"Tool '{tool['name']}': 'parameters' must be a list.")
+
+    name = tool["name"]
+    service_params = tuple(_compile_param(p) for p in params_raw)
+    paginated = bool(tool.get("paginated", False))
+    params = service_params + PAGE_PARAMS if paginated else service_params
+    http = _compile_http(tool["http"], params) if tool.get("http") is not None else None
+    cache = _compile_cache(tool["cache"], params) if tool.get("cache") is not None else None
+    batch = bool(tool.get("batch", False))
+    limits = tool.get("limits")
+    if limits is None and batch:
+        limits = {}  # batch items go through the limits, so the tool gets the project defaults
+    return ToolSpec(
+        name=name,
+        description=tool.get("description"),
+        returns=tool.get("returns"),
+        class_name=_class_name(name),
+        params=params,
+        signature=", ".join(p.signature for p in params),
+        call_args=", ".join(p.name for p in params),
+        call_kwargs=", ".join(f"{p.name}={p.name}" for p in service_params),
+        fingerprint=digest or fingerprint(tool),
+        http=http,
+        is_async=bool(tool.get("async", False)),
+        timeout=(tool.get("api") or {}).get("timeout"),
+        cache=cache,
+        paginated=paginated,
+        service_signature=", ".join(p.signature for p in service_params),
+        batch=batch,
+        limits=_compile_limits(limits) if limits is not None else None,
+    )
+
+
+def compile_api(api: dict | None, tools: Iterable[dict | ToolSpec] = ()) -> ApiSpec | None:
+    """Compile a project's "api" block, which configures the shared HTTP client.
+
+    The block looks like::
+
+        {"base_url": "https://api.example.com", "auth_env": "API_TOKEN",
+         "auth_header": "Authorization", "auth_prefix": "Bearer ",
+         "timeout": 30, "connect_timeout": 5, "pool_size": 10}
+
+    Only base_url is required. Without a block, a project whose tools have
+    "http" blocks still gets a shared client, for the first such tool's
+    base URL; any other project gets None.
+    """
+    if api is None:
+        for tool in tools:
+            http = tool.http if isinstance(tool, ToolSpec) else tool.get("http")
+            if http is not None:
+                base_url = http.base_url if isinstance(http, HttpSpec) else http.get("base_url", "")
+                api = {"base_url": base_url or "http://localhost"}
+                break
+        else:
+            return None
+    settings = {**API_DEFAULTS, **api}
+    return ApiSpec(
+        base_url=settings["base_url"],
+        auth_env=settings.get("auth_env"),
+        auth_header=settings["auth_header"],
+        auth_prefix=settings["auth_prefix"],
+        timeout=float(settings["timeout"]),
+        connect_timeout=float(settings["connect_timeout"]),
+        pool_size=int(settings["pool_size"]),
+    )
+
+
+def uses_pagination(tools: Iterable[dict | ToolSpec]) -> bool:
+    """True if any of the tools is paginated."""
+    return any(t.paginated if isinstance(t, ToolSpec) else t.get("paginated") for t in tools)
+
+
+def uses_batch(tools: Iterable[dict | ToolSpec]) -> bool:
+    """True if any of the tools has a batch companion."""
+    return any(t.batch if isinstance(t, ToolSpec) else t.get("batch") for t in tools)
+
+
+def uses_limits(tools: Iterable[dict | ToolSpec]) -> bool:
+    """True if any of the tools has a "limits" block, or a batch companion (see LimitSpec)."""
+    return any(
+        t.limits is not None if isinstance(t, ToolSpec) else t.get("limits") is not None or bool(t.get("batch"))
+        for t in tools
+    )
+
+
+def uses_cache(tools: Iterable[dict | ToolSpec]) -> bool:
+    """True if any of the tools has a "cache" block."""
+    return any(
+        (t.cache if isinstance(t, ToolSpec) else t.get("cache")) is not None for t in tools
+    )
+
+
+def compile_tool(tool: dict | ToolSpec) -> ToolSpec:
+    """Return the ToolSpec for a tool def, memoized by content hash.
+
+    Already-compiled specs pass straight through, so renderers can accept
+    either form.
+    """
+    if isinstance(tool, ToolSpec):
+        return tool
+    digest = fingerprint(tool)
+    spec = _cache.get(digest)
+    if spec is not None:
+        _cache.move_to_end(digest)
+        return spec
+    spec = build_tool_spec(tool, digest=digest)
+    _cache[digest] = spec
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return spec
+
+
+def compile_tools(tools: list[dict | ToolSpec]) -> list[ToolSpec]:
+    """Compile a list of tool defs, preserving order."""
+    return [compile_tool(t) for t in tools]
+
+
+class LazySpecs:
+    """Re-iterable view of tool defs that compiles each one as it is reached.
+
+    Renderers that walk a very large tool list more than once (server.py
+    walks it for imports and again for registrations) iterate this instead
+    of a list of specs, so only the bounded spec cache is ever held.
+    """
+
+    __slots__ = ("_tools",)
+
+    def __init__(self, tools: Iterable[dict | ToolSpec]):
+        self._tools = tools
+
+    def __iter__(self) -> Iterator[ToolSpec]:
+        return (compile_tool(t) for t in self._tools)
+
+
+def apply_async_default(tools: list[dict], enabled: bool) -> list[dict]:
+    """Mark tool defs that don't set "async" themselves as async, if enabled.
+
+    This is how the project-wide async_tools option reaches each tool: the
+    expanded defs are what get rendered and recorded in the manifest.
+    """
+    if not enabled:
+        return tools
+    return [t if not isinstance(t, dict) or "async" in t else {**t, "async": True} for t in tools]
+
+
+def clear_cache() -> None:
+    """Drop all memoized specs."""
+    _cache.clear()
@@ -0,0 +1,394 @@
+"""Fail-early validation of scaffold payloads.
+
+Checks a whole tools / env_vars / paid_tools payload in one pass before any
+rendering or I/O, and returns every problem found instead of stopping at
+the first one. Everything the checks need (patterns, type tables) is built
+once at import time, except the reserved names, which are derived from the
+templates on first use (see services.reserved_names).
+"""
+
+from __future__ import annotations
+
+import keyword
+import re
+
+from mcp_creator.services.reserved_names import reserved_names
+from mcp_creator.services.tool_spec import API_DEFAULTS, CACHE_DEFAULTS, _TYPE_MAP, HTTP_LOCATIONS, HTTP_METHODS, python_type
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+_ENV_VAR_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+_UNSAFE_TEXT_RE = re.compile(r'["\\\r\n]')
+_PATH_PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+KNOWN_TYPES = frozenset(_TYPE_MAP)
+
+# Python annotation -> accepted default value types. bool is excluded from
+# the numeric types because isinstance(True, int) is true.
+_DEFAULT_TYPES: dict[str, tuple[type, ...]] = {
+    "str": (str,),
+    "int": (int,),
+    "float": (int, float),
+    "bool": (bool,),
+    "list": (list,),
+    "dict": (dict,),
+}
+
+
+def _check_identifier(value: object, where: str, errors: list[str]) -> bool:
+    if not isinstance(value, str):
+        errors.append(f"{where}: must be a string, got {type(value).__name__}.")
+        return False
+    if not _IDENTIFIER_RE.match(value) or keyword.iskeyword(value):
+        errors.append(f"{where}: {value!r} is not a valid Python identifier.")
+        return False
+    return True
+
+
+def _check_text(tool: dict, field: str, where: str, errors: list[str]) -> None:
+    value = tool.get(field)
+    if value is None:
+        return
+    if not isinstance(value, str):
+        errors.append(f"{where}.{field}: must be a string.")
+    elif _UNSAFE_TEXT_RE.search(value):
+        errors.append(f"{where}.{field}: must not contain double quotes, backslashes, or newlines.")
+
+
+def _check_default(param: dict, py_type: str, where: str, errors: list[str]) -> None:
+    default = param["default"]
+    if default is None:
+        return
+    accepted = _DEFAULT_TYPES[py_type]
+    if isinstance(default, bool) and bool not in accepted:
+        ok = False
+    else:
+        ok = isinstance(default, accepted)
+    if not ok:
+        errors.append(
+            f"{where}.default: {default!r} is not a valid default for type "
+            f"{param.get('type', 'string')!r}."
+        )
+    elif isinstance(default, str) and _UNSAFE_TEXT_RE.search(default):
+        errors.append(f"{where}.default: must not contain double quotes, backslashes, or newlines.")
+
+
+def _check_params(params: object, where: str, errors: list[str]) -> None:
+    if not isinstance(params, list):
+        errors.append(f"{where}: must be a list.")
+        return
+    seen: set[str] = set()
+    seen_optional = False
+    for i, param in enumerate(params):
+        pwhere = f"{where}[{i}]"
+        if not isinstance(param, dict):
+            errors.append(f"{pwhere}: must be an object.")
+            continue
+
+        name = param.get("name")
+        if _check_identifier(name, f"{pwhere}.name", errors):
+            if name in reserved_names().params:
+                errors.append(f"{pwhere}.name: {name!r} is reserved.")
+            elif name in seen:
+                errors.append(f"{pwhere}.name: duplicate parameter {name!r}.")
+            seen.add(name)
+
+        ptype = param.get("type", "string")
+        if not isinstance(ptype, str) or ptype.lower() not in KNOWN_TYPES:
+            errors.append(
+                f"{pwhere}.type: unknown type {ptype!r}; expected one of {', '.join(sorted(KNOWN_TYPES))}."
+            )
+            ptype = "string"
+
+        required = param.get("required", True)
+        if not isinstance(required, bool):
+            errors.append(f"{pwhere}.required: must be true or false.")
+            required = bool(required)
+
+        if required:
+            if seen_optional:
+                errors.append(
+                    f"{pwhere}: required parameter {name!r} must come before optional parameters."
+                )
+        else:
+            seen_optional = True
+            if "default" in param:
+                _check_default(param, python_type(ptype), pwhere, errors)
+
+
+def _check_http(tool: dict, where: str, errors: list[str]) -> None:
+    http = tool["http"]
+    if not isinstance(http, dict):
+        errors.append(f"{where}: must be an object.")
+        return
+    if str(http.get("method", "GET")).upper() not in HTTP_METHODS:
+        errors.append(f"{where}.method: {http.get('method')!r} is not an HTTP method.")
+    path = http.get("path", "/")
+    if not isinstance(path, str) or not path.startswith("/"):
+        errors.append(f"{where}.path: must be a string starting with '/'.")
+        path = "/"
+    else:
+        _check_text(http, "path", where, errors)
+    if not isinstance(http.get("base_url", ""), str):
+        errors.append(f"{where}.base_url: must be a string.")
+
+    params = tool.get("parameters", [])
+    names = {p.get("name") for p in params if isinstance(p, dict)} if isinstance(params, list) else set()
+    bindings = http.get("params") or {}
+    if not isinstance(bindings, dict):
+        errors.append(f"{where}.params: must be an object keyed by parameter name.")
+        bindings = {}
+    path_wires = set()
+    for name, binding in bindings.items():
+        bwhere = f"{where}.params.{name}"
+        if name not in names:
+            errors.append(f"{bwhere}: no parameter named {name!r}.")
+        if not isinstance(binding, dict) or binding.get("in", "query") not in HTTP_LOCATIONS:
+            errors.append(f"{bwhere}.in: must be one of {', '.join(HTTP_LOCATIONS)}.")
+            continue
+        if not isinstance(binding.get("name", name), str):
+            errors.append(f"{bwhere}.name: must be a string.")
+        elif binding.get("in") == "path":
+            path_wires.add(binding.get("name", name))
+    for placeholder in _PATH_PLACEHOLDER_RE.findall(path):
+        if placeholder not in path_wires:
+            errors.append(f"{where}.path: placeholder {{{placeholder}}} has no matching path parameter.")
+
+    body = http.get("body")
+    if body is not None and body != "fields" and body not in names:
+        errors.append(f"{where}.body: must be \"fields\" or the name of a parameter.")
+    for name in sorted(reserved_names().http_params.intersection(names)):
+        errors.append(f"{where}: parameter name {name!r} is reserved in http tools.")
+
+    auth = http.get("auth")
+    if auth is not None:
+        if not isinstance(auth, dict) or not isinstance(auth.get("header"), str):
+            errors.append(f"{where}.auth: must be an object with a string 'header'.")
+        elif not isinstance(auth.get("env"), str) or not _ENV_VAR_RE.match(auth["env"]):
+            errors.append(f"{where}.auth.env: must be an environment variable name.")
+
+
+def _check_timeout(block: dict, field: str, where: str, errors: list[str]) -> None:
+    value = block.get(field)
+    if value is None:
+        return
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        errors.append(f"{where}.{field}: must be a positive number of seconds.")
+
+
+def _check_tool_api(tool: dict, where: str, errors: list[str]) -> None:
+    api = tool["api"]
+    if not isinstance(api, dict):
+        errors.append(f"{where}: must be an object.")
+        return
+    for key in sorted(set(api) - {"timeout"}):
+        errors.append(f"{where}.{key}: only 'timeout' can be set per tool; set the rest on the project api block.")
+    _check_timeout(api, "timeout", where, errors)
+
+
+def _param_names(tool: dict) -> list:
+    params = tool.get("parameters", [])
+    return [p.get("name") for p in params if isinstance(p, dict)] if isinstance(params, list) else []
+
+
+def _check_cache(tool: dict, where: str, errors: list[str]) -> None:
+    cache = tool["cache"]
+    if not isinstance(cache, dict):
+        errors.append(f"{where}: must be an object.")
+        return
+    for key in sorted(set(cache) - set(CACHE_DEFAULTS) - {"key"}):
+        errors.append(f"{where}.{key}: unknown setting.")
+    _check_timeout(cache, "ttl", where, errors)
+    max_entries = cache.get("max_entries", 1)
+    if isinstance(max_entries, bool) or not isinstance(max_entries, int) or max_entries < 1:
+        errors.append(f"{where}.max_entries: must be a positive integer.")
+    if not isinstance(cache.get("persist", False), bool):
+        errors.append(f"{where}.persist: must be true or false.")
+
+    names = _param_names(tool)
+    if tool.get("paginated") is True:
+        names += ["cursor", "page_size"]
+    key = cache.get("key", names)
+    if not isinstance(key, list):
+        errors.append(f"{where}.key: must be a list of parameter names.")
+    else:
+        for name in key:
+            if name not in names:
+                errors.append(f"{where}.key: no parameter named {name!r}.")
+    for name in sorted(reserved_names().cached_params.intersection(names)):
+        errors.append(f"{where}: parameter name {name!r} is reserved in cached tools.")
+
+
+def _check_limits(tool: dict, where: str, errors: list[str]) -> None:
+    limits = tool["limits"]
+    if not isinstance(limits, dict):
+        errors.append(f"{where}: must be an object.")
+        return
+    for key in sorted(set(limits) - {"concurrency", "queue", "timeout"}):
+        errors.append(f"{where}.{key}: unknown setting.")
+    for key, least in (("concurrency", 1), ("queue", 0)):
+        value = limits.get(key, least)
+        if isinstance(value, bool) or not isinstance(value, int) or value < least:
+            kind = "a positive" if least else "a non-negative"
+            errors.append(f"{where}.{key}: must be {kind} integer.")
+    _check_timeout(limits, "timeout", where, errors)
+
+
+def _check_paginated(tool: dict, where: str, errors: list[str]) -> None:
+    paginated = tool["paginated"]
+    if not isinstance(paginated, bool):
+        errors.append(f"{where}: must be true or false.")
+        return
+    if not paginated:
+        return
+    if tool.get("http") is not None:
+        errors.append(f"{where}: http tools can't be paginated; the upstream API decides what a page is.")
+    for name in sorted(reserved_names().paginated_params.intersection(_param_names(tool))):
+        errors.append(f"{where}: parameter name {name!r} is reserved in paginated tools.")
+
+
+def validate_tools(tools: object, *, where: str = "tools") -> list[str]:
+    """Validate a list of tool defs. Returns a list of error messages (empty if valid)."""
+    errors: list[str] = []
+    if not isinstance(tools, list):
+        return [f"{where}: must be a JSON array of tool definitions."]
+
+    seen: set[str] = set()
+    for i, tool in enumerate(tools):
+        twhere = f"{where}[{i}]"
+        if not isinstance(tool, dict):
+            errors.append(f"{twhere}: must be an object.")
+            continue
+
+        name = tool.get("name")
+        if _check_identifier(name, f"{twhere}.name", errors):
+            if name in reserved_names().tools:
+                errors.append(f"{twhere}.name: {name!r} clashes with a name the generated code already uses.")
+            elif name in seen:
+                errors.append(f"{twhere}.name: duplicate tool {name!r}.")
+            seen.add(name)
+
+        _check_text(tool, "description", twhere, errors)
+        _check_text(tool, "returns", twhere, errors)
+        _check_params(tool.get("parameters", []), f"{twhere}.parameters", errors)
+        if not isinstance(tool.get("async", False), bool):
+            errors.append(f"{twhere}.async: must be true or false.")
+        if tool.get("http") is not None:
+            _check_http(tool, f"{twhere}.http", errors)
+        if tool.get("api") is not None:
+            _check_tool_api(tool, f"{twhere}.api", errors)
+        if tool.get("paginated") is not None:
+            _check_paginated(tool, f"{twhere}.paginated", errors)
+        if tool.get("cache") is not None:
+            _check_cache(tool, f"{twhere}.cache", errors)
+        if not isinstance(tool.get("batch", False), bool):
+            errors.append(f"{twhere}.batch: must be true or false.")
+        if tool.get("limits") is not None:
+            _check_limits(tool, f"{twhere}.limits", errors)
+
+    companions = {
+        f"{tool['name']}_batch": i
+        for i, tool in enumerate(tools)
+        if isinstance(tool, dict) and tool.get("batch") is True and isinstance(tool.get("name"), str)
+    }
+    for name in sorted(seen.intersection(companions)):
+        errors.append(
+            f"{where}[{companions[name]}].batch: its companion tool {name!r} clashes with a tool of that name."
+        )
+
+    return errors
+
+
+def validate_api(api: object, *, where: str = "api") -> list[str]:
+    """Validate a project "api" block (see tool_spec.compile_api)."""
+    if api is None:
+        return []
+    if not isinstance(api, dict):
+        return [f"{where}: must be an object."]
+    errors: list[str] = []
+    for key in sorted(set(api) - set(API_DEFAULTS) - {"base_url", "auth_env"}):
+        errors.append(f"{where}.{key}: unknown setting.")
+    base_url = api.get("base_url")
+    if not isinstance(base_url, str) or not base_url.startswith(("http://", "https://")):
+        errors.append(f"{where}.base_url: must be an http:// or https:// URL.")
+    else:
+        _check_text(api, "base_url", where, errors)
+    auth_env = api.get("auth_env")
+    if auth_env is not None and (not isinstance(auth_env, str) or not _ENV_VAR_RE.match(auth_env)):
+        errors.append(f"{where}.auth_env: must be an environment variable name.")
+    _check_text(api, "auth_header", where, errors)
+    _check_text(api, "auth_prefix", where, errors)
+    _check_timeout(api, "timeout", where, errors)
+    _check_timeout(api, "connect_timeout", where, errors)
+    pool_size = api.get("pool_size", 1)
+    if isinstance(pool_size, bool) or not isinstance(pool_size, int) or pool_size < 1:
+        errors.append(f"{where}.pool_size: must be a positive integer.")
+    return errors
+
+
+def validate_env_vars(env_vars: object, *, where: str = "env_vars") -> list[str]:
+    """Validate a list of env var defs."""
+    if env_vars is None:
+        return []
+    if not isinstance(env_vars, list):
+        return [f"{where}: must be a JSON array of env var definitions."]
+    errors: list[str] = []
+    seen: set[str] = set()
+    for i, var in enumerate(env_vars):
+        vwhere = f"{where}[{i}]"
+        if not isinstance(var, dict):
+            errors.append(f"{vwhere}: must be an object.")
+            continue
+        name = var.get("name")
+        if not isinstance(name, str) or not _ENV_VAR_RE.match(name):
+            errors.append(f"{vwhere}.name: {name!r} is not a valid environment variable name.")
+        elif name in seen:
+            errors.append(f"{vwhere}.name: duplicate env var {name!r}.")
+        else:
+            seen.add(name)
+        if not isinstance(var.get("required", True), bool):
+            errors.append(f"{vwhere}.required: must be true or false.")
+        desc = var.get("description", "")
+        if not isinstance(desc, str) or "\n" in desc:
+            errors.append(f"{vwhere}.description: must be a single-line string.")
+    return errors
+
+
+def validate_paid_tools(paid_tools: object, tools: object, *, where: str = "paid_tools") -> list[str]:
+    """Validate that paid_tools is a list of names of tools being generated."""
+    if paid_tools is None:
+        return []
+    if not isinstance(paid_tools, list):
+        return [f"{where}: must be a JSON array of tool names."]
+    known = {t.get("name") for t in tools if isinstance(t, dict)} if isinstance(tools, list) else set()
+    errors: list[str] = []
+    for i, name in enumerate(paid_tools):
+        if not isinstance(name, str):
+            errors.append(f"{where}[{i}]: must be a string.")
+        elif name not in known:
+            errors.append(f"{where}[{i}]: {name!r} is not one of the tools being generated.")
+    return errors
+
+
+def summarize(errors: list[str]) -> dict:
+    """Build the tool error response for a failed validation."""
+    noun = "problem" if len(errors) == 1 else "problems"
+    return {
+        "success": False,
+        "error": f"Invalid tool definitions: {len(errors)} {noun} found.",
+        "errors": errors,
+    }
+
+
+def validate_payload(
+    tools: object,
+    env_vars: object = None,
+    paid_tools: object = None,
+    api: object = None,
+) -> list[str]:
+    """Validate a full scaffold payload. Returns every error found, in payload order."""
+    return (
+        validate_tools(tools)
+        + validate_env_vars(env_vars)
+        + validate_paid_tools(paid_tools, tools)
+        + validate_api(api)
+    )
@@ -5,10 +5,85 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from mcp_creator.services import codegen, file_writer
-
-
-def add_tool(project_dir: str, tool: str) -> str:
+from mcp_creator.services import codegen, file_writer, manifest, tool_spec, validation
+
+
+def support_files(
+    project: Path,
+    package_name: str,
+    old_tools: list[dict],
+    new_tools: list[dict],
+    *,
+    paid: bool,
+    api: dict | None = None,
+) -> dict[str, str]:
+    """Shared modules and test setup a project needs once its tools change.
+
+    Adds services/api_client.py, cache.py, pagination.py, batch.py and
+    limits.py when the first tool needing them arrives, raising the mcp
+    requirement in pyproject.toml if limits.py needs it, and regenerates
+    tests/conftest.py and tests/test_limits.py, and a remote project's
+    tests/test_http.py and benchmarks/bench_http.py, to match unless they
+    were edited by hand since they were generated for old_tools.
+    """
+    src = f"src/{codegen._to_module_name(package_name)}"
+    old_api = tool_spec.compile_api(api, old_tools)
+    new_api = tool_spec.compile_api(api, new_tools)
+    old_cache = tool_spec.uses_cache(old_tools)
+    new_cache = tool_spec.uses_cache(new_tools)
+
+    files = {}
+    if new_api is not None and not (project / f"{src}/services/api_client.py").exists():
+        files[f"{src}/services/api_client.py"] = codegen.render_api_client(new_api)
+    if new_cache and not (project / f"{src}/cache.py").exists():
+        files[f"{src}/cache.py"] = codegen.render_cache(package_name)
+    if tool_spec.uses_pagination(new_tools) and not (project / f"{src}/pagination.py").exists():
+        files[f"{src}/pagination.py"] = codegen.render_pagination()
+    if tool_spec.uses_batch(new_tools) and not (project / f"{src}/batch.py").exists():
+        files[f"{src}/batch.py"] = codegen.render_batch()
+
+    limits = tool_spec.uses_limits(new_tools) or (project / f"{src}/limits.py").exists()
+    if limits and not (project / f"{src}/limits.py").exists():
+        files[f"{src}/limits.py"] = codegen.render_limits()
+    # limits.py needs a newer mcp than projects without it may require
+    pyproject_path = project / "pyproject.toml"
+    if tool_spec.uses_limits(new_tools) and pyproject_path.exists():
+        pyproject = pyproject_path.read_text(encoding="utf-8")
+        raised = codegen.raise_mcp_requirement(pyproject, codegen.mcp_version(limits=True))
+        if raised != pyproject:
+            files["pyproject.toml"] = raised
+
+    regenerated = {
+        "tests/conftest.py": lambda tools, api, cache: codegen.render_conftest(
+            package_name, paid=paid, api=api, cache=cache,
+        ),
+    }
+    if limits:
+        regenerated["tests/test_limits.py"] = lambda tools, api, cache: codegen.render_test_limits(
+            package_name, tools,
+        )
+    # Both name the project's tools; only remote projects served over streamable HTTP have them
+    if (project / "tests/test_http.py").exists():
+        regenerated["tests/test_http.py"] = lambda tools, api, cache: codegen.render_test_http(
+            package_name, tools,
+        )
+    if (project / "benchmarks/bench_http.py").exists():
+        regenerated["benchmarks/bench_http.py"] = lambda tools, api, cache: codegen.render_bench_http(
+            package_name, tools,
+        )
+    for rel_path, render in regenerated.items():
+        path = project / rel_path
+        wanted = render(new_tools, new_api, new_cache)
+        if not path.exists():
+            files[rel_path] = wanted
+        else:
+            current = path.read_text(encoding="utf-8")
+            if current == render(old_tools, old_api, old_cache) and current != wanted:
+                files[rel_path] = wanted
+    return files
+
+
+def add_tool(project_dir: str, tool: str, dry_run: bool = False) -> str:
     """Add a new tool to an existing scaffolded MCP server.
 
     Args:
@@ -16,13 +91,29 @@ def add_tool(project_dir: str, tool: str) -> str:
         tool: JSON string — a single tool definition:
               {"name": "get_forecast", "description": "...",
                "parameters": [...], "returns": "..."}
+        dry_run: If true, render into memory only and return a unified diff
+                 against what is on disk. Nothing is written.
 
     Returns:
         JSON string with created/modified files and next steps.
     """
-    tool_def = json.loads(tool)
-    tool_name = tool_def["name"]
+    try:
+        tool_def = json.loads(tool)
+    except json.JSONDecodeError as e:
+        return json.dumps({"success": False, "error": f"Invalid JSON: {e}"})
+    errors = validation.validate_tools([tool_def], where="tool")
+    if errors:
+        return json.dumps(validation.summarize(errors), indent=2)
     project = Path(project_dir).resolve()
+    project_manifest = manifest.load_manifest(project)
+    if project_manifest is not None:
+        async_default = bool(project_manifest.get("async_tools"))
+        [tool_def] = tool_spec.apply_async_default([tool_def], async_default)
+    try:
+        spec = codegen.compile_tool(tool_def)
+    except ValueError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    tool_name = spec.name
 
     # Detect module name from the src/ directory
     src_dir = project / "src"
@@ -41,48 +132,107 @@ def add_tool(project_dir: str, tool: str) -> str:
 
     module_name = module_dirs[0].name
     package_name = module_name.replace("_", "-")
+    paid = False
+    gated = False
+    lazy = False
+    schemas = False
+    structured = False
+    api_block = None
+    old_tools: list[dict] = []
+    if project_manifest is not None:
+        if any(t.get("name") == tool_name for t in project_manifest["tools"]):
+            return json.dumps({
+                "success": False,
+                "error": f"Tool '{tool_name}' already exists. Use sync_project to change it.",
+            })
+        package_name = project_manifest["package_name"]
+        paid_tools = project_manifest.get("paid_tools")
+        paid = bool(project_manifest.get("paid"))
+        gated = paid and (not paid_tools or tool_name in paid_tools)
+        lazy = bool(project_manifest.get("lazy_imports"))
+        schemas = bool(project_manifest.get("precomputed_schemas"))
+        structured = bool(project_manifest.get("structured_output"))
+        api_block = project_manifest.get("api")
+        old_tools = project_manifest["tools"]
+    api = tool_spec.compile_api(api_block, old_tools + [tool_def])
 
     # 1. Create tool module
     tool_file = f"src/{module_name}/tools/{tool_name}.py"
-    tool_content = codegen.render_tool_module(package_name, tool_def)
+    tool_content = codegen.render_tool_module(package_name, spec, structured=structured)
 
     # 2. Create service stub
     service_file = f"src/{module_name}/services/{tool_name}_service.py"
-    service_content = codegen.render_service_module(tool_def)
+    service_content = codegen.render_service_module(package_name, spec, api=api)
 
     # 3. Create test
     test_file = f"tests/test_{tool_name}.py"
-    test_content = codegen.render_test_tool(package_name, tool_def)
+    test_content = codegen.render_test_tool(package_name, spec, structured=structured)
 
     files_to_write = {
         tool_file: tool_content,
         service_file: service_content,
         test_file: test_content,
     }
-
-    written = file_writer.write_project_files(project, files_to_write)
-
-    # 4. Inject import into server.py
+    # Projects scaffolded before service lifecycles lack the module tools now use
+    lifecycle_file = f"src/{module_name}/lifecycle.py"
+    if not (project / lifecycle_file).exists():
+        files_to_write[lifecycle_file] = codegen.render_lifecycle()
+    files_to_write.update(support_files(
+        project, package_name, old_tools, old_tools + [tool_def], paid=paid, api=api_block,
+    ))
+
+    fs = file_writer.VirtualFS(project) if dry_run else None
+    written = file_writer.write_project_files(project, files_to_write, fs=fs)
+
+    # 4. Inject import into server.py (lazy servers import on first call)
     server_path = project / f"src/{module_name}/server.py"
-    import_line = codegen.render_add_tool_import(package_name, tool_name)
-    import_ok = file_writer.inject_after_sentinel(
-        server_path, "# --- IMPORTS ---", import_line
-    )
+    import_ok = True
+    if not lazy:
+        import_line = codegen.render_add_tool_import(package_name, tool_name)
+        import_ok = file_writer.inject_after_sentinel(
+            server_path, "# --- IMPORTS ---", import_line, fs=fs
+        )
+
+    # Batch companions and tool limits are set up through modules server.py
+    # only imports once a tool needs them
+    support_imports = []
+    if spec.batch:
+        support_imports.append(codegen.render_batch_import(package_name))
+    if spec.limits is not None:
+        support_imports.append(codegen.render_limits_import(package_name))
+    for support_import in support_imports:
+        server_text = fs.read_text(server_path) if fs is not None else server_path.read_text(encoding="utf-8")
+        if support_import not in server_text:
+            import_ok = file_writer.inject_after_sentinel(
+                server_path, "# --- IMPORTS ---", support_import, fs=fs
+            ) and import_ok
 
     # 5. Inject tool registration into server.py
-    registration = codegen.render_add_tool_registration(tool_def)
+    registration = codegen.render_add_tool_registration(
+        spec, gated=gated, lazy=lazy, schemas=schemas, structured=structured,
+    )
     reg_ok = file_writer.inject_after_sentinel(
-        server_path, "# --- END TOOLS ---", ""
+        server_path, "# --- END TOOLS ---", "", fs=fs
     )
     # Actually inject before END TOOLS
     reg_ok = file_writer.inject_after_sentinel(
-        server_path, "# --- TOOLS ---", registration
+        server_path, "# --- TOOLS ---", registration, fs=fs
     )
 
+    # 6. Record the tool in the project manifest
+    if project_manifest is not None:
+        project_manifest["tools"] = [
+            t for t in project_manifest["tools"] if t.get("name") != tool_name
+        ] + [tool_def]
+        project_manifest["service_hashes"][tool_name] = manifest.content_hash(service_content)
+        file_writer.write_project_files(project, {
+            manifest.MANIFEST_FILE: manifest.render_manifest(project_manifest),
+        }, fs=fs)
+
     result = {
         "success": True,
         "tool_name": tool_name,
-        "files_created": [tool_file, service_file, test_file],
+        "files_created": list(files_to_write),
         "server_updated": import_ok and reg_ok,
         "next_steps": [
             f"Tool '{tool_name}' added to the project.",
@@ -91,4 +241,12 @@ def add_tool(project_dir: str, tool: str) -> str:
         ],
     }
 
+    if fs is not None:
+        result["dry_run"] = True
+        result["changes"] = fs.changes()
+        result["diff"] = fs.diff()
+        result["next_steps"] = [
+            "Dry run — nothing was written. Review the diff, then re-run without dry_run to apply.",
+        ]
+
     return json.dumps(result, indent=2)
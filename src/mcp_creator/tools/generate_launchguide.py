@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from mcp_creator.services.file_writer import write_project_files
+from mcp_creator.services.file_writer import VirtualFS, write_project_files
 
 
 LAUNCHGUIDE_TEMPLATE = """\
@@ -48,6 +48,7 @@ def generate_launchguide(
     tags: str,
     setup_requirements: str = "No environment variables required.",
     docs_url: str = "",
+    dry_run: bool = False,
 ) -> str:
     """Generate a LAUNCHGUIDE.md for MCP Marketplace submission.
 
@@ -62,6 +63,8 @@ def generate_launchguide(
         tags: Comma-separated tags. Max 30.
         setup_requirements: Env vars or setup steps (default: none required).
         docs_url: Link to docs or README.
+        dry_run: If true, return a unified diff against the existing
+                 LAUNCHGUIDE.md instead of writing it.
 
     Returns:
         JSON string with file path and next steps.
@@ -80,7 +83,8 @@ def generate_launchguide(
         docs_url=docs_url or f"https://pypi.org/project/{package_name}/",
     )
 
-    written = write_project_files(project, {"LAUNCHGUIDE.md": content})
+    fs = VirtualFS(project) if dry_run else None
+    written = write_project_files(project, {"LAUNCHGUIDE.md": content}, fs=fs)
 
     result = {
         "success": True,
@@ -92,4 +96,11 @@ def generate_launchguide(
         ],
     }
 
+    if fs is not None:
+        result["dry_run"] = True
+        result["diff"] = fs.diff()
+        result["next_steps"] = [
+            "Dry run — nothing was written. Review the diff, then re-run without dry_run to apply.",
+        ]
+
     return json.dumps(result, indent=2)
@@ -0,0 +1,123 @@
+"""Scaffold an MCP server project from an OpenAPI 3 spec."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from mcp_creator.services.openapi import OpenAPIError, load_openapi_tools
+from mcp_creator.tools.scaffold_server import scaffold_tool_defs
+
+# Skipped operations listed in the response; the rest are only counted.
+_MAX_SKIPPED_SHOWN = 50
+
+
+def scaffold_from_openapi(
+    spec_path: str,
+    package_name: str,
+    output_dir: str = ".",
+    description: str = "",
+    paid: bool = False,
+    hosting: str = "local",
+    include_deprecated: bool = False,
+    dry_run: bool = False,
+    output_format: str = "directory",
+    archive_inline: bool = False,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: str | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
+    max_workers: int = 0,
+) -> str:
+    """Scaffold a complete MCP server with one tool per OpenAPI operation.
+
+    Args:
+        spec_path: Path to an OpenAPI 3 document in JSON.
+        package_name: PyPI package name (e.g. "petstore-mcp").
+        output_dir: Parent directory where the project folder is created.
+        description: One-line description; defaults to the spec's info.
+        paid: If true, gate all tools behind a license key.
+        hosting: "local" (default, stdio) or "remote".
+        include_deprecated: Also generate tools for deprecated operations.
+        dry_run: Render into memory and return a diff; nothing is written.
+        output_format: "directory", "zip", or "tar.gz" — as for scaffold_server.
+        archive_inline: With an archive output_format, return it base64-encoded.
+        lazy_imports: Import each tool module on its first call instead of at startup.
+        precomputed_schemas: Register tools against schemas generated now, not introspected at startup.
+        async_tools: Generate async tools whose services call the API with httpx.AsyncClient.
+        api: Optional JSON string — settings for the shared API client, as for
+             scaffold_server. The base URL defaults to the spec's.
+        structured_output: Return tool results as structured JSON objects, as for scaffold_server.
+        metrics: Count and time every tool call, as for scaffold_server.
+        max_workers: Processes used to render tools (0 = one per CPU, 1 = in-process).
+
+    Returns:
+        JSON string with the scaffold result, what was taken from the spec,
+        and next steps.
+    """
+    try:
+        api_block = json.loads(api) if api else {}
+    except json.JSONDecodeError as e:
+        return json.dumps({"success": False, "error": f"Invalid JSON: {e}"})
+
+    path = Path(spec_path)
+    if not path.is_file():
+        return json.dumps({
+            "success": False,
+            "error": f"Spec not found: {path}",
+        })
+
+    try:
+        spec = load_openapi_tools(path, include_deprecated=include_deprecated)
+    except (OpenAPIError, UnicodeDecodeError) as e:
+        return json.dumps({"success": False, "error": f"Could not read {path.name}: {e}"})
+
+    if not spec.tools:
+        return json.dumps({
+            "success": False,
+            "error": f"No usable operations found in {path.name}.",
+            "skipped": spec.skipped[:_MAX_SKIPPED_SHOWN],
+        }, indent=2)
+
+    result = json.loads(scaffold_tool_defs(
+        package_name,
+        description or spec.description or spec.title,
+        spec.tools,
+        output_dir=output_dir,
+        env_vars=spec.env_vars,
+        paid=paid,
+        hosting=hosting,
+        dry_run=dry_run,
+        output_format=output_format,
+        archive_inline=archive_inline,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools,
+        api={"base_url": spec.base_url, **api_block} if isinstance(api_block, dict) else api_block,
+        structured_output=structured_output,
+        metrics=metrics,
+        max_workers=max_workers,
+    ))
+    result["openapi"] = {
+        "title": spec.title,
+        "base_url": spec.base_url,
+        "operations": spec.operations,
+        "tools": len(spec.tools),
+        "skipped": len(spec.skipped),
+        "skipped_operations": spec.skipped[:_MAX_SKIPPED_SHOWN],
+    }
+
+    if result.get("success") and not dry_run:
+        result["next_steps"] = [
+            step for step in result["next_steps"]
+            if not step.startswith("Open the services/ folder")
+        ]
+        result["next_steps"].insert(
+            2,
+            f"Services call the API directly. Set API_BASE_URL to override {spec.base_url}"
+            + (", and set the API credentials listed in .env.example." if len(spec.env_vars) > 1 else "."),
+        )
+
+    return json.dumps(result, indent=2)
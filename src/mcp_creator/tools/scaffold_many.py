@@ -0,0 +1,232 @@
+"""Scaffold many MCP server projects in parallel from a JSONL manifest."""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterator
+
+from mcp_creator.tools.scaffold_server import scaffold_server
+
+# scaffold_server takes these as JSON strings; in a manifest line they may
+# also be given as plain JSON values.
+_JSON_ARGS = ("tools", "env_vars", "paid_tools", "api")
+_SCAFFOLD_ARGS = frozenset(inspect.signature(scaffold_server).parameters)
+
+# Keep at most this many jobs in flight per worker, so the manifest is read
+# as the pool drains it rather than loaded whole.
+_IN_FLIGHT_PER_WORKER = 2
+
+
+def _load_jobs(manifest_path: Path, output_dir: str) -> Iterator[tuple[int, dict | str]]:
+    """Yield (line_number, scaffold_server kwargs) per manifest line, or (line_number, error)."""
+    seen: set[Path] = set()
+    with manifest_path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                args = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(args, dict):
+                yield line_no, "Each line must be a JSON object of scaffold_server arguments."
+                continue
+            unknown = sorted(set(args) - _SCAFFOLD_ARGS)
+            if unknown:
+                yield line_no, f"Unknown scaffold_server arguments: {', '.join(unknown)}."
+                continue
+            missing = [k for k in ("package_name", "description", "tools") if k not in args]
+            if missing:
+                yield line_no, f"Missing required arguments: {', '.join(missing)}."
+                continue
+
+            for key in _JSON_ARGS:
+                if args.get(key) is not None and not isinstance(args[key], str):
+                    args[key] = json.dumps(args[key])
+            args.setdefault("output_dir", output_dir)
+
+            target = Path(args["output_dir"]).resolve() / str(args["package_name"])
+            if target in seen:
+                yield line_no, f"Another line already scaffolds into {target}."
+                continue
+            seen.add(target)
+            yield line_no, args
+
+
+def _scaffold_one(line_no: int, args: dict) -> dict:
+    """Run scaffold_server for one manifest line. Runs in a worker process."""
+    try:
+        result = json.loads(scaffold_server(**args))
+    except Exception as e:  # one bad line must not sink the whole batch
+        result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+    summary = {
+        "line": line_no,
+        "package_name": args["package_name"],
+        "success": result.get("success", False),
+    }
+    for key in ("project_dir", "archive_path", "files_created", "error", "errors"):
+        if key in result:
+            summary[key] = result[key]
+    return summary
+
+
+def _line_error(line_no: int, error: str) -> dict:
+    return {"line": line_no, "package_name": None, "success": False, "error": error}
+
+
+def _drain(
+    pool: Executor,
+    jobs: Iterator[tuple[int, dict | str]],
+    limit: int,
+    emit: Callable[[dict], None],
+) -> None:
+    """Submit jobs with at most `limit` in flight, emitting results as they complete."""
+    pending: set[Future] = set()
+
+    def _collect(block: bool) -> None:
+        nonlocal pending
+        if not pending:
+            return
+        done, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            emit(future.result())
+
+    for line_no, args in jobs:
+        if not isinstance(args, dict):
+            emit(_line_error(line_no, args))
+            continue
+        while len(pending) >= limit:
+            _collect(block=True)
+        pending.add(pool.submit(_scaffold_one, line_no, args))
+        _collect(block=False)
+
+    while pending:
+        _collect(block=True)
+
+
+def run_scaffold_many(
+    manifest_path: str | Path,
+    *,
+    output_dir: str = ".",
+    max_workers: int = 0,
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """Scaffold every project in a JSONL manifest and return a throughput summary.
+
+    Args:
+        manifest_path: Path to a JSONL file, one scaffold_server argument set per line.
+        output_dir: Default output_dir for lines that don't set their own.
+        max_workers: Worker processes; 0 means one per CPU, 1 runs everything in-process.
+        on_result: Called with each project's result as soon as it finishes.
+
+    Returns:
+        Dict with project counts, elapsed time, and projects per second.
+    """
+    path = Path(manifest_path)
+    workers = max_workers or os.cpu_count() or 1
+    counts = {"projects": 0, "succeeded": 0, "failed": 0}
+
+    def _emit(result: dict) -> None:
+        counts["projects"] += 1
+        counts["succeeded" if result["success"] else "failed"] += 1
+        if on_result is not None:
+            on_result(result)
+
+    start = time.perf_counter()
+    jobs = _load_jobs(path, output_dir)
+
+    if workers == 1:
+        for line_no, args in jobs:
+            _emit(_scaffold_one(line_no, args) if isinstance(args, dict) else _line_error(line_no, args))
+    else:
+        # spawn, not fork: this may run inside the MCP server's event loop,
+        # and forking a process with live threads is unsafe.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            _drain(pool, jobs, workers * _IN_FLIGHT_PER_WORKER, _emit)
+
+    elapsed = time.perf_counter() - start
+    return {
+        **counts,
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "projects_per_second": round(counts["projects"] / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def scaffold_many(manifest_path: str, output_dir: str = ".", max_workers: int = 0) -> str:
+    """Scaffold many MCP server projects in parallel from a JSONL manifest.
+
+    Args:
+        manifest_path: Path to a JSONL file. Each line is a JSON object of
+                       scaffold_server arguments; tools, env_vars, and paid_tools
+                       may be given as JSON values or JSON strings.
+        output_dir: Default parent directory for lines that don't set output_dir.
+        max_workers: Number of worker processes (0 = one per CPU, 1 = in-process).
+
+    Returns:
+        JSON string with per-project results in completion order and a
+        throughput summary.
+    """
+    path = Path(manifest_path)
+    if not path.is_file():
+        return json.dumps({
+            "success": False,
+            "error": f"Manifest not found: {path}",
+        })
+
+    results: list[dict] = []
+    summary = run_scaffold_many(
+        path, output_dir=output_dir, max_workers=max_workers, on_result=results.append,
+    )
+
+    next_steps = [
+        f"Scaffolded {summary['succeeded']} of {summary['projects']} projects "
+        f"in {summary['elapsed_seconds']}s ({summary['projects_per_second']} projects/s).",
+    ]
+    if summary["failed"]:
+        next_steps.append("Fix the failed manifest lines and re-run with just those lines.")
+
+    return json.dumps({
+        "success": summary["failed"] == 0,
+        "summary": summary,
+        "results": results,
+        "next_steps": next_steps,
+    }, indent=2)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: stream one JSON result per line, then the summary."""
+    parser = argparse.ArgumentParser(
+        prog="mcp-creator-scaffold-many",
+        description="Scaffold many MCP server projects in parallel from a JSONL manifest.",
+    )
+    parser.add_argument("manifest", help="JSONL file, one scaffold_server argument set per line")
+    parser.add_argument("-o", "--output-dir", default=".", help="default parent directory for projects")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+
+    if not Path(args.manifest).is_file():
+        parser.error(f"manifest not found: {args.manifest}")
+
+    def _print(result: dict) -> None:
+        print(json.dumps(result), flush=True)
+
+    summary = run_scaffold_many(
+        args.manifest, output_dir=args.output_dir, max_workers=args.workers, on_result=_print,
+    )
+    print(json.dumps({"summary": summary}), flush=True)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
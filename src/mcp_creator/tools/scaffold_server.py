@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+import base64
 import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from mcp_creator.services import codegen, file_writer
+from mcp_creator.services import archive, codegen, file_writer, manifest, tool_spec, validation
+
+# Below this many tools a process pool costs more to start than it saves.
+PARALLEL_MIN_TOOLS = 200
+# Tools rendered per worker task, and tasks kept in flight per worker.
+_CHUNK_SIZE = 64
+_IN_FLIGHT_PER_WORKER = 2
 
 
 def scaffold_server(
@@ -17,6 +29,15 @@ def scaffold_server(
     paid: bool = False,
     paid_tools: str | None = None,
     hosting: str = "local",
+    dry_run: bool = False,
+    output_format: str = "directory",
+    archive_inline: bool = False,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: str | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
 ) -> str:
     """Scaffold a complete, runnable MCP server project.
 
@@ -34,70 +55,149 @@ def scaffold_server(
         paid: If true, add license key gating via mcp-marketplace-license SDK.
         paid_tools: Optional JSON string — list of tool names to gate behind license.
                     If omitted and paid=true, all tools are gated.
-        hosting: "local" (default, stdio) or "remote" (SSE/HTTP for hosted model).
+        hosting: "local" (default, stdio) or "remote" (stateless streamable HTTP
+                 at /mcp, served by WEB_CONCURRENCY uvicorn workers).
+        dry_run: If true, render into memory only and return a unified diff
+                 against what is on disk. Nothing is written.
+        output_format: "directory" (default) writes the project tree to output_dir.
+                       "zip" or "tar.gz" packs it into a single archive instead,
+                       written to output_dir/<package_name>.<ext>.
+        archive_inline: With an archive output_format, return the archive
+                        base64-encoded in the response instead of writing it.
+        lazy_imports: If true, server.py registers tools without importing
+                      them; each tool module is imported on its first call.
+        precomputed_schemas: If true, server.py registers tools against JSON
+                             schemas generated now instead of having FastMCP
+                             introspect every function at startup, and a
+                             startup benchmark is added under benchmarks/.
+        async_tools: If true, tools are generated as async def chains (server
+                     wrapper, tool, service, and test) unless a tool def sets
+                     "async": false. Tools can also opt in one at a time.
+        api: Optional JSON string — the upstream API every service calls
+             through one shared, pooled HTTP client (services/api_client.py):
+             {"base_url": "https://api.example.com", "auth_env": "API_TOKEN",
+              "auth_header": "Authorization", "auth_prefix": "Bearer ",
+              "timeout": 30, "connect_timeout": 5, "pool_size": 10}
+             Only base_url is required. A tool def's own "api" block may set
+             a per-request "timeout" for that tool.
+        structured_output: If true, tools return their results as JSON
+                           objects, sent once as MCP structured content with
+                           compact JSON text alongside, instead of as
+                           pretty-printed JSON strings. An output benchmark
+                           is added under benchmarks/.
+        metrics: If true, every tool call is counted and timed (calls, errors,
+                 a latency histogram per tool). Remote servers serve them at
+                 /metrics in the Prometheus text format; stdio servers write
+                 them to a JSON file every few seconds. An overhead benchmark
+                 is added under benchmarks/.
 
     Returns:
         JSON string with created files and next steps.
     """
-    tool_defs = json.loads(tools)
-    env_var_defs = json.loads(env_vars) if env_vars else None
-    paid_tool_list = json.loads(paid_tools) if paid_tools else None
-    module_name = codegen._to_module_name(package_name)
-
-    # Build file dict: relative_path -> content
-    files: dict[str, str] = {}
+    try:
+        tool_defs = json.loads(tools)
+        env_var_defs = json.loads(env_vars) if env_vars else None
+        paid_tool_list = json.loads(paid_tools) if paid_tools else None
+        api_block = json.loads(api) if api else None
+    except json.JSONDecodeError as e:
+        return json.dumps({"success": False, "error": f"Invalid JSON: {e}"})
 
-    # Root files
-    files["pyproject.toml"] = codegen.render_pyproject(package_name, description, paid=paid)
-    files[".gitignore"] = codegen.render_gitignore()
-    files["README.md"] = codegen.render_readme(
-        package_name, description, tool_defs, paid=paid, hosting=hosting,
+    return scaffold_tool_defs(
+        package_name,
+        description,
+        tool_defs,
+        output_dir=output_dir,
+        env_vars=env_var_defs,
+        paid=paid,
+        paid_tools=paid_tool_list,
+        hosting=hosting,
+        dry_run=dry_run,
+        output_format=output_format,
+        archive_inline=archive_inline,
+        lazy_imports=lazy_imports,
+        precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools,
+        api=api_block,
+        structured_output=structured_output,
+        metrics=metrics,
     )
 
-    env_content = codegen.render_env_example(env_var_defs, paid=paid, hosting=hosting)
-    if env_content:
-        files[".env.example"] = env_content
 
-    if hosting == "remote":
-        files["Dockerfile"] = codegen.render_dockerfile(package_name)
+def scaffold_tool_defs(
+    package_name: str,
+    description: str,
+    tool_defs: list[dict],
+    *,
+    output_dir: str = ".",
+    env_vars: list[dict] | None = None,
+    paid: bool = False,
+    paid_tools: list[str] | None = None,
+    hosting: str = "local",
+    dry_run: bool = False,
+    output_format: str = "directory",
+    archive_inline: bool = False,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: dict | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
+    max_workers: int = 1,
+) -> str:
+    """Scaffold a project from already-parsed tool defs; see scaffold_server.
 
-    # Source package
-    src = f"src/{module_name}"
-    files[f"{src}/__init__.py"] = codegen.render_init(package_name)
-    files[f"{src}/server.py"] = codegen.render_server(
-        package_name, tool_defs, paid=paid, paid_tools=paid_tool_list, hosting=hosting,
-    )
-    files[f"{src}/transport.py"] = codegen.render_transport(package_name)
+    max_workers > 1 (or 0, one per CPU) renders per-tool files in a process
+    pool once the project has enough tools to make that worthwhile.
+    """
+    if output_format != "directory" and output_format not in archive.ARCHIVE_FORMATS:
+        return json.dumps({
+            "success": False,
+            "error": f"Unknown output_format '{output_format}'. Use 'directory', 'zip', or 'tar.gz'.",
+        })
+    if dry_run and output_format != "directory":
+        return json.dumps({
+            "success": False,
+            "error": "dry_run previews changes to a directory; it can't be combined with an archive output_format.",
+        })
 
-    # Tools and services
-    files[f"{src}/tools/__init__.py"] = ""
-    files[f"{src}/services/__init__.py"] = ""
+    # Check the whole payload before rendering anything
+    errors = validation.validate_payload(tool_defs, env_vars, paid_tools, api)
+    if errors:
+        return json.dumps(validation.summarize(errors), indent=2)
 
-    for tool in tool_defs:
-        tool_name = tool["name"]
-        files[f"{src}/tools/{tool_name}.py"] = codegen.render_tool_module(
-            package_name, tool
-        )
-        files[f"{src}/services/{tool_name}_service.py"] = codegen.render_service_module(
-            tool
-        )
+    tool_defs = tool_spec.apply_async_default(tool_defs, async_tools)
+    module_name = codegen._to_module_name(package_name)
+    files = _iter_project_files(
+        package_name, description, tool_defs, env_vars,
+        paid=paid, paid_tools=paid_tools, hosting=hosting,
+        lazy_imports=lazy_imports, precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools, api=api, structured_output=structured_output,
+        metrics=metrics, max_workers=max_workers,
+    )
+    counts = {
+        "tools": len(tool_defs),
+        "tool_modules": len(tool_defs),
+        "services": len(tool_defs),
+        "tests": 0,  # counted as the test modules go by
+    }
+    files = _counting_tests(files, counts)
 
-    # Tests
-    files["tests/test_server.py"] = codegen.render_test_server(package_name, tool_defs)
-    for tool in tool_defs:
-        files[f"tests/test_{tool['name']}.py"] = codegen.render_test_tool(
-            package_name, tool
+    if output_format in archive.ARCHIVE_FORMATS:
+        return _archive_result(
+            files, output_format, package_name, module_name, output_dir,
+            counts=counts, inline=archive_inline, paid=paid, hosting=hosting,
         )
 
-    # Write to disk
+    # Write to disk, one file at a time as it is rendered
     project_dir = Path(output_dir).resolve() / package_name
-    written = file_writer.write_project_files(project_dir, files)
+    fs = file_writer.VirtualFS(project_dir) if dry_run else None
+    written = file_writer.write_file_stream(project_dir, files, fs=fs)
 
     result = {
         "success": True,
         "project_dir": str(project_dir),
-        "files_created": len(written),
-        "file_list": sorted(files.keys()),
+        "files_created": written,
+        "file_counts": counts,
         "module_name": module_name,
         "paid": paid,
         "hosting": hosting,
@@ -119,4 +219,255 @@ def scaffold_server(
             "Remote hosting enabled. Use 'docker build' and 'docker run' to deploy."
         )
 
+    if fs is not None:
+        result["files_created"] = 0
+        result["dry_run"] = True
+        result["changes"] = fs.changes()
+        result["diff"] = fs.diff()
+        result["next_steps"] = [
+            "Dry run — nothing was written. Review the diff, then re-run without dry_run to apply.",
+        ]
+
+    return json.dumps(result, indent=2)
+
+
+def _counting_tests(
+    files: Iterable[tuple[str, file_writer.Content]], counts: dict[str, int],
+) -> Iterator[tuple[str, file_writer.Content]]:
+    """Pass the files through, adding each test module to counts["tests"]."""
+    for rel_path, content in files:
+        if rel_path.startswith("tests/test_") and rel_path.endswith(".py"):
+            counts["tests"] += 1
+        yield rel_path, content
+
+
+def _iter_project_files(
+    package_name: str,
+    description: str,
+    tool_defs: list[dict],
+    env_var_defs: list[dict] | None,
+    *,
+    paid: bool,
+    paid_tools: list[str] | None,
+    hosting: str,
+    lazy_imports: bool = False,
+    precomputed_schemas: bool = False,
+    async_tools: bool = False,
+    api: dict | None = None,
+    structured_output: bool = False,
+    metrics: bool = False,
+    max_workers: int = 1,
+) -> Iterator[tuple[str, file_writer.Content]]:
+    """Yield (relative_path, content) for every project file, rendering lazily.
+
+    Nothing is rendered until it is asked for, server.py and README.md are
+    produced piece by piece, and each tool is compiled only as it is reached,
+    so memory stays flat however many tools the project has.
+    """
+    module_name = codegen._to_module_name(package_name)
+    src = f"src/{module_name}"
+    api_spec = tool_spec.compile_api(api, tool_defs)
+    cache = tool_spec.uses_cache(tool_defs)
+    paginated = tool_spec.uses_pagination(tool_defs)
+    limits = hosting == "remote" or tool_spec.uses_limits(tool_defs)
+
+    # Root files
+    yield "pyproject.toml", codegen.render_pyproject(
+        package_name, description, paid=paid, http=api_spec is not None,
+        mcp_version=codegen.mcp_version(
+            hosting=hosting, limits=limits, metrics=metrics,
+            precomputed_schemas=precomputed_schemas, structured_output=structured_output,
+        ),
+    )
+    yield ".gitignore", codegen.render_gitignore()
+    yield "README.md", codegen.iter_readme(
+        package_name, description, tool_defs,
+        paid=paid, hosting=hosting, precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output, metrics=metrics,
+    )
+
+    env_content = codegen.render_env_example(
+        env_var_defs, paid=paid, hosting=hosting, api=api_spec, metrics=metrics,
+    )
+    if env_content:
+        yield ".env.example", env_content
+
+    if hosting == "remote":
+        yield "Dockerfile", codegen.render_dockerfile(package_name)
+        yield ".dockerignore", codegen.render_dockerignore()
+
+    # Source package
+    yield f"{src}/__init__.py", codegen.render_init(package_name)
+    yield f"{src}/lifecycle.py", codegen.render_lifecycle()
+    yield f"{src}/profiling.py", codegen.render_profiling(package_name)
+    if cache:
+        yield f"{src}/cache.py", codegen.render_cache(package_name)
+    if paginated:
+        yield f"{src}/pagination.py", codegen.render_pagination()
+    if tool_spec.uses_batch(tool_defs):
+        yield f"{src}/batch.py", codegen.render_batch()
+    if limits:
+        yield f"{src}/limits.py", codegen.render_limits()
+    if metrics:
+        yield f"{src}/metrics.py", codegen.render_metrics(package_name)
+    yield f"{src}/server.py", codegen.iter_server(
+        package_name, tool_defs,
+        paid=paid, paid_tools=paid_tools, hosting=hosting,
+        lazy_imports=lazy_imports, precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output, metrics=metrics, api=api_spec,
+    )
+    yield f"{src}/transport.py", codegen.render_transport(package_name)
+
+    # Tools, services, and their tests
+    yield f"{src}/tools/__init__.py", ""
+    yield f"{src}/services/__init__.py", ""
+    if api_spec is not None:
+        yield f"{src}/services/api_client.py", codegen.render_api_client(api_spec)
+
+    service_hashes: dict[str, str] = {}
+    tool_files_iter = _iter_tool_files(package_name, tool_defs, api_spec, structured_output, max_workers)
+    for name, tool_files, service_hash in tool_files_iter:
+        service_hashes[name] = service_hash
+        yield from tool_files
+
+    yield "tests/test_server.py", codegen.render_test_server(
+        package_name, tool_defs,
+        lazy_imports=lazy_imports, precomputed_schemas=precomputed_schemas,
+        structured_output=structured_output, paid=paid,
+    )
+    yield "tests/conftest.py", codegen.render_conftest(package_name, paid=paid, api=api_spec, cache=cache)
+    if paid:
+        yield "tests/test_license.py", codegen.render_test_license(package_name)
+    if limits:
+        yield "tests/test_limits.py", codegen.render_test_limits(package_name, tool_defs)
+    if metrics:
+        yield "tests/test_metrics.py", codegen.render_test_metrics(package_name, hosting=hosting)
+    yield "benchmarks/bench_tools.py", codegen.render_bench_tools(package_name)
+    if hosting == "remote":
+        yield "tests/test_http.py", codegen.render_test_http(package_name, tool_defs)
+        yield "benchmarks/bench_http.py", codegen.render_bench_http(package_name, tool_defs)
+    if api_spec is not None:
+        yield "tests/test_api_client.py", codegen.render_test_api_client(package_name, api_spec)
+    if precomputed_schemas:
+        yield "benchmarks/bench_startup.py", codegen.render_bench_startup(package_name)
+    if structured_output:
+        yield "benchmarks/bench_output.py", codegen.render_bench_output(package_name)
+    if metrics:
+        yield "benchmarks/bench_metrics.py", codegen.render_bench_metrics(package_name)
+
+    # Manifest — lets add_tool and sync_project diff against what was generated
+    yield manifest.MANIFEST_FILE, manifest.iter_manifest(manifest.build_manifest(
+        package_name, tool_defs, service_hashes,
+        paid=paid, paid_tools=paid_tools, hosting=hosting,
+        lazy_imports=lazy_imports, precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools, api=api, structured_output=structured_output,
+        metrics=metrics,
+    ))
+
+
+def _render_tools(
+    package_name: str,
+    tools: list[dict],
+    api: tool_spec.ApiSpec | None = None,
+    structured: bool = False,
+) -> list[tuple[str, list[tuple[str, str]], str]]:
+    """Render each tool's module, service, and test.
+
+    Returns (tool_name, [(relative_path, content), ...], service_hash) per
+    tool. Runs in worker processes when rendering in parallel.
+    """
+    src = f"src/{codegen._to_module_name(package_name)}"
+    rendered = []
+    for tool in tools:
+        spec = codegen.compile_tool(tool)
+        service = codegen.render_service_module(package_name, spec, api=api)
+        tool_module = codegen.render_tool_module(package_name, spec, structured=structured)
+        test = codegen.render_test_tool(package_name, spec, structured=structured)
+        rendered.append((spec.name, [
+            (f"{src}/tools/{spec.name}.py", tool_module),
+            (f"{src}/services/{spec.name}_service.py", service),
+            (f"tests/test_{spec.name}.py", test),
+        ], manifest.content_hash(service)))
+    return rendered
+
+
+def _iter_tool_files(
+    package_name: str,
+    tool_defs: list[dict],
+    api: tool_spec.ApiSpec | None,
+    structured: bool,
+    max_workers: int,
+) -> Iterator[tuple[str, list[tuple[str, str]], str]]:
+    """Yield _render_tools results in tool order, in parallel for large projects."""
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(tool_defs) < PARALLEL_MIN_TOOLS:
+        for tool in tool_defs:
+            yield from _render_tools(package_name, [tool], api, structured)
+        return
+
+    # Keep a bounded window of chunks in flight and drain it in order, so
+    # output order is stable and finished chunks don't pile up in memory.
+    chunks = (tool_defs[i:i + _CHUNK_SIZE] for i in range(0, len(tool_defs), _CHUNK_SIZE))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        window: deque = deque()
+        for chunk in chunks:
+            window.append(pool.submit(_render_tools, package_name, chunk, api, structured))
+            if len(window) >= workers * _IN_FLIGHT_PER_WORKER:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+
+def _archive_result(
+    files: Iterable[tuple[str, file_writer.Content]],
+    output_format: str,
+    package_name: str,
+    module_name: str,
+    output_dir: str,
+    *,
+    counts: dict[str, int],
+    inline: bool,
+    paid: bool,
+    hosting: str,
+) -> str:
+    """Pack the rendered files into a single archive and describe it."""
+    written = 0
+
+    def _counted() -> Iterator[tuple[str, file_writer.Content]]:
+        nonlocal written
+        for item in files:
+            written += 1
+            yield item
+
+    result = {
+        "success": True,
+        "output_format": output_format,
+        "file_counts": counts,
+        "module_name": module_name,
+        "paid": paid,
+        "hosting": hosting,
+    }
+
+    if inline:
+        data = archive.write_archive(_counted(), output_format, root=package_name)
+        result["archive_base64"] = base64.b64encode(data).decode("ascii")
+        result["archive_size"] = len(data)
+        location = "the archive_base64 field"
+    else:
+        archive_path = Path(output_dir).resolve() / (package_name + archive.archive_suffix(output_format))
+        archive.write_archive(_counted(), output_format, root=package_name, dest=archive_path)
+        result["archive_path"] = str(archive_path)
+        result["archive_size"] = archive_path.stat().st_size
+        location = str(archive_path)
+    result["files_created"] = written
+
+    extract = "unzip" if output_format == "zip" else "tar -xzf"
+    result["next_steps"] = [
+        f"Project packed into {location} ({written} files under {package_name}/).",
+        f"Extract it with '{extract}' on the target machine, then follow the usual setup:",
+        f"cd {package_name} && uv venv .venv && source .venv/bin/activate && uv pip install -e '.[dev]'",
+        "Run 'pytest -v' to verify everything works.",
+    ]
+
     return json.dumps(result, indent=2)
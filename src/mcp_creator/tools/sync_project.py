@@ -0,0 +1,264 @@
+"""Sync an existing scaffolded MCP server to a declarative tool manifest."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from mcp_creator.services import codegen, file_writer, manifest, server_patch, tool_spec, validation
+from mcp_creator.tools.add_tool import support_files
+
+
+def sync_project(project_dir: str, tools: str, dry_run: bool = False) -> str:
+    """Bring a scaffolded project in line with the full desired tool list.
+
+    Diffs the desired tool defs against the project's current tool set and
+    regenerates only what changed: tool modules, tests, and the per-tool
+    import and registration fragments in server.py. Service stubs are only
+    rewritten while they still match what codegen generated — once a user
+    edits a service, sync never touches it.
+
+    Args:
+        project_dir: Absolute path to the project root.
+        tools: JSON string — the complete list of tool defs, same format as
+               scaffold_server's tools argument.
+        dry_run: If true, render into memory only and return a unified diff
+                 against what is on disk. Nothing is written or deleted.
+
+    Returns:
+        JSON string with added/changed/removed tools, files written, and next steps.
+    """
+    try:
+        tool_defs = json.loads(tools)
+    except json.JSONDecodeError as e:
+        return json.dumps({"success": False, "error": f"Invalid JSON: {e}"})
+    errors = validation.validate_tools(tool_defs)
+    if errors:
+        return json.dumps(validation.summarize(errors), indent=2)
+    project = Path(project_dir).resolve()
+
+    src_dir = project / "src"
+    if not src_dir.exists():
+        return json.dumps({
+            "success": False,
+            "error": f"No src/ directory found at {project}. Is this a scaffolded MCP project?",
+        })
+
+    module_dirs = [d for d in src_dir.iterdir() if d.is_dir() and not d.name.startswith("_")]
+    if not module_dirs:
+        return json.dumps({
+            "success": False,
+            "error": "No module directory found under src/.",
+        })
+
+    module_name = module_dirs[0].name
+    src = f"src/{module_name}"
+    server_file = f"{src}/server.py"
+    server_path = project / server_file
+    if not server_path.exists():
+        return json.dumps({
+            "success": False,
+            "error": f"No server.py found at {server_path}.",
+        })
+    server_text = server_path.read_text(encoding="utf-8")
+
+    # Current state: from the manifest when present, else from server.py itself
+    current = manifest.load_manifest(project)
+    if current is not None:
+        package_name = current["package_name"]
+        paid = bool(current.get("paid"))
+        paid_tools = current.get("paid_tools")
+        hosting = current.get("hosting", "local")
+        lazy_imports = bool(current.get("lazy_imports"))
+        precomputed_schemas = bool(current.get("precomputed_schemas"))
+        async_tools = bool(current.get("async_tools"))
+        structured_output = bool(current.get("structured_output"))
+        metrics = bool(current.get("metrics"))
+        api = current.get("api")
+        previous = {t["name"]: tool_spec.fingerprint(t) for t in current["tools"]}
+        service_hashes = dict(current.get("service_hashes", {}))
+    else:
+        package_name = module_name.replace("_", "-")
+        paid = "def _require_license(" in server_text
+        paid_tools = sorted(server_patch.gated_tools(server_text)) or None
+        hosting = "remote" if (project / "Dockerfile").exists() else "local"
+        lazy_imports = "def _load_tool(" in server_text
+        precomputed_schemas = "def _schema_tool(" in server_text
+        async_tools = False
+        structured_output = "def _structured_result(" in server_text
+        metrics = "metrics.install(mcp" in server_text
+        api = None
+        # Without a manifest there is nothing to diff against: every existing
+        # tool is treated as changed and every existing service as user-owned.
+        previous = {name: None for name in server_patch.list_tools(server_text)}
+        service_hashes = {}
+
+    tool_defs = tool_spec.apply_async_default(tool_defs, async_tools)
+    try:
+        specs = codegen.compile_tools(tool_defs)
+    except ValueError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    desired = {spec.name: spec for spec in specs}
+    api_spec = tool_spec.compile_api(api, specs)
+    added = [name for name in desired if name not in previous]
+    removed = [name for name in previous if name not in desired]
+    changed = [
+        name for name in desired
+        if name in previous and previous[name] != desired[name].fingerprint
+    ]
+    unchanged = len(desired) - len(added) - len(changed)
+
+    files_to_write: dict[str, str] = {}
+    services_preserved: list[str] = []
+
+    def _stage(rel_path: str, content: str) -> None:
+        """Queue a write only if it would change the file on disk."""
+        path = project / rel_path
+        if not path.exists() or path.read_text(encoding="utf-8") != content:
+            files_to_write[rel_path] = content
+
+    def _service_is_generated(rel_path: str, tool_name: str) -> bool:
+        """True if the service on disk is still exactly what codegen produced."""
+        path = project / rel_path
+        if not path.exists():
+            return True
+        recorded = service_hashes.get(tool_name)
+        return recorded is not None and manifest.content_hash(
+            path.read_text(encoding="utf-8")
+        ) == recorded
+
+    gated = set(paid_tools or [])
+    imports: dict[str, str] = {}
+    registrations: dict[str, str] = {}
+
+    old_tools = current["tools"] if current is not None else []
+    if added or changed or removed:
+        # Projects scaffolded before service lifecycles lack the module tools now use
+        if not (project / f"{src}/lifecycle.py").exists():
+            _stage(f"{src}/lifecycle.py", codegen.render_lifecycle())
+        for rel_path, content in support_files(
+            project, package_name, old_tools, tool_defs, paid=paid, api=api,
+        ).items():
+            _stage(rel_path, content)
+
+    for name in added + changed:
+        spec = desired[name]
+        _stage(f"{src}/tools/{name}.py", codegen.render_tool_module(
+            package_name, spec, structured=structured_output,
+        ))
+        _stage(f"tests/test_{name}.py", codegen.render_test_tool(
+            package_name, spec, structured=structured_output,
+        ))
+
+        service_file = f"{src}/services/{name}_service.py"
+        if _service_is_generated(service_file, name):
+            service_content = codegen.render_service_module(package_name, spec, api=api_spec)
+            _stage(service_file, service_content)
+            service_hashes[name] = manifest.content_hash(service_content)
+        else:
+            services_preserved.append(service_file)
+
+        is_gated = paid and (not gated or name in gated)
+        if not lazy_imports:
+            imports[name] = codegen.render_add_tool_import(package_name, name)
+        registrations[name] = codegen.render_tool_registration(
+            spec, gated=is_gated, lazy=lazy_imports, schemas=precomputed_schemas,
+            structured=structured_output,
+        )
+
+    files_to_delete: list[str] = []
+    for name in removed:
+        files_to_delete += [f"{src}/tools/{name}.py", f"tests/test_{name}.py"]
+        service_file = f"{src}/services/{name}_service.py"
+        if _service_is_generated(service_file, name):
+            files_to_delete.append(service_file)
+        else:
+            services_preserved.append(service_file)
+        service_hashes.pop(name, None)
+
+    batch_import = codegen.render_batch_import(package_name)
+    if any(desired[name].batch for name in added + changed) and batch_import not in server_text:
+        imports["register_batch"] = batch_import
+    limits_import = codegen.render_limits_import(package_name)
+    if any(desired[name].limits is not None for name in added + changed) and limits_import not in server_text:
+        imports["limits"] = limits_import
+
+    # Once the last tool needing them is gone, so are their imports. Remote
+    # servers install limits themselves and keep limits.py and its tests.
+    dropped_imports = set()
+    if not tool_spec.uses_batch(tool_defs):
+        dropped_imports.add(batch_import)
+    if hosting != "remote" and not tool_spec.uses_limits(tool_defs):
+        dropped_imports.add(limits_import)
+        files_to_write.pop("tests/test_limits.py", None)
+        test_limits = project / "tests/test_limits.py"
+        if tool_spec.uses_limits(old_tools) and test_limits.exists() and test_limits.read_text(encoding="utf-8") == codegen.render_test_limits(
+            package_name, old_tools,
+        ):
+            files_to_delete.append("tests/test_limits.py")
+
+    if added or changed or removed:
+        patched = server_patch.patch_server(
+            server_text,
+            imports=imports,
+            registrations=registrations,
+            removed=set(removed),
+            dropped_imports=dropped_imports,
+        )
+        if patched is None:
+            return json.dumps({
+                "success": False,
+                "error": f"Sentinel comments missing from {server_file}; cannot sync safely.",
+            })
+        _stage(server_file, patched)
+
+    if added or removed:
+        _stage("tests/test_server.py", codegen.render_test_server(
+            package_name, specs,
+            lazy_imports=lazy_imports, precomputed_schemas=precomputed_schemas,
+            structured_output=structured_output, paid=paid,
+        ))
+
+    _stage(manifest.MANIFEST_FILE, manifest.render_manifest(manifest.build_manifest(
+        package_name, tool_defs, service_hashes,
+        paid=paid, paid_tools=paid_tools, hosting=hosting,
+        lazy_imports=lazy_imports, precomputed_schemas=precomputed_schemas,
+        async_tools=async_tools, api=api, structured_output=structured_output,
+        metrics=metrics,
+    )))
+
+    fs = file_writer.VirtualFS(project) if dry_run else None
+    file_writer.write_project_files(project, files_to_write, fs=fs)
+    deleted = file_writer.remove_project_files(project, files_to_delete, fs=fs)
+
+    next_steps = [
+        f"Synced: {len(added)} added, {len(changed)} changed, "
+        f"{len(removed)} removed, {unchanged} unchanged.",
+    ]
+    if services_preserved:
+        next_steps.append(
+            "Some services were edited by hand and left untouched — update their "
+            "execute() signatures to match the new tool definitions."
+        )
+    next_steps.append("Run 'pytest -v' to verify everything works.")
+
+    result = {
+        "success": True,
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": unchanged,
+        "files_written": sorted(files_to_write),
+        "files_deleted": [str(Path(p).relative_to(project)) for p in deleted],
+        "services_preserved": services_preserved,
+        "next_steps": next_steps,
+    }
+
+    if fs is not None:
+        result["dry_run"] = True
+        result["diff"] = fs.diff()
+        result["next_steps"] = [
+            "Dry run — nothing was written. Review the diff, then re-run without dry_run to apply.",
+        ]
+
+    return json.dumps(result, indent=2)
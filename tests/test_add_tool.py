@@ -70,6 +70,187 @@ def test_add_tool_updates_server():
         assert "get_forecast" in server_content
 
 
+def test_add_tool_adds_lifecycle_module_to_older_projects():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        lifecycle = Path(scaffold_result["project_dir"]) / "src/test_add_mcp/lifecycle.py"
+        lifecycle.unlink()
+
+        result = json.loads(add_tool(project_dir=scaffold_result["project_dir"], tool=NEW_TOOL))
+        assert result["success"] is True
+        assert "src/test_add_mcp/lifecycle.py" in result["files_created"]
+        assert "def get_service(" in lifecycle.read_text()
+
+
+def test_add_tool_http_tool_brings_shared_api_client():
+    http_tool = {
+        "name": "get_alerts",
+        "parameters": [{"name": "city", "type": "string", "required": True}],
+        "http": {"method": "GET", "path": "/alerts", "base_url": "https://weather.example.com"},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project = Path(scaffold_result["project_dir"])
+        assert not (project / "src/test_add_mcp/services/api_client.py").exists()
+
+        result = json.loads(add_tool(project_dir=str(project), tool=json.dumps(http_tool)))
+        assert result["success"] is True
+        assert "src/test_add_mcp/services/api_client.py" in result["files_created"]
+        client = (project / "src/test_add_mcp/services/api_client.py").read_text()
+        assert '"https://weather.example.com"' in client
+        assert "def api_server(" in (project / "tests/conftest.py").read_text()
+
+
+def test_add_tool_cached_tool_brings_cache_module():
+    cached_tool = {**json.loads(NEW_TOOL), "cache": {"ttl": 60, "key": ["city"]}}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project = Path(scaffold_result["project_dir"])
+        assert not (project / "src/test_add_mcp/cache.py").exists()
+
+        result = json.loads(add_tool(project_dir=str(project), tool=json.dumps(cached_tool)))
+        assert result["success"] is True
+        assert "src/test_add_mcp/cache.py" in result["files_created"]
+        tool_module = (project / "src/test_add_mcp/tools/get_forecast.py").read_text()
+        assert '_cache = ResultCache("get_forecast", ttl=60, max_entries=128)' in tool_module
+        assert "MCP_CACHE_DIR" in (project / "tests/conftest.py").read_text()
+
+
+def test_add_tool_paginated_tool_brings_pagination_module():
+    paginated_tool = {**json.loads(NEW_TOOL), "paginated": True}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project = Path(scaffold_result["project_dir"])
+
+        result = json.loads(add_tool(project_dir=str(project), tool=json.dumps(paginated_tool)))
+        assert result["success"] is True
+        assert "src/test_add_mcp/pagination.py" in result["files_created"]
+        server_py = (project / "src/test_add_mcp/server.py").read_text()
+        assert "return _get_forecast_impl(city, days, cursor, page_size)" in server_py
+
+
+def test_add_tool_batch_tool_brings_batch_module():
+    batch_tool = {**json.loads(NEW_TOOL), "batch": True}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project = Path(scaffold_result["project_dir"])
+
+        result = json.loads(add_tool(project_dir=str(project), tool=json.dumps(batch_tool)))
+        assert result["success"] is True
+        assert result["server_updated"] is True
+        assert "src/test_add_mcp/batch.py" in result["files_created"]
+        server_py = (project / "src/test_add_mcp/server.py").read_text()
+        assert server_py.count("from test_add_mcp.batch import register_batch") == 1
+        assert "register_batch(mcp, get_forecast)" in server_py
+
+
+def test_add_tool_limited_tool_brings_limits_module():
+    limited_tool = {**json.loads(NEW_TOOL), "limits": {"concurrency": 2}}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project = Path(scaffold_result["project_dir"])
+
+        result = json.loads(add_tool(project_dir=str(project), tool=json.dumps(limited_tool)))
+        assert result["success"] is True
+        assert "src/test_add_mcp/limits.py" in result["files_created"]
+        assert "tests/test_limits.py" in result["files_created"]
+        server_py = (project / "src/test_add_mcp/server.py").read_text()
+        assert "from test_add_mcp import limits\n" in server_py
+        assert 'limits.configure(mcp, "get_forecast", concurrency=2)' in server_py
+        assert 'tool_limit("get_forecast").concurrency == 2' in (project / "tests/test_limits.py").read_text()
+        assert '"mcp[cli]>=1.10.0"' in (project / "pyproject.toml").read_text()
+
+
+def test_add_tool_respects_lazy_imports():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+            lazy_imports=True,
+        ))
+        project_dir = scaffold_result["project_dir"]
+
+        result = json.loads(add_tool(project_dir=project_dir, tool=NEW_TOOL))
+        assert result["server_updated"] is True
+
+        server_content = (Path(project_dir) / "src" / "test_add_mcp" / "server.py").read_text()
+        assert "_get_forecast_impl" not in server_content
+        assert 'return _load_tool("get_forecast")(city, days)' in server_content
+
+
+def test_add_tool_follows_async_default():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+            async_tools=True,
+        ))
+        project = Path(scaffold_result["project_dir"])
+
+        result = json.loads(add_tool(project_dir=str(project), tool=NEW_TOOL))
+        assert result["success"] is True
+
+        src = project / "src" / "test_add_mcp"
+        assert "async def get_forecast(" in (src / "server.py").read_text()
+        assert "async def execute(" in (src / "services" / "get_forecast_service.py").read_text()
+        recorded = json.loads((project / ".mcp-creator.json").read_text())["tools"]
+        assert [t["async"] for t in recorded] == [True, True]
+
+
 def test_add_tool_bad_dir():
     result = json.loads(add_tool(project_dir="/nonexistent/path", tool=NEW_TOOL))
     assert result["success"] is False
+
+
+def test_add_tool_dry_run():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_result = json.loads(scaffold_server(
+            package_name="test-add-mcp",
+            description="Test",
+            tools=INITIAL_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project_dir = Path(scaffold_result["project_dir"])
+        server_before = (project_dir / "src" / "test_add_mcp" / "server.py").read_text()
+
+        result = json.loads(add_tool(project_dir=str(project_dir), tool=NEW_TOOL, dry_run=True))
+
+        assert result["dry_run"] is True
+        assert "src/test_add_mcp/server.py" in result["changes"]["modified"]
+        assert "+from test_add_mcp.tools.get_forecast import get_forecast" in result["diff"]
+        assert not (project_dir / "src" / "test_add_mcp" / "tools" / "get_forecast.py").exists()
+        assert (project_dir / "src" / "test_add_mcp" / "server.py").read_text() == server_before
@@ -1,6 +1,12 @@
 """Test codegen service — pure function output validation."""
 
 from mcp_creator.services.codegen import (
+    iter_readme,
+    iter_server,
+    mcp_version,
+    raise_mcp_requirement,
+    render_dockerfile,
+    render_dockerignore,
     render_pyproject,
     render_server,
     render_tool_module,
@@ -10,7 +16,6 @@ from mcp_creator.services.codegen import (
     render_test_server,
     render_test_tool,
     _to_module_name,
-    _to_class_name,
 )
 
 
@@ -39,16 +44,57 @@ def test_to_module_name():
     assert _to_module_name("simple") == "simple"
 
 
-def test_to_class_name():
-    assert _to_class_name("get_weather") == "GetWeather"
-    assert _to_class_name("fetch_data") == "FetchData"
-
-
 def test_render_pyproject():
     result = render_pyproject("my-weather-mcp", "A weather server")
     assert 'name = "my-weather-mcp"' in result
     assert "my_weather_mcp.server:main" in result
     assert "hatchling" in result
+    assert '"mcp[cli]>=1.0.0"' in result
+
+
+def test_mcp_version_follows_features():
+    assert mcp_version() == "1.0.0"
+    assert mcp_version(hosting="remote") == "1.8.0"
+    assert mcp_version(hosting="remote", limits=True) == "1.10.0"
+    assert mcp_version(structured_output=True) == "1.10.0"
+    assert mcp_version(precomputed_schemas=True) == "1.10.0"
+    assert mcp_version(metrics=True) == "1.10.0"
+    assert '"mcp[cli]>=1.10.0"' in render_pyproject("my-weather-mcp", "A weather server", mcp_version="1.10.0")
+
+
+def test_raise_mcp_requirement_only_raises():
+    pyproject = render_pyproject("my-weather-mcp", "A weather server")
+    assert '"mcp[cli]>=1.10.0"' in raise_mcp_requirement(pyproject, "1.10.0")
+    newer = pyproject.replace(">=1.0.0", ">=1.12.0")
+    assert raise_mcp_requirement(newer, "1.10.0") == newer
+
+
+def test_render_dockerfile_caches_dependencies_and_runs_as_non_root():
+    result = render_dockerfile("my-weather-mcp")
+    lines = result.splitlines()
+    stages = [i for i, line in enumerate(lines) if line.startswith("FROM ")]
+    assert len(stages) == 2 and lines[stages[0]].endswith(" AS build")
+
+    # Dependencies install from pyproject.toml alone, before any source is copied
+    copies = [line for line in lines if line.startswith("COPY ")]
+    assert copies[0] == "COPY pyproject.toml ./"
+    deps = next(i for i, line in enumerate(lines) if "pip install -r requirements.txt" in line)
+    assert deps < lines.index("COPY src ./src")
+    assert "COPY . ." not in lines
+    assert "--no-deps ." in result
+    assert "compileall" in result
+
+    # The runtime stage copies the virtualenv only and drops root
+    runtime = lines[stages[1]:]
+    assert [line for line in runtime if line.startswith("COPY ")] == ["COPY --from=build /opt/venv /opt/venv"]
+    assert "USER mcp" in runtime
+    assert runtime[-1] == 'CMD ["my-weather-mcp"]'
+
+
+def test_render_dockerignore_admits_only_what_the_dockerfile_copies():
+    patterns = [line for line in render_dockerignore().splitlines() if line and not line.startswith("#")]
+    assert patterns[0] == "*"
+    assert {p for p in patterns if p.startswith("!")} == {"!pyproject.toml", "!README.md", "!src/"}
 
 
 def test_render_server_has_sentinels():
@@ -61,6 +107,17 @@ def test_render_server_has_sentinels():
     assert "get_weather" in result
 
 
+def test_iter_server_matches_render_server():
+    tools = [SAMPLE_TOOL, SAMPLE_TOOL_OPTIONAL]
+    for kwargs in ({}, {"paid": True, "paid_tools": ["get_forecast"]}, {"hosting": "remote"}):
+        assert "".join(iter_server("my-weather-mcp", tools, **kwargs)) == render_server(
+            "my-weather-mcp", tools, **kwargs
+        )
+    assert "".join(iter_readme("my-weather-mcp", "Weather", tools)) == render_readme(
+        "my-weather-mcp", "Weather", tools
+    )
+
+
 def test_render_server_optional_params():
     result = render_server("my-weather-mcp", [SAMPLE_TOOL_OPTIONAL])
     assert "days: int = 5" in result
@@ -74,7 +131,7 @@ def test_render_tool_module():
 
 
 def test_render_service_module():
-    result = render_service_module(SAMPLE_TOOL)
+    result = render_service_module("my-weather-mcp", SAMPLE_TOOL)
     assert "class GetWeather:" in result
     assert "def execute(self" in result
     assert "TODO" in result
@@ -110,3 +167,17 @@ def test_render_test_tool():
     result = render_test_tool("my-weather-mcp", SAMPLE_TOOL)
     assert "def test_get_weather_returns_json" in result
     assert "json.loads" in result
+
+
+def test_async_tool_renders_async_chain():
+    tool = {**SAMPLE_TOOL, "async": True}
+    server = render_server("my-weather-mcp", [tool, SAMPLE_TOOL_OPTIONAL])
+    assert "async def get_weather(city: str) -> str:" in server
+    assert "return await _get_weather_impl(city)" in server
+    assert "\ndef get_forecast(" in server
+
+    assert "result = await service.execute(city=city)" in render_tool_module("my-weather-mcp", tool)
+    assert "async def execute(self, city: str)" in render_service_module("my-weather-mcp", tool)
+    test = render_test_tool("my-weather-mcp", tool)
+    assert "@pytest.mark.asyncio" in test
+    assert 'result = await get_weather(city="test")' in test
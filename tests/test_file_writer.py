@@ -0,0 +1,72 @@
+"""Test file_writer — disk writes and the in-memory VirtualFS overlay."""
+
+import tempfile
+from pathlib import Path
+
+from mcp_creator.services.file_writer import (
+    VirtualFS,
+    inject_after_sentinel,
+    remove_project_files,
+    write_file_stream,
+    write_project_files,
+)
+
+
+def test_virtual_fs_never_touches_disk():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fs = VirtualFS(tmpdir)
+        write_project_files(tmpdir, {"pkg/a.py": "x = 1\n"}, fs=fs)
+
+        assert not (Path(tmpdir) / "pkg").exists()
+        assert fs.exists(Path(tmpdir) / "pkg" / "a.py")
+        assert fs.read_text("pkg/a.py") == "x = 1\n"
+        assert fs.changes() == {"created": ["pkg/a.py"], "modified": [], "deleted": []}
+
+
+def test_virtual_fs_reads_fall_through_to_disk():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "server.py").write_text("# --- TOOLS ---\n# --- END TOOLS ---\n")
+        fs = VirtualFS(tmpdir)
+
+        ok = inject_after_sentinel(Path(tmpdir) / "server.py", "# --- TOOLS ---", "def f(): ...", fs=fs)
+
+        assert ok is True
+        assert (Path(tmpdir) / "server.py").read_text() == "# --- TOOLS ---\n# --- END TOOLS ---\n"
+        assert "def f(): ..." in fs.read_text("server.py")
+        assert fs.changes()["modified"] == ["server.py"]
+
+
+def test_virtual_fs_diff():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "keep.txt").write_text("same\n")
+        (Path(tmpdir) / "edit.txt").write_text("old\n")
+        (Path(tmpdir) / "gone.txt").write_text("bye\n")
+        fs = VirtualFS(tmpdir)
+
+        write_project_files(tmpdir, {"keep.txt": "same\n", "edit.txt": "new\n", "add.txt": "hi"}, fs=fs)
+        remove_project_files(tmpdir, ["gone.txt", "missing.txt"], fs=fs)
+        diff = fs.diff()
+
+        assert "keep.txt" not in diff
+        assert "--- a/edit.txt\n+++ b/edit.txt\n" in diff
+        assert "-old\n+new\n" in diff
+        assert "--- /dev/null\n+++ b/add.txt\n" in diff
+        assert "+hi\n\\ No newline at end of file\n" in diff
+        assert "--- a/gone.txt\n+++ /dev/null\n" in diff
+        assert (Path(tmpdir) / "gone.txt").exists()
+        assert fs.changes() == {"created": ["add.txt"], "modified": ["edit.txt"], "deleted": ["gone.txt"]}
+
+
+def test_virtual_fs_without_base_dir():
+    fs = VirtualFS("/nonexistent/project")
+    write_project_files("/nonexistent/project", {"a.txt": "a\n"}, fs=fs)
+    assert fs.read_text("a.txt") == "a\n"
+    assert not Path("/nonexistent/project").exists()
+
+
+def test_write_file_stream_accepts_pieces():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = iter([("a.txt", "one\n"), ("sub/b.txt", (line for line in ["x", "y\n"]))])
+        assert write_file_stream(tmpdir, files) == 2
+        assert (Path(tmpdir) / "a.txt").read_text() == "one\n"
+        assert (Path(tmpdir) / "sub" / "b.txt").read_text() == "xy\n"
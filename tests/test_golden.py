@@ -0,0 +1,122 @@
+"""Golden-file tests — codegen output must match the checked-in files byte for byte.
+
+To refresh the golden files after an intentional output change:
+
+    UPDATE_GOLDEN=1 pytest tests/test_golden.py
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from mcp_creator.services import codegen
+
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+TOOLS = [
+    {
+        "name": "get_weather",
+        "description": "Get current weather for a city",
+        "parameters": [
+            {"name": "city", "type": "string", "required": True, "description": "City name"},
+        ],
+        "returns": "Weather data as JSON",
+    },
+    {
+        "name": "get_forecast",
+        "description": "Get weather forecast",
+        "parameters": [
+            {"name": "city", "type": "string", "required": True, "description": "City name"},
+            {"name": "days", "type": "integer", "required": False, "default": 5},
+            {"name": "units", "type": "string", "required": False, "default": "metric"},
+            {"name": "region", "type": "string", "required": False},
+            {"name": "detailed", "type": "boolean", "required": False, "default": False},
+            {"name": "ratio", "type": "number", "required": True},
+            {"name": "tags", "type": "array", "required": False},
+        ],
+        "returns": "Forecast data as JSON",
+    },
+    {"name": "ping"},
+]
+
+ENV_VARS = [
+    {"name": "WEATHER_API_KEY", "description": "API key for weather service", "required": True},
+    {"name": "DEBUG", "description": "Verbose logging", "required": False},
+]
+
+SCENARIOS = {
+    "local": dict(env_vars=ENV_VARS),
+    "paid_local": dict(paid=True),
+    "remote": dict(hosting="remote"),
+    "paid_remote": dict(paid=True, paid_tools=["get_forecast"], hosting="remote", env_vars=ENV_VARS),
+}
+
+PACKAGE = "my-weather-mcp"
+DESCRIPTION = "A weather server"
+
+
+def _render_project(paid=False, paid_tools=None, hosting="local", env_vars=None):
+    """Render every generated file for a scenario, the same way scaffold_server does."""
+    src = f"src/{codegen._to_module_name(PACKAGE)}"
+    files = {
+        "pyproject.toml": codegen.render_pyproject(
+            PACKAGE, DESCRIPTION, paid=paid,
+            mcp_version=codegen.mcp_version(hosting=hosting, limits=hosting == "remote"),
+        ),
+        ".gitignore": codegen.render_gitignore(),
+        "README.md": codegen.render_readme(PACKAGE, DESCRIPTION, TOOLS, paid=paid, hosting=hosting),
+        f"{src}/__init__.py": codegen.render_init(PACKAGE),
+        f"{src}/lifecycle.py": codegen.render_lifecycle(),
+        f"{src}/profiling.py": codegen.render_profiling(PACKAGE),
+        f"{src}/server.py": codegen.render_server(
+            PACKAGE, TOOLS, paid=paid, paid_tools=paid_tools, hosting=hosting,
+        ),
+        f"{src}/transport.py": codegen.render_transport(PACKAGE),
+        "tests/test_server.py": codegen.render_test_server(PACKAGE, TOOLS),
+        "tests/conftest.py": codegen.render_conftest(PACKAGE, paid=paid),
+        "benchmarks/bench_tools.py": codegen.render_bench_tools(PACKAGE),
+        "add_tool/import.txt": codegen.render_add_tool_import(PACKAGE, "get_forecast") + "\n",
+        "add_tool/registration.txt": codegen.render_add_tool_registration(TOOLS[1], gated=paid) + "\n",
+    }
+    env = codegen.render_env_example(env_vars, paid=paid, hosting=hosting)
+    if env is not None:
+        files[".env.example"] = env
+    if hosting == "remote":
+        files["Dockerfile"] = codegen.render_dockerfile(PACKAGE)
+        files[".dockerignore"] = codegen.render_dockerignore()
+    if paid:
+        files["tests/test_license.py"] = codegen.render_test_license(PACKAGE)
+    for tool in TOOLS:
+        name = tool["name"]
+        files[f"{src}/tools/{name}.py"] = codegen.render_tool_module(PACKAGE, tool)
+        files[f"{src}/services/{name}_service.py"] = codegen.render_service_module(PACKAGE, tool)
+        files[f"tests/test_{name}.py"] = codegen.render_test_tool(PACKAGE, tool)
+    return files
+
+
+def _cases():
+    for scenario, kwargs in SCENARIOS.items():
+        for rel_path in sorted(_render_project(**kwargs)):
+            yield pytest.param(scenario, rel_path, id=f"{scenario}/{rel_path}")
+
+
+@pytest.mark.parametrize("scenario,rel_path", list(_cases()))
+def test_matches_golden(scenario, rel_path):
+    content = _render_project(**SCENARIOS[scenario])[rel_path]
+    golden = GOLDEN_DIR / scenario / (rel_path + ".golden")
+    if os.environ.get("UPDATE_GOLDEN"):
+        golden.parent.mkdir(parents=True, exist_ok=True)
+        golden.write_bytes(content.encode("utf-8"))
+    assert content.encode("utf-8") == golden.read_bytes()
+
+
+def test_no_stale_golden_files():
+    expected = {
+        f"{scenario}/{rel_path}.golden"
+        for scenario, kwargs in SCENARIOS.items()
+        for rel_path in _render_project(**kwargs)
+    }
+    on_disk = {p.relative_to(GOLDEN_DIR).as_posix() for p in GOLDEN_DIR.rglob("*.golden")}
+    assert on_disk == expected
@@ -0,0 +1,178 @@
+"""Test the OpenAPI reader — streaming parse into tool definitions."""
+
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from mcp_creator.services import validation
+from mcp_creator.services.openapi import OpenAPIError, load_openapi_tools
+
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Petstore", "description": 'A "sample" store\nfor pets'},
+    "servers": [{"url": "https://{env}.example.com/v1", "variables": {"env": {"default": "api"}}}],
+    "security": [{"bearer": []}],
+    "paths": {
+        "/pets": {
+            "get": {
+                "operationId": "listPets",
+                "summary": "List all pets",
+                "parameters": [
+                    {"name": "limit", "in": "query", "schema": {"type": "integer", "default": 20}},
+                    {"name": "X-Request-ID", "in": "header", "schema": {"type": "string"}},
+                    {"name": "Authorization", "in": "header", "schema": {"type": "string"}},
+                    {"$ref": "#/components/parameters/Tag"},
+                ],
+                "responses": {"200": {"description": "A list of pets"}},
+            },
+            "post": {
+                "operationId": "createPet",
+                "requestBody": {
+                    "required": True,
+                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/NewPet"}}},
+                },
+                "responses": {"201": {"description": "Created"}},
+            },
+        },
+        "/pets/{petId}": {
+            "parameters": [{"name": "petId", "in": "path", "required": True, "schema": {"type": "string"}}],
+            "get": {"summary": "Info for a pet", "responses": {"200": {"description": "Pet"}}},
+            "delete": {"operationId": "deletePet", "deprecated": True, "responses": {}},
+            "put": {
+                "operationId": "uploadPhoto",
+                "requestBody": {"content": {"multipart/form-data": {}}},
+                "responses": {},
+            },
+        },
+    },
+    "components": {
+        "parameters": {"Tag": {"name": "tag", "in": "query", "schema": {"type": "string"}}},
+        "schemas": {
+            "NewPet": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "class": {"type": "string"},
+                    "owner": {"$ref": "#/components/schemas/Owner"},
+                },
+            },
+            "Owner": {"allOf": [{"type": "object", "properties": {"id": {"type": "integer"}}}]},
+        },
+        "securitySchemes": {"bearer": {"type": "http", "scheme": "bearer"}},
+    },
+}
+
+
+def _write(tmpdir: str, spec, name: str = "spec.json", indent: int | None = 2) -> Path:
+    path = Path(tmpdir) / name
+    path.write_text(spec if isinstance(spec, str) else json.dumps(spec, indent=indent), encoding="utf-8")
+    return path
+
+
+def test_operations_become_tools():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec = load_openapi_tools(_write(tmpdir, SPEC))
+
+    assert spec.title == "Petstore"
+    assert spec.description == "A 'sample' store for pets"
+    assert spec.base_url == "https://api.example.com/v1"
+    assert spec.operations == 5
+    assert [t["name"] for t in spec.tools] == ["list_pets", "create_pet", "get_pets_by_pet_id"]
+    assert len(spec.skipped) == 2
+    assert [v["name"] for v in spec.env_vars] == ["API_BASE_URL", "API_TOKEN"]
+    assert validation.validate_payload(spec.tools, spec.env_vars) == []
+
+    list_pets, create_pet, get_pet = spec.tools
+    assert [p["name"] for p in list_pets["parameters"]] == ["limit", "x_request_id", "tag"]
+    assert list_pets["parameters"][0]["default"] == 20
+    assert list_pets["http"]["params"]["x_request_id"] == {"in": "header", "name": "X-Request-ID"}
+    assert list_pets["http"]["auth"]["env"] == "API_TOKEN"
+
+    assert create_pet["http"]["body"] == "fields"
+    assert [(p["name"], p["type"], p["required"]) for p in create_pet["parameters"]] == [
+        ("name", "string", True), ("class_", "string", False), ("owner", "object", False),
+    ]
+    assert get_pet["http"]["path"] == "/pets/{petId}"
+    assert get_pet["parameters"] == [{"name": "pet_id", "type": "string", "required": True}]
+
+
+def test_parameter_names_avoid_generated_names():
+    spec = {
+        "openapi": "3.0.0",
+        "paths": {"/files": {"get": {
+            "operationId": "listFiles",
+            "parameters": [
+                {"name": name, "in": "query", "schema": {"type": "string"}} for name in ("self", "os", "path")
+            ],
+        }}},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tool = load_openapi_tools(_write(tmpdir, spec)).tools[0]
+
+    assert [p["name"] for p in tool["parameters"]] == ["self_2", "os_2", "path"]
+    assert tool["http"]["params"]["os_2"] == {"in": "query", "name": "os"}
+    assert validation.validate_tools([tool]) == []
+
+
+def test_rejects_non_openapi_documents():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(OpenAPIError, match="Swagger"):
+            load_openapi_tools(_write(tmpdir, {"swagger": "2.0", "paths": {}}))
+        with pytest.raises(OpenAPIError, match="JSON"):
+            load_openapi_tools(_write(tmpdir, "openapi: 3.0.0\n", "spec.yaml"))
+        with pytest.raises(OpenAPIError):
+            load_openapi_tools(_write(tmpdir, '{"openapi": "3.0.0", "paths": {"/x": {'))
+
+
+def test_unused_components_are_never_decoded():
+    # A spec dominated by schemas no operation references: reading it should
+    # cost far less memory than decoding the whole document.
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Big"},
+        "paths": {f"/items{i}": {"get": {"operationId": f"getItem{i}"}} for i in range(50)},
+        "components": {"examples": {
+            f"Example{i}": {"value": {"rows": [{"id": n, "label": f"row {n}"} for n in range(40)]}}
+            for i in range(300)
+        }},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write(tmpdir, spec, indent=None)
+        tracemalloc.start()
+        try:
+            json.loads(path.read_text())
+            full = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            result = load_openapi_tools(path)
+            streamed = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert len(result.tools) == 50
+    assert streamed < full / 3
+
+
+def test_components_are_decoded_only_when_referenced():
+    # Unused is not valid JSON inside; decoding it would raise
+    spec = json.dumps({
+        "openapi": "3.0.3",
+        "info": {"title": "Lazy"},
+        "paths": {"/pets": {"get": {
+            "operationId": "listPets",
+            "parameters": [{"$ref": "#/components/parameters/Tag"}],
+        }}},
+        "components": {
+            "parameters": {"Tag": {"name": "tag", "in": "query", "schema": {"$ref": "#/components/schemas/Tag"}}},
+            "schemas": {"Tag": {"type": "integer"}, "Unused": {"type": "@unused@"}},
+        },
+    }).replace('"@unused@"', "nope")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = load_openapi_tools(_write(tmpdir, spec))
+
+    [tool] = result.tools
+    assert tool["parameters"] == [{"name": "tag", "type": "integer", "required": False}]
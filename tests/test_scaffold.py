@@ -1,9 +1,19 @@
 """Test scaffold_server tool."""
 
+import ast
+import base64
+import io
 import json
+import os
+import subprocess
+import sys
+import tarfile
 import tempfile
+import tracemalloc
+import zipfile
 from pathlib import Path
 
+from mcp_creator.services import tool_spec
 from mcp_creator.tools.scaffold_server import scaffold_server
 
 
@@ -143,6 +153,402 @@ def test_scaffold_paid_mode():
         assert "License Key" in readme
 
 
+def test_scaffold_paid_project_tests_run_against_license_stub():
+    """The generated suite stubs the license SDK and covers the cached check."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-paid-mcp",
+            description="A paid MCP",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+            paid=True,
+            async_tools=True,
+        ))
+        project_dir = Path(result["project_dir"])
+        assert (project_dir / "tests" / "conftest.py").exists()
+        assert (project_dir / "tests" / "test_license.py").exists()
+        assert result["file_counts"]["tests"] == 3
+
+        env = {**os.environ, "PYTHONPATH": str(project_dir / "src")}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "9 passed" in run.stdout
+
+
+def test_scaffold_services_live_for_the_whole_process():
+    """The lifespan hook starts each service once, and every call reuses it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-life-mcp",
+            description="Test",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+        ))
+        project_dir = Path(result["project_dir"])
+        assert (project_dir / "src/test_life_mcp/lifecycle.py").exists()
+
+        (project_dir / "src/test_life_mcp/services/get_weather_service.py").write_text(
+            "EVENTS = []\n\n\n"
+            "class GetWeather:\n"
+            "    def __init__(self):\n"
+            "        EVENTS.append('init')\n\n"
+            "    def startup(self):\n"
+            "        EVENTS.append('startup')\n\n"
+            "    def shutdown(self):\n"
+            "        EVENTS.append('shutdown')\n\n"
+            "    def execute(self, city):\n"
+            "        EVENTS.append('execute')\n"
+            "        return {'city': city}\n"
+        )
+        probe = (
+            "import asyncio\n"
+            "from test_life_mcp.server import lifespan, mcp\n"
+            "from test_life_mcp.services.get_weather_service import EVENTS\n"
+            "async def serve():\n"
+            "    async with lifespan(mcp):\n"
+            "        for _ in range(3):\n"
+            "            await mcp.call_tool('get_weather', {'city': 'Paris'})\n"
+            "asyncio.run(serve())\n"
+            "print(','.join(EVENTS))\n"
+        )
+        env = {**os.environ, "PYTHONPATH": str(project_dir / "src")}
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        assert run.stdout.strip() == "init,startup,execute,execute,execute,shutdown"
+
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+
+
+def test_scaffold_api_block_shares_one_pooled_client():
+    """Every service gets the shared client; the generated suite runs against a stand-in API."""
+    api = {"base_url": "https://weather.example.com/v2", "auth_env": "WEATHER_TOKEN", "pool_size": 4}
+    tools = json.loads(SAMPLE_TOOLS) + [{"name": "ping", "async": True, "api": {"timeout": 2}}]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-api-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+            api=json.dumps(api),
+        ))
+        assert result["success"] is True
+        assert result["file_counts"]["tests"] == 4
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_api_mcp"
+
+        client = (src / "services/api_client.py").read_text()
+        assert 'os.environ.get("API_POOL_SIZE", "4")' in client
+        assert 'AUTH_ENV = "WEATHER_TOKEN"' in client
+        assert "self._api = api_client.client()" in (src / "services/get_weather_service.py").read_text()
+        ping = (src / "services/ping_service.py").read_text()
+        assert "self._api = api_client.async_client()" in ping
+        assert 'self._api.get("/ping", timeout=2)' in ping
+        assert "await api_client.close()" in (src / "server.py").read_text()
+        assert "WEATHER_TOKEN=" in (project_dir / ".env.example").read_text()
+        assert '"httpx>=' in (project_dir / "pyproject.toml").read_text()
+        assert json.loads((project_dir / ".mcp-creator.json").read_text())["api"] == api
+
+        env = {**os.environ, "PYTHONPATH": str(src.parent)}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "10 passed" in run.stdout
+
+
+def test_scaffold_cached_tools():
+    """Cached tools go through an LRU + TTL cache; the generated tests cover hits, expiry and persistence."""
+    tools = [
+        {
+            "name": "get_weather",
+            "parameters": [
+                {"name": "city", "type": "string", "required": True},
+                {"name": "verbose", "type": "boolean", "required": False, "default": False},
+            ],
+            "cache": {"ttl": 60, "max_entries": 2, "key": ["city"], "persist": True},
+        },
+        {"name": "get_alerts", "async": True, "cache": {}},
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-cache-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+        ))
+        assert result["success"] is True
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_cache_mcp"
+        tool = (src / "tools/get_weather.py").read_text()
+        assert '_cache = ResultCache("get_weather", ttl=60, max_entries=2, persist=True)' in tool
+        assert "cache_key = _cache.key(city=city)" in tool
+
+        probe = (
+            "from test_cache_mcp.tools.get_weather import _cache, get_weather\n"
+            "for city in ['a', 'b', 'a', 'c', 'b', 'b']:\n"
+            "    get_weather(city)\n"
+            "get_weather('c', verbose=True)\n"
+            "print(_cache.hits, _cache.misses, len(_cache._entries), _cache.path.exists())\n"
+        )
+        env = {**os.environ, "PYTHONPATH": str(src.parent), "MCP_CACHE_DIR": str(Path(tmpdir) / "cache")}
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        # a miss, b miss, a hit, c miss (evicts b), b miss (evicts a), b hit, c hit (verbose not in key)
+        # Stores are written behind, here by the flush at exit
+        assert run.stdout.split() == ["3", "4", "2", "False"]
+        stored = json.loads((Path(tmpdir) / "cache/get_weather.json").read_text())
+        assert list(stored) == ['{"city":"b"}', '{"city":"c"}']
+
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "11 passed" in run.stdout
+
+
+def test_scaffold_paginated_tools():
+    """Paginated tools serve their service's generator a page at a time behind opaque cursors."""
+    tools = [
+        {"name": "list_rows", "parameters": [{"name": "table", "type": "string"}], "paginated": True},
+        {"name": "list_events", "async": True, "paginated": True, "cache": {}},
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-page-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+        ))
+        assert result["success"] is True
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_page_mcp"
+        server_py = (src / "server.py").read_text()
+        assert "def list_rows(table: str, cursor: str | None = None, page_size: int = 100) -> str:" in server_py
+        assert "def execute(self, table: str) -> Iterator[dict]:" in (src / "services/list_rows_service.py").read_text()
+
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env={**os.environ, "PYTHONPATH": str(src.parent)}, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "12 passed" in run.stdout
+
+        # A service with an endless result set: only one page (plus one item) is ever pulled
+        (src / "services/list_rows_service.py").write_text(
+            "import itertools\n"
+            "pulled = []\n"
+            "class ListRows:\n"
+            "    def startup(self): pass\n"
+            "    def shutdown(self): pass\n"
+            "    def execute(self, table):\n"
+            "        for i in itertools.count():\n"
+            "            pulled.append(i)\n"
+            "            yield {'table': table, 'row': i}\n"
+        )
+        probe = (
+            "import json\n"
+            "from test_page_mcp.services import list_rows_service\n"
+            "from test_page_mcp.tools.list_rows import list_rows\n"
+            "first = json.loads(list_rows('t', page_size=2))\n"
+            "second = json.loads(list_rows('t', cursor=first['next_cursor'], page_size=2))\n"
+            "again = json.loads(list_rows('t', cursor=first['next_cursor'], page_size=2))\n"
+            "try:\n"
+            "    list_rows('other', cursor=first['next_cursor'])\n"
+            "except ValueError as e:\n"
+            "    error = str(e)\n"
+            "print(json.dumps([first, second, again == second, len(list_rows_service.pulled), error]))\n"
+        )
+        run = subprocess.run(
+            [sys.executable, "-c", probe],
+            env={**os.environ, "PYTHONPATH": str(src.parent)}, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stderr
+        first, second, stable, pulled, error = json.loads(run.stdout)
+        assert [row["row"] for row in first["items"]] == [0, 1]
+        assert [row["row"] for row in second["items"]] == [2, 3]
+        assert stable is True
+        assert pulled == 3 + 5 + 5
+        assert "different arguments" in error
+
+
+def test_scaffold_structured_output():
+    """Tools return JSON objects, sent once as structured content with a compact text fallback."""
+    tools = [
+        {
+            "name": "get_weather",
+            "parameters": [{"name": "city", "type": "string", "required": True}],
+            "cache": {"persist": True},
+        },
+        {"name": "get_alerts", "async": True},
+        {
+            "name": "get_pet",
+            "parameters": [{"name": "pet_id", "type": "string", "required": True}],
+            "http": {"method": "GET", "path": "/pets/{pet_id}", "params": {"pet_id": {"in": "path"}}},
+        },
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-structured-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+            paid=True,
+            paid_tools=json.dumps(["get_alerts"]),
+            precomputed_schemas=True,
+            api=json.dumps({"base_url": "https://api.example.com"}),
+            structured_output=True,
+        ))
+        assert result["success"] is True
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_structured_mcp"
+        tool = (src / "tools/get_weather.py").read_text()
+        assert "def get_weather(city: str) -> dict[str, Any]:" in tool
+        assert "json.dumps" not in tool
+        server_py = (src / "server.py").read_text()
+        assert "return _structured_result(_get_weather_impl(city))" in server_py
+        assert "return _structured_result(await _get_alerts_impl())" in server_py
+        assert (project_dir / "benchmarks/bench_output.py").exists()
+        assert json.loads((project_dir / ".mcp-creator.json").read_text())["structured_output"] is True
+
+        probe = (
+            "import asyncio, json\n"
+            "from test_structured_mcp.server import mcp\n"
+            "result = asyncio.run(mcp.call_tool('get_weather', {'city': 'Oslo'}))\n"
+            "print(json.dumps([block.text for block in result.content] + [result.structuredContent]))\n"
+        )
+        # The license SDK is only imported here, never called
+        stubs = Path(tmpdir) / "stubs"
+        stubs.mkdir()
+        (stubs / "mcp_marketplace_license.py").write_text("verify_license = None\n")
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join([str(src.parent), str(stubs)]),
+            "MCP_CACHE_DIR": str(Path(tmpdir) / "cache"),
+        }
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        text, structured = json.loads(run.stdout)
+        assert structured == {"city": "Oslo", "status": "ok"}
+        assert text == '{"city":"Oslo","status":"ok"}'
+
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "21 passed" in run.stdout
+
+        run = subprocess.run(
+            [sys.executable, "benchmarks/bench_output.py", "100000"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stderr
+        assert [line.split()[0] for line in run.stdout.splitlines()[2:]] == ["text", "structured", "bare"]
+
+
+def test_scaffold_batch_companions():
+    """A batch tool gets a <name>_batch companion that runs its calls concurrently, in order."""
+    tools = [
+        {"name": "get_weather", "parameters": [{"name": "city", "type": "string"}], "batch": True},
+        {"name": "get_alerts", "async": True, "batch": True, "cache": {}},
+        {"name": "get_news"},
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-batch-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+            precomputed_schemas=True,
+            metrics=True,
+        ))
+        assert result["success"] is True
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_batch_mcp"
+        server_py = (src / "server.py").read_text()
+        assert "from test_batch_mcp.batch import register_batch" in server_py
+        assert "register_batch(mcp, get_weather)" in server_py
+        assert "get_news_batch" not in server_py and "register_batch(mcp, get_news)" not in server_py
+
+        env = {**os.environ, "PYTHONPATH": str(src.parent)}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "26 passed" in run.stdout
+
+        # A slow sync service that records how many calls it runs at once
+        (src / "services/get_weather_service.py").write_text(
+            "import threading, time\n"
+            "lock = threading.Lock()\n"
+            "running = peak = 0\n"
+            "class GetWeather:\n"
+            "    def startup(self): pass\n"
+            "    def shutdown(self): pass\n"
+            "    def execute(self, city):\n"
+            "        global running, peak\n"
+            "        with lock:\n"
+            "            running += 1\n"
+            "            peak = max(peak, running)\n"
+            "        time.sleep(0.2)\n"
+            "        with lock:\n"
+            "            running -= 1\n"
+            "        return {'city': city}\n"
+        )
+        probe = (
+            "import asyncio, json, time\n"
+            "from test_batch_mcp.server import mcp\n"
+            "from test_batch_mcp import metrics\n"
+            "from test_batch_mcp.services import get_weather_service\n"
+            "calls = [{'city': f'c{i}'} for i in range(8)] + [{'town': 'x'}]\n"
+            "start = time.perf_counter()\n"
+            "result = asyncio.run(mcp.call_tool('get_weather_batch', {'calls': calls}))\n"
+            "elapsed = time.perf_counter() - start\n"
+            "schema = mcp._tool_manager.get_tool('get_weather_batch').parameters\n"
+            "calls_seen = metrics.snapshot()['tools']['get_weather']['calls']\n"
+            "print(json.dumps([json.loads(result[0][0].text), elapsed, schema,\n"
+            "                  get_weather_service.peak, calls_seen]))\n"
+        )
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        batch, elapsed, schema, peak, calls_seen = json.loads(run.stdout)
+        results = batch["results"]
+        assert [r["result"]["city"] for r in results[:8]] == [f"c{i}" for i in range(8)]
+        assert "validation error" in results[8]["error"]
+        assert elapsed < 8 * 0.2 / 2  # eight calls at the default concurrency of 8
+        assert calls_seen == 9  # every item is counted as a call of the tool itself
+        assert schema["properties"]["calls"]["items"]["required"] == ["city"]
+
+        # The tool's concurrency limit holds within a batch, and a full queue turns items away
+        run = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True,
+            env={**env, "MCP_GET_WEATHER_CONCURRENCY": "2"},
+        )
+        assert run.returncode == 0, run.stderr
+        batch, elapsed, _, peak, _ = json.loads(run.stdout)
+        assert peak == 2
+        assert elapsed >= 4 * 0.2  # eight calls, two at a time
+        assert [r["result"]["city"] for r in batch["results"][:8]] == [f"c{i}" for i in range(8)]
+        run = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True,
+            env={**env, "MCP_GET_WEATHER_CONCURRENCY": "2", "MCP_GET_WEATHER_QUEUE": "0"},
+        )
+        assert run.returncode == 0, run.stderr
+        results = json.loads(run.stdout)[0]["results"]
+        assert sum("result" in r for r in results) == 2
+        assert all(r["error"].startswith("busy") for r in results[2:8])
+
+
 def test_scaffold_paid_with_specific_tools():
     """Scaffold with paid_tools gates only specified tools."""
     tools = json.dumps([
@@ -208,10 +614,30 @@ def test_scaffold_remote_hosting():
         dockerfile = (project_dir / "Dockerfile").read_text()
         assert "EXPOSE" in dockerfile
 
-        # server.py uses SSE transport
-        server_py = (project_dir / "src" / "test_remote_mcp" / "server.py").read_text()
-        assert '"sse"' in server_py
-        assert "PORT" in server_py
+        # server.py serves stateless streamable HTTP from worker processes
+        src = project_dir / "src" / "test_remote_mcp"
+        server_py = (src / "server.py").read_text()
+        assert "stateless_http=STATELESS_HTTP" in server_py
+        assert '"test_remote_mcp.server:http_app"' in server_py
+        assert "PORT" in server_py and "WEB_CONCURRENCY" in server_py
+        assert "WEB_CONCURRENCY=2" in dockerfile
+
+        env = {**os.environ, "PYTHONPATH": str(src.parent)}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+
+        # The load test starts real servers, with one and with two workers
+        run = subprocess.run(
+            [sys.executable, "benchmarks/bench_http.py", "--workers", "1", "2", "--requests", "50", "--concurrency", "4"],
+            cwd=project_dir, env=env, capture_output=True, text=True, timeout=120,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        rows = [line.split() for line in run.stdout.splitlines()[2:]]
+        assert [row[0] for row in rows] == ["1", "2"]
+        assert all(float(row[1]) > 0 for row in rows)
 
         # .env.example has PORT
         env = (project_dir / ".env.example").read_text()
@@ -222,6 +648,213 @@ def test_scaffold_remote_hosting():
         assert "url" in readme
 
 
+def test_scaffold_concurrency_limits():
+    """Remote servers limit concurrent calls and turn overload away with structured errors."""
+    tools = [
+        {"name": "get_weather", "parameters": [{"name": "city", "type": "string"}],
+         "limits": {"concurrency": 1, "queue": 0, "timeout": 0.5}},
+        {"name": "get_news", "async": True},
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-limits-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+            hosting="remote",
+        ))
+        assert result["success"] is True
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_limits_mcp"
+        server_py = (src / "server.py").read_text()
+        assert "limits.install(mcp)" in server_py
+        assert 'limits.configure(mcp, "get_weather", concurrency=1, queue=0, timeout=0.5)' in server_py
+        assert 'limits.configure(mcp, "get_news"' not in server_py
+
+        env = {**os.environ, "PYTHONPATH": str(src.parent)}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert "16 passed" in run.stdout
+
+        # A slow sync service: a second call is turned away at once, and the first times out
+        (src / "services/get_weather_service.py").write_text(
+            "import time\n"
+            "class GetWeather:\n"
+            "    def startup(self): pass\n"
+            "    def shutdown(self): pass\n"
+            "    def execute(self, city):\n"
+            "        time.sleep(1)\n"
+            "        return {'city': city}\n"
+        )
+        probe = (
+            "import asyncio, json, time\n"
+            "from test_limits_mcp.server import mcp\n"
+            "async def main():\n"
+            "    first = asyncio.create_task(mcp.call_tool('get_weather', {'city': 'a'}))\n"
+            "    await asyncio.sleep(0.05)\n"
+            "    start = time.perf_counter()\n"
+            "    busy = await mcp.call_tool('get_weather', {'city': 'b'})\n"
+            "    busy_seconds = time.perf_counter() - start\n"
+            "    news = await mcp.call_tool('get_news', {})\n"
+            "    timed_out = await first\n"
+            "    return [busy.structuredContent, busy_seconds, timed_out.structuredContent, news[1]]\n"
+            "print(json.dumps(asyncio.run(main())))\n"
+        )
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        busy, busy_seconds, timed_out, news = json.loads(run.stdout)
+        assert busy["error"] == "busy" and busy["tool"] == "get_weather"
+        assert busy_seconds < 0.1
+        assert timed_out["error"] == "timeout" and timed_out["timeout"] == 0.5
+        assert "result" in news  # other tools are served while get_weather is saturated
+
+
+def test_scaffold_metrics():
+    """Metrics count and time tool calls; the generated benchmark checks their overhead."""
+    for hosting, passed in (("local", "10 passed"), ("remote", "19 passed")):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = json.loads(scaffold_server(
+                package_name="test-metrics-mcp",
+                description="Test",
+                tools=SAMPLE_TOOLS,
+                output_dir=tmpdir,
+                hosting=hosting,
+                metrics=True,
+            ))
+            assert result["success"] is True
+            project_dir = Path(result["project_dir"])
+            src = project_dir / "src/test_metrics_mcp"
+            server_py = (src / "server.py").read_text()
+            endpoint = ", endpoint=True" if hosting == "remote" else ""
+            assert f"metrics.install(mcp{endpoint})" in server_py
+            assert server_py.index("# --- END TOOLS ---") < server_py.index("metrics.install(mcp")
+            assert "MCP_METRICS_INTERVAL=15" in (project_dir / ".env.example").read_text()
+            assert json.loads((project_dir / ".mcp-creator.json").read_text())["metrics"] is True
+
+            env = {**os.environ, "PYTHONPATH": str(src.parent)}
+            run = subprocess.run(
+                [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+                cwd=project_dir, env=env, capture_output=True, text=True,
+            )
+            assert run.returncode == 0, run.stdout + run.stderr
+            assert passed in run.stdout
+
+            # A loose budget here: the default of 5 us assumes a machine that isn't running a test suite
+            run = subprocess.run(
+                [sys.executable, "benchmarks/bench_metrics.py", "--calls", "2000", "--budget", "50"],
+                cwd=project_dir, env=env, capture_output=True, text=True,
+            )
+            assert run.returncode == 0, run.stdout + run.stderr
+            assert "overhead:" in run.stdout
+
+
+def test_scaffold_profiling():
+    """MCP_PROFILE profiles the named tools' calls, keeping the newest dumps; unset, nothing is wrapped."""
+    tools = [{"name": "get_weather", "parameters": [{"name": "city", "type": "string"}]}, {"name": "get_news"}]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-profile-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+        ))
+        assert result["success"] is True
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_profile_mcp"
+        assert "profiling.install(mcp)" in (src / "server.py").read_text()
+
+        probe = (
+            "import asyncio, json, pstats, tracemalloc\n"
+            "from pathlib import Path\n"
+            "from test_profile_mcp import profiling\n"
+            "from test_profile_mcp.server import mcp\n"
+            "async def main():\n"
+            "    for _ in range(5):\n"
+            "        await mcp.call_tool('get_weather', {'city': 'Paris'})\n"
+            "    await mcp.call_tool('get_news', {})\n"
+            "    wrapped = [t.name for t in mcp._tool_manager.list_tools() if getattr(t.fn, 'profiled', False)]\n"
+            "    directory = Path(profiling.PROFILE_DIR)\n"
+            "    dumps = sorted(directory.iterdir()) if directory.exists() else []\n"
+            "    for path in dumps:\n"
+            "        if path.suffix == '.prof':\n"
+            "            pstats.Stats(str(path))\n"
+            "        else:\n"
+            "            tracemalloc.Snapshot.load(str(path))\n"
+            "    print(json.dumps([wrapped, [path.name for path in dumps]]))\n"
+            "asyncio.run(main())\n"
+        )
+
+        def profile(**settings):
+            env = {**os.environ, "PYTHONPATH": str(src.parent), **settings}
+            run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+            assert run.returncode == 0, run.stderr
+            return json.loads(run.stdout)
+
+        for mode, suffix in (("cpu", ".prof"), ("memory", ".tracemalloc")):
+            wrapped, dumps = profile(
+                MCP_PROFILE="get_weather", MCP_PROFILE_MODE=mode, MCP_PROFILE_KEEP="3",
+                MCP_PROFILE_DIR=str(Path(tmpdir) / f"profiles-{mode}"),
+            )
+            assert wrapped == ["get_weather"]
+            assert len(dumps) == 3
+            assert all(name.startswith("get_weather-") and name.endswith(suffix) for name in dumps)
+
+        never = str(Path(tmpdir) / "never")
+        assert profile(MCP_PROFILE="*", MCP_PROFILE_SAMPLE="0", MCP_PROFILE_DIR=never) == [
+            ["get_weather", "get_news"], [],
+        ]
+        assert profile(MCP_PROFILE="", MCP_PROFILE_DIR=never) == [[], []]
+
+
+def test_scaffold_tool_benchmarks():
+    """bench_tools.py times every tool in process and over stdio, and fails on a regression."""
+    tools = [{"name": "get_weather", "parameters": [{"name": "city", "type": "string"}]}, {"name": "get_news"}]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-bench-mcp",
+            description="Test",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+        ))
+        project_dir = Path(result["project_dir"])
+        src = project_dir / "src/test_bench_mcp"
+        env = {**os.environ, "PYTHONPATH": str(src.parent)}
+        bench = [sys.executable, "benchmarks/bench_tools.py", "--calls", "20", "--warmup", "2"]
+
+        run = subprocess.run(bench + ["--save-baseline"], cwd=project_dir, env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stdout + run.stderr
+        results = json.loads((project_dir / "benchmarks/results.json").read_text())
+        assert set(results["transports"]) == {"in_process", "stdio"}
+        for transport, by_tool in results["transports"].items():
+            assert set(by_tool) == {"get_weather", "get_news"}
+            for stats in by_tool.values():
+                assert stats["calls"] == 20 and stats["errors"] == 0
+                assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+                assert stats["calls_per_second"] > 0
+                assert ("alloc_peak_bytes" in stats) == (transport == "in_process")
+        assert (project_dir / "benchmarks/baseline.json").exists()
+
+        # A service that got 50 ms slower fails the run
+        (src / "services/get_weather_service.py").write_text(
+            "import time\n"
+            "class GetWeather:\n"
+            "    def startup(self): pass\n"
+            "    def shutdown(self): pass\n"
+            "    def execute(self, city):\n"
+            "        time.sleep(0.05)\n"
+            "        return {'city': city}\n"
+        )
+        run = subprocess.run(
+            bench + ["--no-stdio", "--tolerance", "1"], cwd=project_dir, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 1, run.stdout + run.stderr
+        assert "REGRESSION get_weather (in_process)" in run.stdout
+        assert "REGRESSION get_news" not in run.stdout
+
+
 def test_scaffold_paid_remote():
     """Scaffold with both paid=true and hosting='remote'."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -240,9 +873,309 @@ def test_scaffold_paid_remote():
         # Has both license + remote features
         server_py = (project_dir / "src" / "test_paid_remote_mcp" / "server.py").read_text()
         assert "verify_license" in server_py
-        assert '"sse"' in server_py
+        assert "def http_app() -> Starlette:" in server_py
         assert (project_dir / "Dockerfile").exists()
 
         env = (project_dir / ".env.example").read_text()
         assert "MCP_LICENSE_KEY" in env
         assert "PORT" in env
+
+
+def test_scaffold_dry_run_writes_nothing():
+    """dry_run renders the whole project in memory — no temp dir needed."""
+    result = json.loads(scaffold_server(
+        package_name="test-dry-mcp",
+        description="A dry run",
+        tools=SAMPLE_TOOLS,
+        output_dir="/nonexistent/output",
+        dry_run=True,
+    ))
+
+    assert result["success"] is True
+    assert result["dry_run"] is True
+    assert result["files_created"] == 0
+    assert not Path("/nonexistent/output").exists()
+    assert "src/test_dry_mcp/server.py" in result["changes"]["created"]
+    assert "+++ b/src/test_dry_mcp/tools/get_weather.py" in result["diff"]
+    assert "+def get_weather(city: str) -> str:" in result["diff"]
+
+
+def test_scaffold_dry_run_against_existing_project():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_server(
+            package_name="test-weather-mcp",
+            description="A test weather MCP",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+        )
+        result = json.loads(scaffold_server(
+            package_name="test-weather-mcp",
+            description="A renamed weather MCP",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+            dry_run=True,
+        ))
+
+        assert result["changes"]["created"] == []
+        assert "pyproject.toml" in result["changes"]["modified"]
+        assert '+description = "A renamed weather MCP"' in result["diff"]
+        pyproject = (Path(tmpdir) / "test-weather-mcp" / "pyproject.toml").read_text()
+        assert "A test weather MCP" in pyproject
+
+
+def _parents_come_first(names: list[str]) -> bool:
+    """True if every archive entry's parent directory is listed before it."""
+    seen = set()
+    for name in names:
+        parent = name.rpartition("/")[0]
+        if parent and parent not in seen:
+            return False
+        seen.add(name)
+    return True
+
+
+def test_scaffold_zip_archive():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="test-zip-mcp",
+            description="Zipped",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+            output_format="zip",
+        ))
+
+        assert result["success"] is True
+        archive_path = Path(result["archive_path"])
+        assert archive_path == Path(tmpdir).resolve() / "test-zip-mcp.zip"
+        assert not (Path(tmpdir) / "test-zip-mcp").exists()
+
+        with zipfile.ZipFile(archive_path) as zf:
+            names = zf.namelist()
+            assert _parents_come_first([n.rstrip("/") for n in names])
+            assert "test-zip-mcp/src/test_zip_mcp/server.py" in names
+            info = zf.getinfo("test-zip-mcp/pyproject.toml")
+            assert (info.external_attr >> 16) & 0o777 == 0o644
+            assert info.date_time == (1980, 1, 1, 0, 0, 0)
+
+
+def test_scaffold_tar_gz_inline_is_deterministic():
+    kwargs = dict(
+        package_name="test-tar-mcp",
+        description="Tarred",
+        tools=SAMPLE_TOOLS,
+        output_dir="/nonexistent/output",
+        output_format="tar.gz",
+        archive_inline=True,
+    )
+    first = json.loads(scaffold_server(**kwargs))
+    second = json.loads(scaffold_server(**kwargs))
+
+    assert first["archive_base64"] == second["archive_base64"]
+    assert not Path("/nonexistent/output").exists()
+
+    data = base64.b64decode(first["archive_base64"])
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tf:
+        members = tf.getmembers()
+        assert _parents_come_first([m.name for m in members])
+        server = tf.extractfile("test-tar-mcp/src/test_tar_mcp/server.py").read().decode()
+        assert "FastMCP" in server
+        assert all(m.mtime == 0 for m in members)
+        assert tf.getmember("test-tar-mcp/src").mode == 0o755
+        assert tf.getmember("test-tar-mcp/README.md").mode == 0o644
+
+
+def test_scaffold_bad_output_format():
+    result = json.loads(scaffold_server(
+        package_name="test-bad-mcp",
+        description="Bad",
+        tools=SAMPLE_TOOLS,
+        output_format="rar",
+    ))
+    assert result["success"] is False
+
+
+def _many_tools(count: int) -> str:
+    return json.dumps([
+        {
+            "name": f"tool_{i}",
+            "description": "Look something up",
+            "parameters": [
+                {"name": "query", "type": "string", "required": True},
+                {"name": "limit", "type": "integer", "required": False, "default": 10},
+            ],
+            "returns": "Result JSON",
+        }
+        for i in range(count)
+    ])
+
+
+def _peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_scaffold_memory_stays_flat_as_tools_grow(monkeypatch):
+    # Keep the spec cache well below the tool count so it doesn't mask growth.
+    monkeypatch.setattr(tool_spec, "_CACHE_SIZE", 16)
+
+    def overhead(count: int) -> int:
+        tools = _many_tools(count)
+        tool_spec.clear_cache()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            peak = _peak_memory(lambda: scaffold_server(
+                package_name="big-mcp", description="Big", tools=tools, output_dir=tmpdir,
+            ))
+            # Output must actually have been written
+            assert (Path(tmpdir) / "big-mcp" / "tests" / f"test_tool_{count - 1}.py").exists()
+        # Parsing the input is unavoidable; measure everything on top of it.
+        return peak - _peak_memory(lambda: json.loads(tools))
+
+    small, large = overhead(100), overhead(400)
+    # Each tool renders ~1.6 KB of files; holding them would add at least that
+    # much per tool. Streaming only keeps the per-tool manifest hash.
+    assert (large - small) / 300 < 512
+
+
+def test_scaffold_summarizes_counts():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="count-mcp", description="Counts", tools=_many_tools(3), output_dir=tmpdir,
+        ))
+        assert "file_list" not in result
+        assert result["file_counts"] == {
+            "tools": 3, "tool_modules": 3, "services": 3, "tests": 4,
+        }
+        on_disk = [p for p in (Path(tmpdir) / "count-mcp").rglob("*") if p.is_file()]
+        assert result["files_created"] == len(on_disk)
+
+
+def test_scaffold_counts_every_test_module():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="count-mcp", description="Counts", tools=_many_tools(3), output_dir=tmpdir,
+            paid=True, hosting="remote", metrics=True,
+        ))
+        test_modules = list((Path(tmpdir) / "count-mcp" / "tests").glob("test_*.py"))
+        assert {"test_limits.py", "test_http.py", "test_metrics.py"} <= {p.name for p in test_modules}
+        assert result["file_counts"]["tests"] == len(test_modules)
+
+        packed = json.loads(scaffold_server(
+            package_name="count-mcp", description="Counts", tools=_many_tools(3), output_dir=tmpdir,
+            paid=True, hosting="remote", metrics=True, output_format="zip",
+        ))
+        assert packed["file_counts"] == result["file_counts"]
+
+
+def test_scaffold_lazy_imports():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="lazy-mcp",
+            description="Lazy",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+            lazy_imports=True,
+        ))
+        assert result["success"] is True
+        project = Path(result["project_dir"])
+        server = (project / "src/lazy_mcp/server.py").read_text()
+        assert "import _get_weather_impl" not in server
+        assert 'return _load_tool("get_weather")(city)' in server
+        assert json.loads((project / ".mcp-creator.json").read_text())["lazy_imports"] is True
+
+        # Importing server.py loads no tool module; calling a tool loads just that one.
+        env = {**os.environ, "PYTHONPATH": str(project / "src")}
+        probe = (
+            "import sys; from lazy_mcp import server; "
+            "assert 'lazy_mcp.tools.get_weather' not in sys.modules; "
+            "print(server.get_weather('Paris')); "
+            "assert server._load_tool('get_weather') is server._load_tool('get_weather')"
+        )
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        assert "Paris" in run.stdout
+
+        # The generated suite includes the import-time budget check.
+        assert "def test_import_time_budget" in (project / "tests/test_server.py").read_text()
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+
+
+def test_scaffold_paid_lazy_imports_probe_stubs_license_sdk():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="paid-lazy-mcp",
+            description="Paid and lazy",
+            tools=SAMPLE_TOOLS,
+            output_dir=tmpdir,
+            paid=True,
+            lazy_imports=True,
+        ))
+        project = Path(result["project_dir"])
+        test_server = (project / "tests/test_server.py").read_text()
+        probe = next(
+            node.value.value for node in ast.parse(test_server).body
+            if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "_PROBE"
+        )
+        # The license SDK isn't installed here; the probe must stand in for it
+        env = {**os.environ, "PYTHONPATH": str(project / "src")}
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        assert json.loads(run.stdout)["loaded"] == []
+
+
+def test_scaffold_precomputed_schemas():
+    tools = json.loads(SAMPLE_TOOLS) + [{
+        "name": "get_forecast",
+        "parameters": [
+            {"name": "city", "type": "string", "required": True},
+            {"name": "days", "type": "integer", "required": False, "default": 5},
+            {"name": "tags", "type": "array", "required": False},
+        ],
+    }]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="schema-mcp",
+            description="Schemas",
+            tools=json.dumps(tools),
+            output_dir=tmpdir,
+            precomputed_schemas=True,
+        ))
+        assert result["success"] is True
+        project = Path(result["project_dir"])
+        server = (project / "src/schema_mcp/server.py").read_text()
+        assert "@mcp.tool" not in server
+        assert server.count("@_schema_tool(") == 2
+        assert (project / "benchmarks/bench_startup.py").exists()
+
+        # Tools answer calls through FastMCP, building their models on first use.
+        env = {**os.environ, "PYTHONPATH": str(project / "src")}
+        probe = (
+            "import asyncio; from schema_mcp.server import mcp; "
+            "tool = mcp._tool_manager.get_tool('get_forecast'); assert tool.fn_metadata is None; "
+            "print(asyncio.run(mcp.call_tool('get_forecast', {'city': 'Oslo'}))[1]); "
+            "assert tool.fn_metadata is not None"
+        )
+        run = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+        assert run.returncode == 0, run.stderr
+        assert "Oslo" in run.stdout
+
+        run = subprocess.run(
+            [sys.executable, "benchmarks/bench_startup.py"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stderr
+        assert "schema mismatches:              0" in run.stdout
+
+        # The generated suite checks the schemas against FastMCP's own.
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
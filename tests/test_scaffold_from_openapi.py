@@ -0,0 +1,170 @@
+"""Test scaffold_from_openapi — generating a working server from an OpenAPI spec."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from mcp_creator.tools.scaffold_from_openapi import scaffold_from_openapi
+
+from test_openapi import SPEC
+
+
+def _write_spec(tmpdir: str, spec: dict) -> str:
+    path = Path(tmpdir) / "openapi.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return str(path)
+
+
+def _big_spec(operations: int) -> dict:
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Big API"},
+        "servers": [{"url": "https://big.example.com"}],
+        "paths": {
+            f"/things{i}/{{thingId}}": {
+                "get": {
+                    "operationId": f"getThing{i}",
+                    "parameters": [
+                        {"name": "thingId", "in": "path", "required": True, "schema": {"type": "string"}},
+                        {"name": "verbose", "in": "query", "schema": {"type": "boolean"}},
+                    ],
+                },
+            }
+            for i in range(operations)
+        },
+    }
+
+
+def test_scaffold_from_openapi_generates_working_project():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_from_openapi(
+            spec_path=_write_spec(tmpdir, SPEC),
+            package_name="petstore-mcp",
+            output_dir=tmpdir,
+            max_workers=1,
+        ))
+        assert result["success"] is True
+        assert result["file_counts"]["tools"] == 3
+        assert result["openapi"]["skipped"] == 2
+        assert result["openapi"]["base_url"] == "https://api.example.com/v1"
+        assert not any(step.startswith("Open the services/") for step in result["next_steps"])
+
+        project = Path(tmpdir) / "petstore-mcp"
+        assert '"httpx>=' in (project / "pyproject.toml").read_text()
+        assert "API_TOKEN" in (project / ".env.example").read_text()
+        client = (project / "src/petstore_mcp/services/api_client.py").read_text()
+        assert 'BASE_URL = os.environ.get("API_BASE_URL", "https://api.example.com/v1")' in client
+        service = (project / "src/petstore_mcp/services/create_pet_service.py").read_text()
+        assert '"class": class_,' in service
+
+        # The generated tests exercise every service against a local stand-in API.
+        env = {**os.environ, "PYTHONPATH": str(project / "src")}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+
+
+def test_scaffold_from_openapi_async():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_from_openapi(
+            spec_path=_write_spec(tmpdir, SPEC),
+            package_name="petstore-mcp",
+            output_dir=tmpdir,
+            async_tools=True,
+            max_workers=1,
+        ))
+        assert result["success"] is True
+
+        project = Path(tmpdir) / "petstore-mcp"
+        service = (project / "src/petstore_mcp/services/list_pets_service.py").read_text()
+        assert "self._http = api_client.async_client()" in service
+        assert "response = await self._http.request(" in service
+
+        env = {**os.environ, "PYTHONPATH": str(project / "src")}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+
+
+def test_parameters_named_like_service_locals_reach_the_api():
+    spec = {
+        "openapi": "3.0.0",
+        "servers": [{"url": "https://auth.example.com"}],
+        "security": [{"bearer": []}],
+        "paths": {
+            "/revoke": {"post": {
+                "operationId": "revoke",
+                "requestBody": {"content": {"application/json": {"schema": {
+                    "type": "object", "properties": {"token": {"type": "string"}},
+                }}}},
+            }},
+            "/search": {"get": {
+                "operationId": "search",
+                "parameters": [{"name": "path", "in": "query", "schema": {"type": "string"}}],
+            }},
+        },
+        "components": {"securitySchemes": {"bearer": {"type": "http", "scheme": "bearer"}}},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_from_openapi(
+            spec_path=_write_spec(tmpdir, spec), package_name="auth-mcp", output_dir=tmpdir, max_workers=1,
+        ))
+        assert result["success"] is True
+
+        project = Path(tmpdir) / "auth-mcp"
+        (project / "tests/test_locals.py").write_text(
+            "import json\n"
+            "from auth_mcp.tools.revoke import revoke\n"
+            "from auth_mcp.tools.search import search\n\n\n"
+            "def test_caller_values_are_sent(api_server, monkeypatch):\n"
+            "    monkeypatch.setenv('API_TOKEN', 'server-secret')\n"
+            "    revoke(token='caller-token')\n"
+            "    search(path='/docs')\n"
+            "    revoked, searched = api_server.requests\n"
+            "    assert json.loads(revoked['body']) == {'token': 'caller-token'}\n"
+            "    assert revoked['headers']['Authorization'] == 'Bearer server-secret'\n"
+            "    assert searched['path'] == '/search?path=%2Fdocs'\n",
+            encoding="utf-8",
+        )
+        env = {**os.environ, "PYTHONPATH": str(project / "src")}
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests/test_locals.py"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+        assert run.returncode == 0, run.stdout + run.stderr
+
+
+def test_scaffold_from_openapi_errors():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_from_openapi(str(Path(tmpdir) / "missing.json"), "x-mcp"))
+        assert result["success"] is False
+        assert "not found" in result["error"]
+
+        spec_path = _write_spec(tmpdir, {"openapi": "3.0.0", "paths": {"/x": {"get": {"deprecated": True}}}})
+        result = json.loads(scaffold_from_openapi(spec_path, "x-mcp", output_dir=tmpdir))
+        assert result["success"] is False
+        assert "No usable operations" in result["error"]
+        assert not (Path(tmpdir) / "x-mcp").exists()
+
+
+def test_parallel_render_matches_serial():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec_path = _write_spec(tmpdir, _big_spec(240))
+        archives = []
+        for workers in (1, 2):
+            out = Path(tmpdir) / f"w{workers}"
+            result = json.loads(scaffold_from_openapi(
+                spec_path, "big-mcp", output_dir=str(out),
+                output_format="zip", max_workers=workers,
+            ))
+            assert result["success"] is True
+            assert result["file_counts"]["tools"] == 240
+            archives.append(Path(result["archive_path"]).read_bytes())
+        assert archives[0] == archives[1]
@@ -0,0 +1,103 @@
+"""Test scaffold_many — bulk scaffolding from a JSONL manifest."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from mcp_creator.tools.scaffold_many import main, scaffold_many
+
+
+TOOLS = [
+    {
+        "name": "get_weather",
+        "description": "Get current weather",
+        "parameters": [{"name": "city", "type": "string", "required": True}],
+        "returns": "Weather JSON",
+    }
+]
+
+
+def _write_manifest(path: Path, lines: list) -> Path:
+    path.write_text(
+        "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_scaffold_many_in_process():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = _write_manifest(Path(tmpdir) / "catalog.jsonl", [
+            {"package_name": "one-mcp", "description": "One", "tools": TOOLS},
+            {"package_name": "two-mcp", "description": "Two", "tools": json.dumps(TOOLS), "paid": True},
+            "",
+            "{not json",
+            {"package_name": "three-mcp", "description": "Three", "tools": TOOLS, "colour": "red"},
+            {"package_name": "one-mcp", "description": "Again", "tools": TOOLS},
+            {"package_name": "bad-mcp", "description": "Bad", "tools": [{"name": "bad-name"}]},
+        ])
+        result = json.loads(scaffold_many(str(manifest), output_dir=tmpdir, max_workers=1))
+
+        assert result["success"] is False
+        summary = result["summary"]
+        assert summary["projects"] == 6
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 4
+        assert summary["projects_per_second"] > 0
+
+        by_line = {r["line"]: r for r in result["results"]}
+        assert by_line[1]["success"] and by_line[2]["success"]
+        assert "Invalid JSON" in by_line[4]["error"]
+        assert "colour" in by_line[5]["error"]
+        assert "already scaffolds" in by_line[6]["error"]
+        assert by_line[7]["errors"]
+        assert (Path(tmpdir) / "one-mcp" / "src" / "one_mcp" / "server.py").exists()
+        assert "require_license" in (Path(tmpdir) / "two-mcp" / "src" / "two_mcp" / "server.py").read_text()
+
+
+def test_scaffold_many_process_pool():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = _write_manifest(Path(tmpdir) / "catalog.jsonl", [
+            {"package_name": f"svc-{i}-mcp", "description": "Svc", "tools": TOOLS}
+            for i in range(4)
+        ])
+        result = json.loads(scaffold_many(str(manifest), output_dir=tmpdir, max_workers=2))
+
+        assert result["success"] is True
+        assert result["summary"]["workers"] == 2
+        assert sorted(r["line"] for r in result["results"]) == [1, 2, 3, 4]
+        for i in range(4):
+            assert (Path(tmpdir) / f"svc-{i}-mcp" / "pyproject.toml").exists()
+
+
+def test_scaffold_many_api_block():
+    api = {"base_url": "https://weather.example.com/v2", "pool_size": 4}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = _write_manifest(Path(tmpdir) / "catalog.jsonl", [
+            {"package_name": "api-mcp", "description": "Api", "tools": TOOLS, "api": api},
+            {"package_name": "api-str-mcp", "description": "Api", "tools": TOOLS, "api": json.dumps(api)},
+        ])
+        result = json.loads(scaffold_many(str(manifest), output_dir=tmpdir, max_workers=1))
+
+        assert result["success"] is True, result
+        for package in ("api-mcp", "api-str-mcp"):
+            project = Path(tmpdir) / package
+            assert (project / "src" / package.replace("-", "_") / "services" / "api_client.py").exists()
+            assert json.loads((project / ".mcp-creator.json").read_text())["api"] == api
+
+def test_scaffold_many_missing_manifest():
+    result = json.loads(scaffold_many("/nonexistent/catalog.jsonl"))
+    assert result["success"] is False
+
+
+def test_cli_streams_json_lines(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = _write_manifest(Path(tmpdir) / "catalog.jsonl", [
+            {"package_name": "cli-mcp", "description": "CLI", "tools": TOOLS},
+        ])
+        code = main([str(manifest), "--output-dir", tmpdir, "--workers", "1"])
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert lines[0]["package_name"] == "cli-mcp"
+    assert lines[-1]["summary"]["succeeded"] == 1
@@ -11,7 +11,10 @@ def test_all_tools_registered():
         "check_setup",
         "check_pypi_name",
         "scaffold_server",
+        "scaffold_many",
+        "scaffold_from_openapi",
         "add_tool",
+        "sync_project",
         "build_package",
         "publish_package",
         "setup_github",
@@ -21,4 +24,4 @@ def test_all_tools_registered():
 
 
 def test_tool_count():
-    assert len(mcp._tool_manager._tools) == 10
+    assert len(mcp._tool_manager._tools) == 13
@@ -0,0 +1,297 @@
+"""Test sync_project — incremental regeneration from a declarative tool manifest."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from mcp_creator.services.server_patch import list_tools
+from mcp_creator.tools.add_tool import add_tool
+from mcp_creator.tools.scaffold_server import scaffold_server
+from mcp_creator.tools.sync_project import sync_project
+
+
+def _tool(name, *params):
+    return {
+        "name": name,
+        "description": f"{name} tool",
+        "parameters": [
+            {"name": p, "type": "string", "required": True, "description": p} for p in params
+        ],
+        "returns": "JSON",
+    }
+
+
+def _scaffold(tmpdir, tools, **options):
+    result = json.loads(scaffold_server(
+        package_name="test-sync-mcp",
+        description="Test",
+        tools=json.dumps(tools),
+        output_dir=tmpdir,
+        **options,
+    ))
+    return Path(result["project_dir"])
+
+
+def test_sync_no_changes_writes_nothing():
+    tools = [_tool("get_weather", "city"), _tool("get_forecast", "city")]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, tools)
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+
+        assert result["success"] is True
+        assert result["unchanged"] == 2
+        assert result["files_written"] == []
+        assert result["files_deleted"] == []
+
+
+def test_sync_changed_param_touches_only_that_tool():
+    tools = [_tool(f"tool_{i}", "q") for i in range(50)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, tools)
+        tools[7] = _tool("tool_7", "q", "limit")
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+
+        assert result["changed"] == ["tool_7"]
+        assert result["files_written"] == sorted([
+            ".mcp-creator.json",
+            "src/test_sync_mcp/server.py",
+            "src/test_sync_mcp/services/tool_7_service.py",
+            "src/test_sync_mcp/tools/tool_7.py",
+            "tests/test_tool_7.py",
+        ])
+
+        server_py = (project / "src" / "test_sync_mcp" / "server.py").read_text()
+        assert "def tool_7(q: str, limit: str) -> str:" in server_py
+        assert server_py.count("def tool_7(") == 1
+        assert list_tools(server_py) == [f"tool_{i}" for i in range(50)]
+
+
+def test_sync_preserves_edited_service():
+    tools = [_tool("get_weather", "city")]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, tools)
+        service = project / "src" / "test_sync_mcp" / "services" / "get_weather_service.py"
+        service.write_text("# my real implementation\n")
+
+        tools[0] = _tool("get_weather", "city", "units")
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+
+        assert result["services_preserved"] == ["src/test_sync_mcp/services/get_weather_service.py"]
+        assert service.read_text() == "# my real implementation\n"
+        tool_py = (project / "src" / "test_sync_mcp" / "tools" / "get_weather.py").read_text()
+        assert "units: str" in tool_py
+
+
+def test_sync_add_and_remove():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city"), _tool("old_tool", "q")])
+        new_tools = [_tool("get_weather", "city"), _tool("new_tool", "q")]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+
+        assert result["added"] == ["new_tool"]
+        assert result["removed"] == ["old_tool"]
+        src = project / "src" / "test_sync_mcp"
+        assert (src / "tools" / "new_tool.py").exists()
+        assert not (src / "tools" / "old_tool.py").exists()
+        assert not (src / "services" / "old_tool_service.py").exists()
+        assert not (project / "tests" / "test_old_tool.py").exists()
+
+        server_py = (src / "server.py").read_text()
+        assert list_tools(server_py) == ["get_weather", "new_tool"]
+        assert "_old_tool_impl" not in server_py
+        assert '"new_tool"' in (project / "tests" / "test_server.py").read_text()
+
+
+def test_sync_keeps_lazy_imports():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city")], lazy_imports=True)
+        (project / ".mcp-creator.json").unlink()  # detected from server.py alone
+        new_tools = [_tool("get_weather", "city"), _tool("new_tool", "q")]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+
+        assert result["added"] == ["new_tool"]
+        server_py = (project / "src" / "test_sync_mcp" / "server.py").read_text()
+        assert list_tools(server_py) == ["get_weather", "new_tool"]
+        assert "_impl" not in server_py
+        assert 'return _load_tool("new_tool")(q)' in server_py
+        assert "test_import_time_budget" in (project / "tests" / "test_server.py").read_text()
+        assert json.loads((project / ".mcp-creator.json").read_text())["lazy_imports"] is True
+
+
+def test_sync_with_precomputed_schemas():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city")], precomputed_schemas=True)
+        new_tools = [_tool("get_weather", "city", "units"), _tool("new_tool", "q")]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+
+        assert result["added"] == ["new_tool"]
+        assert result["changed"] == ["get_weather"]
+        server_py = (project / "src" / "test_sync_mcp" / "server.py").read_text()
+        assert list_tools(server_py) == ["get_weather", "new_tool"]
+        assert server_py.count("@_schema_tool(") == 2
+        assert '"units": {"title": "Units", "type": "string"}' in server_py
+
+
+def test_sync_keeps_structured_output():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city")], structured_output=True)
+        (project / ".mcp-creator.json").unlink()  # detected from server.py alone
+        new_tools = [_tool("get_weather", "city"), _tool("new_tool", "q")]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+
+        assert result["added"] == ["new_tool"]
+        server_py = (project / "src" / "test_sync_mcp" / "server.py").read_text()
+        assert "def new_tool(q: str) -> dict[str, Any]:" in server_py
+        assert "return _structured_result(_new_tool_impl(q))" in server_py
+        tool = (project / "src" / "test_sync_mcp" / "tools" / "new_tool.py").read_text()
+        assert "    return result\n" in tool
+        assert json.loads((project / ".mcp-creator.json").read_text())["structured_output"] is True
+
+
+def test_sync_keeps_metrics():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city")], metrics=True)
+        (project / ".mcp-creator.json").unlink()  # detected from server.py alone
+        new_tools = [_tool("get_weather", "city"), _tool("new_tool", "q")]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+
+        assert result["added"] == ["new_tool"]
+        server_py = (project / "src" / "test_sync_mcp" / "server.py").read_text()
+        assert server_py.index("def new_tool(") < server_py.index("metrics.install(mcp)")
+        assert json.loads((project / ".mcp-creator.json").read_text())["metrics"] is True
+
+
+def test_sync_adds_batch_companion():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city")])
+        new_tools = [{**_tool("get_weather", "city"), "batch": True}]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+
+        assert result["changed"] == ["get_weather"]
+        src = project / "src" / "test_sync_mcp"
+        assert (src / "batch.py").exists()
+        server_py = (src / "server.py").read_text()
+        assert "from test_sync_mcp.batch import register_batch\n" in server_py
+        assert "register_batch(mcp, get_weather)\n" in server_py
+        compile(server_py, "server.py", "exec")
+
+        # Syncing again changes nothing and doesn't repeat the import
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(new_tools)))
+        assert result["files_written"] == []
+
+
+def test_sync_with_async_tools():
+    tools = [_tool("get_weather", "city")]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, tools, async_tools=True)
+
+        # The project default applies to the same defs, so nothing changed.
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+        assert result["unchanged"] == 1
+        assert result["files_written"] == []
+
+        # Opting one tool out regenerates it as sync.
+        tools = [{**tools[0], "async": False}]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+        assert result["changed"] == ["get_weather"]
+        server_py = (project / "src" / "test_sync_mcp" / "server.py").read_text()
+        assert "\ndef get_weather(" in server_py
+
+
+def test_sync_after_add_tool_uses_manifest():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city")])
+        add_tool(project_dir=str(project), tool=json.dumps(_tool("get_forecast", "city")))
+
+        tools = [_tool("get_weather", "city"), _tool("get_forecast", "city")]
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+        assert result["unchanged"] == 2
+        assert result["files_written"] == []
+
+
+def test_sync_without_manifest():
+    tools = [_tool("get_weather", "city")]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, tools)
+        (project / ".mcp-creator.json").unlink()
+
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools)))
+        assert result["success"] is True
+        assert result["changed"] == ["get_weather"]
+        # Unknown provenance: existing services are treated as user-owned
+        assert result["services_preserved"] == ["src/test_sync_mcp/services/get_weather_service.py"]
+        assert (project / ".mcp-creator.json").exists()
+
+
+def test_sync_bad_dir():
+    result = json.loads(sync_project(project_dir="/nonexistent/path", tools="[]"))
+    assert result["success"] is False
+
+
+def test_sync_dry_run():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city"), _tool("old_tool", "q")])
+        result = json.loads(sync_project(
+            project_dir=str(project),
+            tools=json.dumps([_tool("get_weather", "city")]),
+            dry_run=True,
+        ))
+
+        assert result["dry_run"] is True
+        assert "+++ /dev/null" in result["diff"]
+        assert (project / "src" / "test_sync_mcp" / "tools" / "old_tool.py").exists()
+
+
+def test_sync_regenerates_remote_http_test_and_benchmark():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = _scaffold(tmpdir, [_tool("get_weather", "city"), _tool("get_forecast", "city")], hosting="remote")
+        test_http = project / "tests" / "test_http.py"
+        bench_http = project / "benchmarks" / "bench_http.py"
+        assert "get_weather" in test_http.read_text() and "get_weather" in bench_http.read_text()
+
+        result = json.loads(sync_project(
+            project_dir=str(project), tools=json.dumps([_tool("get_news", "q"), _tool("get_forecast", "city")]),
+        ))
+        assert result["removed"] == ["get_weather"]
+        assert "tests/test_http.py" in result["files_written"]
+        assert "benchmarks/bench_http.py" in result["files_written"]
+        assert "get_weather" not in test_http.read_text()
+        assert '{"get_news", "get_forecast"}' in test_http.read_text()
+        assert "--tool get_news" in bench_http.read_text()
+
+        # Edited by hand: left alone
+        test_http.write_text(test_http.read_text() + "\n# mine\n")
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps([_tool("get_forecast", "city")])))
+        assert "tests/test_http.py" not in result["files_written"]
+        assert test_http.read_text().endswith("# mine\n")
+
+
+def test_sync_removing_last_limited_and_batch_tools():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tools = [
+            _tool("get_weather", "city"),
+            {**_tool("get_news", "q"), "batch": True, "limits": {"concurrency": 2}},
+        ]
+        project = _scaffold(tmpdir, tools)
+        server = project / "src" / "test_sync_mcp" / "server.py"
+        assert "from test_sync_mcp import limits\n" in server.read_text()
+
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools[:1])))
+        assert result["removed"] == ["get_news"]
+        assert "tests/test_limits.py" in result["files_deleted"]
+        server_py = server.read_text()
+        assert "import limits" not in server_py
+        assert "register_batch" not in server_py
+        compile(server_py, "server.py", "exec")
+
+
+def test_sync_removal_regenerates_remote_test_limits():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tools = [_tool("get_weather", "city"), {**_tool("get_news", "q"), "limits": {"concurrency": 2}}]
+        project = _scaffold(tmpdir, tools, hosting="remote")
+
+        result = json.loads(sync_project(project_dir=str(project), tools=json.dumps(tools[:1])))
+        assert "tests/test_limits.py" in result["files_written"]
+        assert "tests/test_http.py" in result["files_written"]
+        assert "get_news" not in (project / "tests" / "test_limits.py").read_text()
+        assert "from test_sync_mcp import limits\n" in (project / "src" / "test_sync_mcp" / "server.py").read_text()
@@ -0,0 +1,73 @@
+"""Test the codegen template engine."""
+
+import pytest
+
+from mcp_creator.services.template_engine import (
+    TemplateSyntaxError,
+    compile_template,
+    iter_template,
+    load_template,
+    render_template,
+)
+
+
+def test_expressions_and_verbatim_text():
+    render = compile_template('name = "{{ name }}"\nsize = {{ len(items) }}\n{ literal }\n')
+    assert render({"name": "x", "items": [1, 2]}) == 'name = "x"\nsize = 2\n{ literal }\n'
+
+
+def test_tag_lines_are_dropped():
+    source = (
+        "start\n"
+        "{% for item in items %}\n"
+        "  {% if item.startswith('a') %}\n"
+        "- {{ item }} (a)\n"
+        "  {% elif item == 'b' %}\n"
+        "- b!\n"
+        "  {% else %}\n"
+        "- {{ item }}\n"
+        "  {% endif %}\n"
+        "{% endfor %}\n"
+        "end"
+    )
+    render = compile_template(source)
+    assert render({"items": ["apple", "b", "c"]}) == "start\n- apple (a)\n- b!\n- c\nend"
+    assert render({"items": []}) == "start\nend"
+
+
+def test_loop_variables_shadow_context():
+    render = compile_template("{% for k, v in pairs %}\n{{ k }}={{ v }}\n{% endfor %}\n")
+    assert render({"pairs": [("a", 1), ("b", 2)]}) == "a=1\nb=2\n"
+
+
+def test_compiled_once():
+    source = "{{ x }}\n"
+    assert compile_template(source) is compile_template(source)
+    assert load_template("gitignore.tmpl") is load_template("gitignore.tmpl")
+
+
+def test_stream_yields_same_text_in_pieces():
+    source = "head\n{% for x in xs %}\n- {{ x }}\n{% endfor %}\ntail\n"
+    pieces = list(compile_template(source, stream=True)({"xs": [1, 2]}))
+    assert len(pieces) > 1
+    assert "".join(pieces) == compile_template(source)({"xs": [1, 2]})
+    assert list(compile_template("{% if False %}\nx\n{% endif %}\n", stream=True)({})) == []
+    assert "".join(iter_template("gitignore.tmpl")) == render_template("gitignore.tmpl")
+
+
+def test_missing_variable():
+    with pytest.raises(NameError, match="'x'"):
+        compile_template("{{ x }}")({})
+
+
+@pytest.mark.parametrize("source", [
+    "{% if x %}\nunclosed\n",
+    "{% endfor %}\n",
+    "{% for x %}\n{% endfor %}\n",
+    "{% else %}\n",
+    "{% while x %}\n",
+    "{{ 1 + }}\n",
+])
+def test_syntax_errors(source):
+    with pytest.raises(TemplateSyntaxError):
+        compile_template(source)
@@ -0,0 +1,192 @@
+"""Test tool_spec — the compiled tool-definition IR shared by codegen renderers."""
+
+import dataclasses
+import json
+
+import pytest
+
+from mcp.server.fastmcp.tools import Tool
+
+from mcp_creator.services.tool_spec import (
+    ToolSpec,
+    build_tool_spec,
+    clear_cache,
+    compile_api,
+    compile_tool,
+    fingerprint,
+    input_schema,
+    uses_batch,
+    uses_limits,
+    uses_pagination,
+)
+
+
+TOOL = {
+    "name": "get_forecast",
+    "description": "Get weather forecast",
+    "parameters": [
+        {"name": "city", "type": "string", "required": True},
+        {"name": "days", "type": "integer", "required": False, "default": 5},
+        {"name": "units", "type": "string", "required": False, "default": "metric"},
+        {"name": "region", "type": "string", "required": False},
+    ],
+}
+
+
+def test_compile_tool_signature():
+    spec = compile_tool(TOOL)
+    assert spec.class_name == "GetForecast"
+    assert spec.signature == 'city: str, days: int = 5, units: str = "metric", region: str | None = None'
+    assert spec.call_args == "city, days, units, region"
+    assert spec.call_kwargs == "city=city, days=days, units=units, region=region"
+
+
+def test_compile_tool_is_memoized_by_content():
+    clear_cache()
+    reordered = dict(reversed(list(TOOL.items())))
+    first = compile_tool(TOOL)
+    assert compile_tool(dict(TOOL)) is first
+    assert compile_tool(reordered) is first
+    assert compile_tool(first) is first
+    assert first.fingerprint == fingerprint(reordered)
+
+
+def test_class_name_is_pascal_case():
+    assert build_tool_spec({**TOOL, "name": "get_weather"}).class_name == "GetWeather"
+    assert build_tool_spec({**TOOL, "name": "fetch_data"}).class_name == "FetchData"
+
+
+def test_spec_is_immutable():
+    spec = compile_tool(TOOL)
+    assert isinstance(spec.params, tuple)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        spec.name = "other"
+
+
+def test_build_tool_spec_rejects_malformed_defs():
+    with pytest.raises(ValueError):
+        build_tool_spec({"description": "no name"})
+    with pytest.raises(ValueError):
+        build_tool_spec({"name": "t", "parameters": [{"type": "string"}]})
+    with pytest.raises(ValueError):
+        build_tool_spec({"name": "t", "parameters": "city"})
+
+
+def test_build_tool_spec_uncached():
+    assert isinstance(build_tool_spec(TOOL), ToolSpec)
+    assert build_tool_spec(TOOL) is not build_tool_spec(TOOL)
+
+
+def test_compile_http_block():
+    spec = build_tool_spec({
+        "name": "update_pet",
+        "parameters": [
+            {"name": "pet_id", "type": "string", "required": True},
+            {"name": "name", "type": "string", "required": True},
+            {"name": "trace", "type": "string", "required": False},
+            {"name": "limit", "type": "integer", "required": False},
+        ],
+        "http": {
+            "method": "put",
+            "path": "/pets/{petId}/name",
+            "params": {
+                "pet_id": {"in": "path", "name": "petId"},
+                "name": {"in": "body"},
+                "trace": {"in": "header", "name": "X-Trace"},
+            },
+            "body": "fields",
+        },
+    })
+    http = spec.http
+    assert http.method == "PUT"
+    assert http.url_expr == '"/pets/" + quote(str(pet_id), safe="") + "/name"'
+    assert http.query == (("limit", "limit"),)
+    assert http.headers == (("X-Trace", "trace"),)
+    assert http.body_fields == (("name", "name"),)
+    assert http.body_param is None
+
+
+def test_compile_api_block():
+    api = compile_api({"base_url": "https://api.example.com", "auth_env": "API_TOKEN", "pool_size": 4})
+    assert api.base_url == "https://api.example.com"
+    assert api.auth_env == "API_TOKEN"
+    assert (api.auth_header, api.auth_prefix) == ("Authorization", "Bearer ")
+    assert (api.timeout, api.connect_timeout, api.pool_size) == (30.0, 5.0, 4)
+
+
+def test_compile_api_from_http_tools():
+    http_tool = {"name": "ping", "http": {"path": "/ping", "base_url": "https://api.example.com"}}
+    assert compile_api(None, [TOOL]) is None
+    assert compile_api(None, [TOOL, http_tool]).base_url == "https://api.example.com"
+    assert compile_api(None, [build_tool_spec(http_tool)]).base_url == "https://api.example.com"
+    assert build_tool_spec({"name": "t", "api": {"timeout": 2}}).timeout == 2
+
+
+def test_compile_cache_block():
+    cache = build_tool_spec({**TOOL, "cache": {"ttl": 60, "key": ["city"]}}).cache
+    assert (cache.ttl, cache.max_entries, cache.persist) == (60.0, 128, False)
+    assert cache.key == ("city",)
+    assert cache.key_kwargs == "city=city"
+    assert build_tool_spec(TOOL).cache is None
+    assert build_tool_spec({**TOOL, "cache": {}}).cache.key == tuple(p["name"] for p in TOOL["parameters"])
+
+
+def test_compile_paginated_tool():
+    spec = build_tool_spec({**TOOL, "paginated": True, "cache": {"key": ["city"]}})
+    assert spec.paginated is True
+    assert spec.signature.endswith(", cursor: str | None = None, page_size: int = 100")
+    assert spec.call_args == "city, days, units, region, cursor, page_size"
+    assert spec.call_kwargs == "city=city, days=days, units=units, region=region"
+    assert spec.service_signature == build_tool_spec(TOOL).signature
+    assert [p.name for p in spec.service_params] == ["city", "days", "units", "region"]
+    assert spec.cache.key == ("city", "cursor", "page_size")
+    assert list(input_schema(spec)["properties"])[-2:] == ["cursor", "page_size"]
+    assert uses_pagination([TOOL, {**TOOL, "paginated": True}])
+    assert not uses_pagination([TOOL])
+
+
+def test_compile_batch_flag():
+    spec = build_tool_spec({**TOOL, "batch": True})
+    assert spec.batch is True
+    assert spec.signature == build_tool_spec(TOOL).signature
+    assert spec.fingerprint != build_tool_spec(TOOL).fingerprint
+    assert uses_batch([TOOL, spec])
+    assert not uses_batch([TOOL])
+    # Batch items go through the limits, so a batch tool always has them
+    assert spec.limits.kwargs == ""
+    assert uses_limits([{**TOOL, "batch": True}])
+    assert build_tool_spec({**TOOL, "batch": True, "limits": {"queue": 4}}).limits.queue == 4
+
+
+def test_compile_limits_block():
+    spec = build_tool_spec({**TOOL, "limits": {"concurrency": 2, "timeout": 5}})
+    assert (spec.limits.concurrency, spec.limits.queue, spec.limits.timeout) == (2, None, 5.0)
+    assert spec.limits.kwargs == "concurrency=2, timeout=5.0"
+    assert build_tool_spec({**TOOL, "limits": {}}).limits.kwargs == ""
+    assert uses_limits([TOOL, spec])
+    assert not uses_limits([TOOL])
+
+
+def test_compile_http_rejects_unbound_placeholder():
+    with pytest.raises(ValueError):
+        build_tool_spec({"name": "t", "http": {"path": "/pets/{petId}"}})
+
+
+def test_input_schema_matches_fastmcp_introspection():
+    tool = {
+        "name": "search",
+        "parameters": TOOL["parameters"] + [
+            {"name": "class_", "type": "string", "required": False, "default": "a"},
+            {"name": "pet_id2", "type": "number", "required": False, "default": 2},
+            {"name": "tags", "type": "array", "required": False},
+            {"name": "filters", "type": "object", "required": False},
+            {"name": "exact", "type": "boolean", "required": False, "default": False},
+        ],
+    }
+    for t in (tool, {"name": "ping"}):
+        spec = build_tool_spec(t)
+        namespace: dict = {}
+        exec(f"def {spec.name}({spec.signature}) -> str:\n    return ''", namespace)
+        introspected = Tool.from_function(namespace[spec.name]).parameters
+        # Same content and the same key order, so clients see identical JSON.
+        assert json.dumps(input_schema(spec)) == json.dumps(introspected)
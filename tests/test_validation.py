@@ -0,0 +1,317 @@
+"""Test fail-early validation of tool definitions."""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from mcp_creator.services import validation
+from mcp_creator.services.reserved_names import reserved_names
+from mcp_creator.tools.add_tool import add_tool
+from mcp_creator.tools.scaffold_server import scaffold_server
+from mcp_creator.tools.sync_project import sync_project
+
+
+GOOD_TOOL = {
+    "name": "get_weather",
+    "description": "Get current weather",
+    "parameters": [
+        {"name": "city", "type": "string", "required": True},
+        {"name": "days", "type": "integer", "required": False, "default": 5},
+    ],
+    "returns": "Weather JSON",
+}
+
+
+def test_valid_payload_has_no_errors():
+    errors = validation.validate_payload(
+        [GOOD_TOOL],
+        [{"name": "API_KEY", "description": "Key", "required": True}],
+        ["get_weather"],
+    )
+    assert errors == []
+
+
+def test_reports_every_error_at_once():
+    tools = [
+        {"name": "bad-name", "parameters": [{"name": "class", "type": "string"}]},
+        {"name": "get_weather", "parameters": [
+            {"name": "x", "type": "uuid"},
+            {"name": "x", "type": "string"},
+        ]},
+        {"name": "get_weather"},
+    ]
+    errors = validation.validate_tools(tools)
+    assert len(errors) == 5
+    assert any("tools[0].name" in e and "bad-name" in e for e in errors)
+    assert any("tools[0].parameters[0].name" in e and "class" in e for e in errors)
+    assert any("tools[1].parameters[0].type" in e and "uuid" in e for e in errors)
+    assert any("duplicate parameter 'x'" in e for e in errors)
+    assert any("duplicate tool 'get_weather'" in e for e in errors)
+
+
+def test_rejects_names_server_py_already_uses():
+    errors = validation.validate_tools([{"name": "main"}, {"name": "mcp"}])
+    assert len(errors) == 2
+
+
+def test_rejects_names_the_generated_modules_use():
+    errors = validation.validate_tools([{"name": "pagination"}, {"name": "list"}, {"name": "str"}])
+    assert errors == [
+        "tools[0].name: 'pagination' clashes with a name the generated code already uses.",
+        "tools[1].name: 'list' clashes with a name the generated code already uses.",
+        "tools[2].name: 'str' clashes with a name the generated code already uses.",
+    ]
+
+
+def test_rejects_params_the_tool_functions_use():
+    params = [{"name": name, "type": "string"} for name in ("service", "result", "json", "err", "city")]
+    errors = validation.validate_tools([{"name": "get_weather", "parameters": params}])
+    assert errors == [
+        "tools[0].parameters[0].name: 'service' is reserved.",
+        "tools[0].parameters[1].name: 'result' is reserved.",
+        "tools[0].parameters[2].name: 'json' is reserved.",
+        "tools[0].parameters[3].name: 'err' is reserved.",
+    ]
+
+
+def test_default_must_match_type():
+    tools = [{"name": "t", "parameters": [
+        {"name": "a", "type": "integer", "required": False, "default": "five"},
+        {"name": "b", "type": "integer", "required": False, "default": True},
+        {"name": "c", "type": "number", "required": False, "default": 2},
+        {"name": "d", "type": "boolean", "required": False, "default": False},
+    ]}]
+    errors = validation.validate_tools(tools)
+    assert len(errors) == 2
+    assert "parameters[0].default" in errors[0]
+    assert "parameters[1].default" in errors[1]
+
+
+def test_required_after_optional_is_rejected():
+    tools = [{"name": "t", "parameters": [
+        {"name": "a", "type": "integer", "required": False},
+        {"name": "b", "type": "string"},
+    ]}]
+    errors = validation.validate_tools(tools)
+    assert len(errors) == 1
+    assert "must come before optional" in errors[0]
+
+
+def test_text_that_would_break_generated_code_is_rejected():
+    errors = validation.validate_tools([{"name": "t", "description": 'Say "hi"'}])
+    assert len(errors) == 1
+    assert "description" in errors[0]
+
+
+def test_env_vars_and_paid_tools():
+    errors = validation.validate_payload(
+        [GOOD_TOOL],
+        [{"name": "API KEY"}, {"name": "TOKEN"}, {"name": "TOKEN"}],
+        ["get_weather", "get_forecast"],
+    )
+    assert len(errors) == 3
+    assert "env_vars[0].name" in errors[0]
+    assert "duplicate env var 'TOKEN'" in errors[1]
+    assert "paid_tools[1]" in errors[2] and "get_forecast" in errors[2]
+
+
+def test_async_flag_must_be_boolean():
+    errors = validation.validate_tools([{"name": "t", "async": "yes"}, {"name": "u", "async": True}])
+    assert errors == ["tools[0].async: must be true or false."]
+
+
+def test_api_block_is_checked():
+    errors = validation.validate_api({
+        "base_url": "api.example.com",
+        "auth_env": "api token",
+        "timeout": 0,
+        "pool_size": 2.5,
+        "retries": 3,
+    })
+    assert len(errors) == 5
+    assert errors[0] == "api.retries: unknown setting."
+    assert any("api.base_url" in e for e in errors)
+    assert any("api.auth_env" in e for e in errors)
+    assert any("api.timeout" in e for e in errors)
+    assert any("api.pool_size" in e for e in errors)
+    assert validation.validate_api({"base_url": "https://api.example.com", "pool_size": 4}) == []
+
+
+def test_tool_api_block_only_sets_timeout():
+    errors = validation.validate_tools([
+        {"name": "t", "api": {"timeout": -1, "base_url": "https://x.example.com"}},
+        {"name": "u", "api": {"timeout": 2.5}},
+    ])
+    assert len(errors) == 2
+    assert "tools[0].api.base_url" in errors[0]
+    assert "tools[0].api.timeout" in errors[1]
+
+
+def test_cache_block_is_checked():
+    errors = validation.validate_tools([
+        {
+            "name": "t",
+            "parameters": [{"name": "city"}, {"name": "cached", "required": False}],
+            "cache": {"ttl": "1h", "max_entries": 0, "key": ["town"], "persist": "yes", "size": 1},
+        },
+        {"name": "u", "parameters": [{"name": "city"}], "cache": {"key": ["city"]}},
+    ])
+    assert len(errors) == 6
+    assert errors[0] == "tools[0].cache.size: unknown setting."
+    assert any("cache.ttl" in e for e in errors)
+    assert any("cache.max_entries" in e for e in errors)
+    assert any("cache.persist" in e for e in errors)
+    assert any("no parameter named 'town'" in e for e in errors)
+    assert any("'cached' is reserved" in e for e in errors)
+
+
+def test_paginated_flag_is_checked():
+    errors = validation.validate_tools([
+        {"name": "t", "paginated": "yes"},
+        {"name": "u", "paginated": True, "parameters": [{"name": "cursor"}]},
+        {"name": "v", "paginated": True, "http": {"method": "GET", "path": "/v"}},
+        {"name": "w", "paginated": True, "cache": {"key": ["cursor"]}},
+    ])
+    assert errors == [
+        "tools[0].paginated: must be true or false.",
+        "tools[1].paginated: parameter name 'cursor' is reserved in paginated tools.",
+        "tools[2].paginated: http tools can't be paginated; the upstream API decides what a page is.",
+    ]
+
+
+def test_batch_flag_is_checked():
+    errors = validation.validate_tools([
+        {"name": "t", "batch": 1},
+        {"name": "u", "batch": True},
+        {"name": "u_batch"},
+        {"name": "register_batch"},
+    ])
+    assert errors == [
+        "tools[0].batch: must be true or false.",
+        "tools[3].name: 'register_batch' clashes with a name the generated code already uses.",
+        "tools[1].batch: its companion tool 'u_batch' clashes with a tool of that name.",
+    ]
+
+
+def test_remote_server_names_are_reserved():
+    errors = validation.validate_tools([{"name": "transport"}, {"name": "http_app"}, {"name": "t"}])
+    assert errors == [
+        "tools[0].name: 'transport' clashes with a name the generated code already uses.",
+        "tools[1].name: 'http_app' clashes with a name the generated code already uses.",
+    ]
+    for name in ("Starlette", "STATELESS_HTTP", "LOG_LEVEL"):
+        assert name in reserved_names().tools
+
+
+def test_limits_block_is_checked():
+    errors = validation.validate_tools([
+        {"name": "t", "limits": {"concurrency": 0, "queue": -1, "timeout": "5s", "burst": 2}},
+        {"name": "u", "limits": {"concurrency": 4, "queue": 0, "timeout": 2.5}},
+        {"name": "v", "limits": []},
+    ])
+    assert errors == [
+        "tools[0].limits.burst: unknown setting.",
+        "tools[0].limits.concurrency: must be a positive integer.",
+        "tools[0].limits.queue: must be a non-negative integer.",
+        "tools[0].limits.timeout: must be a positive number of seconds.",
+        "tools[2].limits: must be an object.",
+    ]
+
+
+def test_non_list_payload():
+    assert validation.validate_tools({"name": "t"}) == [
+        "tools: must be a JSON array of tool definitions."
+    ]
+
+
+def test_validation_is_fast():
+    tools = [
+        {**GOOD_TOOL, "name": f"tool_{i}"}
+        for i in range(1000)
+    ]
+    reserved_names()  # derived once, on first use
+    start = time.perf_counter()
+    assert validation.validate_tools(tools) == []
+    elapsed = time.perf_counter() - start
+    # Generous bound: well under 100 microseconds per tool.
+    assert elapsed < 0.1
+
+
+def test_scaffold_fails_before_writing():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = json.loads(scaffold_server(
+            package_name="bad-mcp",
+            description="Test",
+            tools=json.dumps([{"name": "bad-name"}, {"name": "ok", "parameters": [{"name": "1x"}]}]),
+            output_dir=tmpdir,
+            paid=True,
+            paid_tools=json.dumps(["missing"]),
+        ))
+        assert result["success"] is False
+        assert len(result["errors"]) == 3
+        assert not (Path(tmpdir) / "bad-mcp").exists()
+
+
+def test_scaffold_reports_invalid_json():
+    result = json.loads(scaffold_server(package_name="x", description="x", tools="[{"))
+    assert result["success"] is False
+    assert "Invalid JSON" in result["error"]
+
+
+def test_add_tool_and_sync_validate():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scaffold_server(
+            package_name="val-mcp",
+            description="Test",
+            tools=json.dumps([GOOD_TOOL]),
+            output_dir=tmpdir,
+        )
+        project = str(Path(tmpdir) / "val-mcp")
+
+        result = json.loads(add_tool(project, json.dumps({"name": "for"})))
+        assert result["success"] is False
+        assert result["errors"][0].startswith("tool[0].name")
+
+        result = json.loads(add_tool(project, json.dumps(GOOD_TOOL)))
+        assert result["success"] is False
+        assert "already exists" in result["error"]
+
+        result = json.loads(sync_project(project, json.dumps([GOOD_TOOL, GOOD_TOOL])))
+        assert result["success"] is False
+        assert "duplicate tool" in result["errors"][0]
+
+
+def test_http_block_is_checked():
+    tools = [{
+        "name": "get_pet",
+        "parameters": [{"name": "pet_id", "type": "string"}],
+        "http": {
+            "method": "FETCH",
+            "path": "/pets/{petId}",
+            "params": {"pet_id": {"in": "cookie"}, "owner": {"in": "query"}},
+            "body": "payload",
+            "auth": {"header": "Authorization", "env": "api token"},
+        },
+    }]
+    errors = validation.validate_tools(tools)
+    assert len(errors) == 6
+    assert "tools[0].http.method" in errors[0]
+    assert any("http.params.pet_id.in" in e for e in errors)
+    assert any("no parameter named 'owner'" in e for e in errors)
+    assert any("placeholder {petId}" in e for e in errors)
+    assert any("http.body" in e for e in errors)
+    assert any("http.auth.env" in e for e in errors)
+
+
+def test_http_tools_reserve_service_names():
+    tools = [{
+        "name": "revoke",
+        "parameters": [{"name": "token", "type": "string"}, {"name": "_headers", "type": "object"},
+                       {"name": "os", "type": "string"}],
+        "http": {"method": "POST", "path": "/revoke", "body": "fields"},
+    }]
+    assert validation.validate_tools(tools) == [
+        "tools[0].http: parameter name '_headers' is reserved in http tools.",
+        "tools[0].http: parameter name 'os' is reserved in http tools.",
+    ]